@@ -0,0 +1,130 @@
+"""Static bytes and requests a browser spends on the home page's assets, with and without the asset build.
+
+Drives one worker's ASGI app with a small browser cache model: a first visit fetches everything, a
+reload revalidates every cached asset not marked `immutable`, and a visit after `max-age` has run out
+revalidates the stale ones. "plain" serves `static/fonts/...`; "hashed" serves the `build_assets.py`
+copies. Requests accept gzip, so precompressed copies count at their compressed size.
+
+Runs the asset build first, as `python build_assets.py` would.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_assets
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import pathlib
+import re
+import sqlite3
+import tempfile
+import time
+
+PAGE = "/"
+STATIC_URL = re.compile(r"""(?:url\(|src=|href=)["']?(/static/[^"')\s]+)""")
+
+
+async def request(app, path: str, headers: dict[str, str]) -> tuple[int, dict[str, str], bytes]:
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"localhost"), *((name.encode(), value.encode()) for name, value in headers.items())],
+        "server": ("localhost", 80),
+        "client": ("127.0.0.1", 1234),
+    }
+    await app(scope, receive, send)
+    response_headers = {name.decode(): value.decode() for name, value in messages[0]["headers"]}
+    return messages[0]["status"], response_headers, b"".join(message.get("body", b"") for message in messages[1:])
+
+
+class Browser:
+    """Keeps each asset's validator and freshness, the parts of an HTTP cache that decide what is fetched."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+        self.cache: dict[str, tuple[str, float, bool]] = {}
+        self.now = time.time()
+
+    async def visit(self, *, reload: bool = False) -> tuple[int, int]:
+        """(requests, body bytes) spent on static files for one view of the page."""
+        _, _, page = await request(self.app, PAGE, {"accept-encoding": "gzip"})
+        requests = transferred = 0
+
+        for url in dict.fromkeys(STATIC_URL.findall(page.decode())):
+            headers = {"accept-encoding": "gzip"}
+            if url in self.cache:
+                etag, expires, immutable = self.cache[url]
+                if immutable or (not reload and self.now < expires):
+                    continue
+                headers["if-none-match"] = etag
+
+            status, response_headers, body = await request(self.app, url, headers)
+            assert status in (200, 304), (url, status)
+            requests += 1
+            transferred += len(body)
+
+            policy = response_headers.get("cache-control", "")
+            max_age = int(match[1]) if (match := re.search(r"max-age=(\d+)", policy)) else 0
+            self.cache[url] = (response_headers.get("etag", ""), self.now + max_age, "immutable" in policy)
+
+        return requests, transferred
+
+
+async def visits(app) -> list[tuple[str, tuple[int, int]]]:
+    browser = Browser(app)
+    rows = [("first visit", await browser.visit()), ("reload", await browser.visit(reload=True))]
+    browser.now += 2 * 3600
+    rows.append(("2 hours later", await browser.visit()))
+    browser.now += 30 * 86400
+    rows.append(("a month later", await browser.visit()))
+    return rows
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        database = pathlib.Path(tmp) / "assets.sqlite"
+        sqlite3.connect(database).executescript(pathlib.Path("schema.sql").read_text())
+        os.environ["DATABASE"] = str(database)
+        os.environ["CACHE_DATABASE"] = str(pathlib.Path(tmp) / "cache.sqlite")
+
+        from asgiref.wsgi import WsgiToAsgi
+
+        from src.assets import build_assets
+        from src.server import app, create_app
+        from src.server.static_files import StaticFiles
+
+        create_app({"SCHEDULER": False, "PAGE_CACHE": False})
+        worker = StaticFiles(WsgiToAsgi(app), delivery="asgi")
+
+        build_assets()
+        results = {}
+        for name, hashed in (("plain", False), ("hashed", True)):
+            app.config["HASHED_ASSETS"] = hashed
+            results[name] = asyncio.run(visits(worker))
+
+    print(f"static files of {PAGE}, per view")
+    print(f"{'':<16}" + "".join(f" {name + ' requests':>16} {name + ' KiB':>12}" for name in results))
+    for i, (visit, _) in enumerate(results["plain"]):
+        cells = "".join(f" {rows[i][1][0]:>16} {rows[i][1][1] / 1024:>12.1f}" for rows in results.values())
+        print(f"{visit:<16}{cells}")
+
+
+if __name__ == "__main__":
+    main()
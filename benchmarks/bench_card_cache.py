@@ -0,0 +1,96 @@
+"""Rendering a 60-card product grid with the card fragment cache cold and warm.
+
+Times the cards alone and the whole category page (with the page cache off, so every request
+renders), against a scratch catalog with pictures for every product.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_card_cache [ROUNDS]
+"""
+
+from __future__ import annotations
+
+import os
+import pathlib
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+ROUNDS = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+CARDS = 60
+PICTURES = pathlib.Path("src/server/static/product_pictures")
+
+
+def build(path: pathlib.Path) -> list[str]:
+    conn = sqlite3.connect(path)
+    conn.executescript(pathlib.Path("schema.sql").read_text())
+    conn.execute(r"INSERT INTO CATEGORIES (NAME, DESCRIPTION) VALUES ('Tees', '')")
+    unique_ids = [f"BENCHCARD{i:07}" for i in range(CARDS)]
+    conn.executemany(
+        r"INSERT INTO PRODUCTS (UNIQUE_ID, NAME, PRICE, DISPLAY_PRICE, DESCRIPTION, STOCK, SIZE, CATEGORY) VALUES (?, ?, 999, 1299, '', 5, '1', 1)",
+        ((unique_id, f"Product {i}") for i, unique_id in enumerate(unique_ids)),
+    )
+    conn.commit()
+    conn.close()
+
+    for unique_id in unique_ids:
+        (PICTURES / unique_id).mkdir(parents=True, exist_ok=True)
+        for name in ("front.webp", "back.webp"):
+            (PICTURES / unique_id / name).touch()
+    return unique_ids
+
+
+def timed(func, *, before=None) -> float:
+    """Median milliseconds of `func` over `ROUNDS`, calling `before` untimed ahead of each."""
+    samples = []
+    for _ in range(ROUNDS):
+        if before:
+            before()
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        database = pathlib.Path(tmp) / "cards.sqlite"
+        unique_ids = build(database)
+        os.environ["DATABASE"] = str(database)
+
+        try:
+            from src.product import Category, Product
+            from src.server import conn, create_app
+            from src.server.fragment_cache import card_cache, product_card
+
+            app = create_app({"SCHEDULER": False, "PAGE_CACHE": False})
+            client = app.test_client()
+
+            with app.test_request_context("/"):
+                products = list(Product.get_by_category(conn, Category.from_id(conn, 1), limit=CARDS))
+                assert len(products) == CARDS
+
+                def grid():
+                    return "".join(product_card(product) for product in products)
+
+                cold_grid = timed(grid, before=card_cache.clear)
+                warm_grid = timed(grid)
+
+            path = f"/category/tees?limit={CARDS}"
+            cold_page = timed(lambda: client.get(path), before=card_cache.clear)
+            warm_page = timed(lambda: client.get(path))
+        finally:
+            for unique_id in unique_ids:
+                shutil.rmtree(PICTURES / unique_id, ignore_errors=True)
+
+    print(f"{CARDS}-card grid, median of {ROUNDS} rounds")
+    print(f"{'':<16} {'cold ms':>8} {'warm ms':>8} {'speedup':>8}")
+    print(f"{'cards only':<16} {cold_grid:>8.2f} {warm_grid:>8.2f} {cold_grid / warm_grid:>7.1f}x")
+    print(f"{'category page':<16} {cold_page:>8.2f} {warm_page:>8.2f} {cold_page / warm_page:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Bytes on the wire and CPU per response for storefront pages, with and without compression.
+
+Drives one worker's ASGI stack in-process against a scratch catalog. "rendered" rows have the page
+cache off, so the compression middleware gzips every response; "cached" rows serve from the page
+cache, whose gzip bodies are assembled from parts compressed once when the page was stored.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_compression [REQUESTS]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import pathlib
+import sys
+import tempfile
+import time
+
+REQUESTS = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+PATHS = ("/", "/faq", "/category/tees", "/sitemap-pages.xml")
+
+
+async def request(app, path: str, accept_encoding: str) -> tuple[int, int]:
+    """Status and body bytes sent."""
+    status = size = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status, size
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        else:
+            size += len(message.get("body", b""))
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"localhost"), (b"accept-encoding", accept_encoding.encode())],
+        "server": ("localhost", 80),
+        "client": ("127.0.0.1", 1234),
+    }
+    await app(scope, receive, send)
+    return status, size
+
+
+async def measure(app, path: str, accept_encoding: str) -> tuple[int, float]:
+    """Body bytes and CPU milliseconds per response."""
+    await request(app, path, accept_encoding)  # warm templates and the page cache
+    cpu = time.process_time()
+    for _ in range(REQUESTS):
+        status, size = await request(app, path, accept_encoding)
+        assert status == 200, (path, status)
+    return size, (time.process_time() - cpu) / REQUESTS * 1000
+
+
+def main() -> None:
+    from benchmarks.bench_page_cache import build
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = pathlib.Path(tmp) / "compression.sqlite"
+        build(database)
+        os.environ["DATABASE"] = str(database)
+        os.environ["CACHE_DATABASE"] = str(pathlib.Path(tmp) / "cache.sqlite")
+
+        from asgiref.wsgi import WsgiToAsgi
+
+        from src.server import app, create_app
+        from src.server.compression import Compression, brotli
+        from src.server.static_files import StaticFiles
+
+        create_app({"SCHEDULER": False})
+        stack = Compression(StaticFiles(WsgiToAsgi(app)))
+        encodings = ("identity", "gzip", *(("br",) if brotli is not None else ()))
+
+        rows = []
+        for path in PATHS:
+            for cached in (False, True):
+                app.config["PAGE_CACHE"] = cached
+                results = [asyncio.run(measure(stack, path, encoding)) for encoding in encodings]
+                rows.append((f"{path} {'cached' if cached else 'rendered'}", results))
+
+    print(f"{REQUESTS} requests per cell, single thread; KiB sent / CPU ms per response")
+    print(f"{'':<32}" + "".join(f" {encoding:>18}" for encoding in encodings))
+    for name, results in rows:
+        print(f"{name:<32}" + "".join(f" {size / 1024:>8.1f} / {cpu:>5.2f}" for size, cpu in results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Repeat visitors with and without conditional GET: server time and bytes sent per view.
+
+A "first visit" client never revalidates, while a "repeat visit" client sends back the ETag it
+was given, the way a browser does for `Cache-Control: no-cache` responses.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_conditional [VIEWS]
+"""
+
+from __future__ import annotations
+
+import os
+import pathlib
+import sqlite3
+import sys
+import tempfile
+import time
+
+VIEWS = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+PRODUCTS = 2_000
+
+
+def build(path: pathlib.Path) -> None:
+    conn = sqlite3.connect(path)
+    conn.executescript(pathlib.Path("schema.sql").read_text())
+    conn.execute(r"INSERT INTO USERS (EMAIL, PASSWORD, NAME, ADDRESS, PHONE) VALUES ('a@b', '', 'A', '', '')")
+    conn.execute(r"INSERT INTO CATEGORIES (NAME, DESCRIPTION) VALUES ('Tees', '')")
+    conn.executemany(
+        r"INSERT INTO PRODUCTS (UNIQUE_ID, NAME, PRICE, DISPLAY_PRICE, DESCRIPTION, STOCK, SIZE, CATEGORY) VALUES (?, ?, 999, 1299, ?, 5, ?, 1)",
+        ((f"U{i // 4:015}", f"Product {i // 4}", "<p>Soft cotton.</p>" * 20, ("1", "10", "100", "1000")[i % 4]) for i in range(PRODUCTS)),
+    )
+    conn.executemany(
+        r"INSERT INTO REVIEWS (USER_ID, PRODUCT_ID, STARS, REVIEW) VALUES (1, 1, ?, 'Great fit')",
+        ((i % 5 + 1,) for i in range(20)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def drive(client, path: str, *, revalidate: bool) -> tuple[float, float, int]:
+    """(ms per view, bytes per view, status of the last view)"""
+    response = client.get(path)
+    etag = response.headers.get("ETag")
+    headers = {"If-None-Match": etag} if revalidate and etag else {}
+
+    sent = 0
+    start = time.perf_counter()
+    for _ in range(VIEWS):
+        response = client.get(path, headers=headers)
+        sent += len(response.get_data())
+    elapsed = time.perf_counter() - start
+
+    return elapsed / VIEWS * 1000, sent / VIEWS, response.status_code
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        database = pathlib.Path(tmp) / "conditional.sqlite"
+        build(database)
+        os.environ["DATABASE"] = str(database)
+
+        from src.server import create_app
+
+        client = create_app({"SCHEDULER": False}).test_client()
+        paths = ["/products/1", "/category/tees", "/category/tees?sort=price-low", "/static/fonts/" + sorted(os.listdir("src/server/static/fonts"))[0]]
+
+        print(f"{VIEWS} views each, anonymous client")
+        print(f"{'path':<32} {'first ms':>9} {'first B':>9} {'repeat ms':>10} {'repeat B':>9} {'status':>7}")
+        for path in paths:
+            first_ms, first_bytes, _ = drive(client, path, revalidate=False)
+            repeat_ms, repeat_bytes, status = drive(client, path, revalidate=True)
+            print(f"{path[:32]:<32} {first_ms:>9.2f} {first_bytes:>9,.0f} {repeat_ms:>10.2f} {repeat_bytes:>9,.0f} {status:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""A 404 flood against the pre-rendered error pages, compared with rendering the template per error.
+
+Mixes the kinds of paths bot scans probe for. Reports throughput, CPU per request and the latency
+spread. The "render per error" rows temporarily swap the old handler back in.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_error_pages [REQUESTS]
+"""
+
+from __future__ import annotations
+
+import os
+import pathlib
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+REQUESTS = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+PROBES = ("/wp-login.php", "/.env", "/admin.php", "/phpmyadmin/index.php", "/.git/config", "/xmlrpc.php", "/backup.zip")
+
+
+def flood(client, headers: dict[str, str]) -> dict[str, float]:
+    latencies = []
+    cpu = time.process_time()
+    wall = time.perf_counter()
+    for i in range(REQUESTS):
+        start = time.perf_counter()
+        response = client.get(f"{PROBES[i % len(PROBES)]}?n={i}", headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 404, response.status_code
+    wall = time.perf_counter() - wall
+    cpu = time.process_time() - cpu
+
+    latencies.sort()
+    return {
+        "req/s": REQUESTS / wall,
+        "cpu ms/req": cpu / REQUESTS * 1000,
+        "p50 ms": statistics.median(latencies),
+        "p99 ms": latencies[int(len(latencies) * 0.99)],
+        "bytes": len(response.data),
+    }
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        database = pathlib.Path(tmp) / "errors.sqlite"
+        sqlite3.connect(database).executescript(pathlib.Path("schema.sql").read_text())
+        os.environ["DATABASE"] = str(database)
+
+        from flask import render_template
+        from werkzeug.exceptions import NotFound
+
+        from src.server import create_app
+
+        app = create_app({"SCHEDULER": False})
+        client = app.test_client()
+        handlers = app.error_handler_spec[None][404]
+        prerendered = handlers[NotFound]
+
+        def render_per_error(e):
+            return render_template("error/404.html"), 404
+
+        rows = []
+        for name, handler in (("render per error", render_per_error), ("pre-rendered", prerendered)):
+            handlers[NotFound] = handler
+            for encoding in ("identity", "gzip"):
+                client.get(PROBES[0], headers={"Accept-Encoding": encoding})  # load the template / pages
+                rows.append((f"{name}, {encoding}", flood(client, {"Accept-Encoding": encoding})))
+        handlers[NotFound] = prerendered
+
+    print(f"{REQUESTS:,} requests for missing paths, single thread")
+    print(f"{'':<28}" + "".join(f" {column:>11}" for column in rows[0][1]))
+    for name, result in rows:
+        print(f"{name:<28}" + "".join(f" {value:>11,.2f}" if isinstance(value, float) else f" {value:>11,}" for value in result.values()))
+
+
+if __name__ == "__main__":
+    main()
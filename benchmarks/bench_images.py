@@ -0,0 +1,77 @@
+"""Image bytes a listing page downloads, with originals versus the derivative each slot picks.
+
+Builds derivatives for photo-like product shots and a hero banner, then works out which
+`srcset` candidate a browser would pick for the grid's card slots and the hero at desktop and
+phone viewports, the way browsers do: the narrowest width covering slot width times pixel ratio.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_images [CARDS]
+"""
+
+from __future__ import annotations
+
+import shutil
+import sys
+import time
+
+from PIL import Image, ImageFilter
+
+from src.images import DERIVED, PICTURES, derive_folder, image_set
+
+CARDS = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+FOLDER = "BENCHIMAGES00000"
+# (viewport width, device pixel ratio, card slot as a fraction of the viewport)
+VIEWPORTS = {"desktop 1440@1x": (1440, 1, 0.25), "phone 390@3x": (390, 3, 0.5)}
+
+
+def photo(size: tuple[int, int], seed: int) -> Image.Image:
+    """Smooth noise with some detail on top, which compresses about like a product photo."""
+    noise = Image.effect_noise((size[0] // 8, size[1] // 8), 60 + seed).convert("RGB")
+    base = noise.resize(size, Image.Resampling.BICUBIC).filter(ImageFilter.GaussianBlur(3))
+    detail = Image.effect_noise(size, 12).convert("RGB")
+    return Image.blend(base, detail, 0.15)
+
+
+def pick(srcset: list[tuple[int, str]], needed: float) -> str:
+    for width, url in srcset:
+        if width >= needed:
+            return url
+    return srcset[-1][1]
+
+
+def size_of(url: str) -> int:
+    return (PICTURES.parent.parent / url.lstrip("/")).stat().st_size
+
+
+def main() -> None:
+    folder = PICTURES / FOLDER
+    folder.mkdir(parents=True, exist_ok=True)
+    try:
+        for i in range(2):
+            photo((2400, 2400), i).save(folder / f"shot-{i}.jpg", quality=92)
+        photo((2000, 800), 2).save(folder / "hero.jpg", quality=92)
+
+        start = time.perf_counter()
+        derive_folder(FOLDER)
+        elapsed = time.perf_counter() - start
+
+        shots = [image_set(f"/static/product_pictures/{FOLDER}/shot-{i}.jpg") for i in range(2)]
+        hero = image_set(f"/static/product_pictures/{FOLDER}/hero.jpg")
+        assert hero and all(shots)
+
+        print(f"derivatives for 3 pictures built in {elapsed * 1000:.0f} ms, placeholder {len(hero.placeholder)} bytes inline")
+        print(f"listing page with a hero and {CARDS} cards of two pictures each, image kilobytes")
+        print(f"{'':<18} {'originals':>10} {'derivatives':>12} {'smaller':>8}")
+        for name, (viewport, ratio, slot) in VIEWPORTS.items():
+            original = size_of(hero.src) + CARDS * sum(size_of(shot.src) for shot in shots)
+            derived = size_of(pick(hero.sources["webp"], viewport * ratio))
+            derived += CARDS * sum(size_of(pick(shot.sources["webp"], viewport * slot * ratio)) for shot in shots)
+            print(f"{name:<18} {original / 1024:>10,.0f} {derived / 1024:>12,.0f} {original / derived:>7.1f}x")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+        shutil.rmtree(DERIVED / FOLDER, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Login storm: inline PBKDF2 on every request thread vs the bounded hashing pool.
+
+A burst of login threads hashes passwords while a probe thread serves a catalog
+page; reports login throughput and the probe's latency.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_login_storm [LOGIN_THREADS] [ITERATIONS]
+"""
+
+from __future__ import annotations
+
+import pathlib
+import sqlite3
+import statistics
+import sys
+import threading
+import time
+
+from src.hashing import HashingPool, pbkdf2
+from src.utils import Password
+
+THREADS = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+ITERATIONS = int(sys.argv[2]) if len(sys.argv) > 2 else 200_000
+DURATION = 3.0
+
+
+def build() -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    conn.executescript(pathlib.Path("schema.sql").read_text())
+    conn.execute(r"INSERT INTO CATEGORIES (NAME, DESCRIPTION) VALUES ('C', '')")
+    conn.executemany(
+        r"INSERT INTO PRODUCTS (UNIQUE_ID, NAME, PRICE, DESCRIPTION, SIZE, CATEGORY) VALUES (?, ?, 1, '', '1', 1)",
+        ((f"U{i}", f"P{i}") for i in range(1000)),
+    )
+    conn.commit()
+    return conn
+
+
+def storm(hash_password) -> tuple[float, list[float]]:
+    conn = build()
+    lock = threading.Lock()
+    stop = threading.Event()
+    logins = 0
+    latencies: list[float] = []
+
+    def login() -> None:
+        nonlocal logins
+        while not stop.is_set():
+            hash_password("hunter2")
+            with lock:
+                logins += 1
+
+    def probe() -> None:
+        while not stop.is_set():
+            start = time.perf_counter()
+            with lock:
+                rows = conn.execute(r"SELECT * FROM PRODUCTS").fetchall()
+            sorted(({"id": row[0], "name": row[2]} for row in rows), key=lambda item: item["name"])
+            latencies.append((time.perf_counter() - start) * 1000)
+            time.sleep(0.005)
+
+    threads = [threading.Thread(target=login) for _ in range(THREADS)] + [threading.Thread(target=probe)]
+    for thread in threads:
+        thread.start()
+    time.sleep(DURATION)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return logins / DURATION, latencies
+
+
+def main() -> None:
+    salt = 0
+    pool = HashingPool()
+
+    scenarios = {
+        "inline": lambda password: pbkdf2(password, salt, Password.ALGORITHM, ITERATIONS),
+        f"pool ({pool.workers} workers)": lambda password: pool.hash(password, salt, Password.ALGORITHM, ITERATIONS),
+    }
+
+    print(f"{THREADS} login threads, {ITERATIONS:,} iterations, {DURATION:.0f}s each")
+    print(f"{'mode':>20} {'logins/s':>10} {'probe p50 ms':>14} {'probe p99 ms':>14}")
+    for name, hash_password in scenarios.items():
+        rate, latencies = storm(hash_password)
+        p50 = statistics.median(latencies)
+        p99 = statistics.quantiles(latencies, n=100)[98]
+        print(f"{name:>20} {rate:>10.1f} {p50:>14.3f} {p99:>14.3f}")
+
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Cost of a log call on request threads: a row inserted and committed per record, against the batched `LogSink`.
+
+Several threads log at once, as request threads would. "call" is the time spent inside
+`logger.info`, the part a request waits for; "on disk" is until every row is committed.
+The last run gives the sink a queue too small for the burst, to show drops instead of waits.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_logs [RECORDS]
+"""
+
+from __future__ import annotations
+
+import logging
+import pathlib
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+RECORDS = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+THREADS = 4
+
+
+class CommitHandler(logging.Handler):
+    """One INSERT and COMMIT per record on the logging thread; `Handler.handle` serializes the calls."""
+
+    def __init__(self, path: pathlib.Path) -> None:
+        super().__init__()
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        from src.logs import INSERT_QUERY, log_time
+
+        self.conn.execute(INSERT_QUERY, (log_time(record.created), record.levelname, record.name, record.getMessage(), None, None))
+        self.conn.commit()
+
+
+def burst(handler: logging.Handler) -> list[float]:
+    """Per-call seconds for RECORDS log calls spread over THREADS threads."""
+    logger = logging.getLogger(f"bench.{id(handler)}")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+
+    timings: list[list[float]] = [[] for _ in range(THREADS)]
+
+    def work(index: int) -> None:
+        own = timings[index]
+        for i in range(RECORDS // THREADS):
+            start = time.perf_counter()
+            logger.info("GET /products/%s 200", i, extra={"request_id": f"{index}-{i}", "latency": 1.5})
+            own.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    logger.removeHandler(handler)
+    return [timing for own in timings for timing in own]
+
+
+def rows(path: pathlib.Path) -> int:
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(r"SELECT COUNT(*) FROM LOGS").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def main() -> None:
+    from src.logs import LogSink, SinkHandler
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, maxsize in (("commit per record", None), ("LogSink", RECORDS), ("LogSink, queue 1000", 1000)):
+            path = pathlib.Path(tmp) / f"logs-{len(results)}.sqlite"
+            sqlite3.connect(path).executescript(pathlib.Path("schema.sql").read_text())
+
+            start = time.perf_counter()
+            if maxsize is None:
+                timings = burst(CommitHandler(path))
+                dropped = 0
+            else:
+                sink = LogSink(str(path), maxsize=maxsize)
+                sink.start()
+                timings = burst(SinkHandler(sink))
+                sink.stop(timeout=60)
+                dropped = sink.dropped
+            elapsed = time.perf_counter() - start
+
+            quantiles = statistics.quantiles(timings, n=100)
+            results.append((name, quantiles[49] * 1e6, quantiles[98] * 1e6, elapsed, rows(path), dropped))
+
+    print(f"{RECORDS:,} records from {THREADS} threads")
+    print(f"{'':<22} {'call p50 µs':>12} {'call p99 µs':>12} {'on disk s':>10} {'rows':>8} {'dropped':>8}")
+    for name, p50, p99, elapsed, written, dropped in results:
+        print(f"{name:<22} {p50:>12.1f} {p99:>12.1f} {elapsed:>10.2f} {written:>8,} {dropped:>8,}")
+
+
+if __name__ == "__main__":
+    main()
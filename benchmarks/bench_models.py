@@ -0,0 +1,93 @@
+"""Memory and time to hydrate bulk listings of products, orders and users from a scratch database.
+
+"retained" is what the list of model objects keeps alive once built, measured with `tracemalloc`
+and including each row's attribute values; "peak" also counts the rows and query results the
+build goes through. Times are taken on a separate, untraced run. Run against an older checkout
+to compare.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_models [ROWS]
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+import pathlib
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+
+def build(path: pathlib.Path) -> None:
+    conn = sqlite3.connect(path)
+    conn.executescript(pathlib.Path("schema.sql").read_text())
+    conn.executemany(r"INSERT INTO CATEGORIES (NAME, DESCRIPTION) VALUES (?, '')", (("Tees",), ("Hoodies",), ("Caps",)))
+    conn.executemany(
+        r"INSERT INTO USERS (EMAIL, PASSWORD, NAME, ROLE, ADDRESS, PHONE) VALUES (?, '', ?, 'USER', '', '0000000000')",
+        ((f"shopper{i}@example.com", f"Shopper {i}") for i in range(ROWS)),
+    )
+    conn.executemany(
+        r"""
+            INSERT INTO PRODUCTS (UNIQUE_ID, NAME, PRICE, DISPLAY_PRICE, DESCRIPTION, STOCK, SIZE, CATEGORY, KEYWORDS)
+            VALUES (?, ?, 999, 1299, '', 5, ?, ?, 'cotton;summer;tee')
+        """,
+        ((f"U{i // 4:015}", f"Product {i // 4}", ("1", "10", "100", "1000")[i % 4], i // 4 % 3 + 1) for i in range(ROWS)),
+    )
+    conn.executemany(
+        r"INSERT INTO ORDERS (USER_ID, PRODUCT_ID, QUANTITY, TOTAL_PRICE) VALUES (?, ?, 1, 999)",
+        ((i % 1000 + 1, i + 1) for i in range(ROWS)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def measure(load) -> tuple[float, int, int, int]:
+    """Milliseconds, objects, retained bytes and peak bytes for `load()`."""
+    gc.collect()
+    start = time.perf_counter()
+    load()
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    objects = load()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed * 1000, len(objects), retained, peak
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        database = pathlib.Path(tmp) / "models.sqlite"
+        build(database)
+        os.environ["DATABASE"] = str(database)
+
+        from src.order import Order
+        from src.product import Product
+        from src.server import app, conn, create_app
+        from src.user import User
+
+        create_app({"SCHEDULER": False})
+        loads = {
+            "Product": lambda: Product.all(conn, admin=True),
+            "Order": lambda: Order.all(conn),
+            "User": lambda: User.all(conn),
+        }
+        with app.app_context():
+            Product.all(conn, admin=True, limit=10)  # warm the connection and, on older checkouts, the category lookups
+            results = {name: measure(load) for name, load in loads.items()}
+
+    print(f"{ROWS:,} rows per model")
+    print(f"{'':<8} {'ms':>8} {'retained MiB':>13} {'bytes/object':>13} {'peak MiB':>9}")
+    for name, (ms, count, retained, peak) in results.items():
+        print(f"{name:<8} {ms:>8.0f} {retained / 2**20:>13.1f} {retained / count:>13,.0f} {peak / 2**20:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Storefront throughput with the full-page cache off and on, anonymous and signed in.
+
+Runs the app in-process against a scratch catalog, with CSRF enabled so cached pages still get
+a per-visitor token stitched in. Signed-in pages also get their navbar and banner holes rendered
+per response.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_page_cache [SECONDS]
+"""
+
+from __future__ import annotations
+
+import os
+import pathlib
+import sqlite3
+import sys
+import tempfile
+import time
+
+SECONDS = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+PRODUCTS = 2_000
+PATHS = ("/", "/faq", "/about-us", "/contact-us", "/refund-policy", "/category/tees", "/category/tees?sort=price-low")
+
+
+def build(path: pathlib.Path) -> None:
+    conn = sqlite3.connect(path)
+    conn.executescript(pathlib.Path("schema.sql").read_text())
+    conn.executemany(
+        r"INSERT INTO USERS (EMAIL, PASSWORD, NAME, ROLE, ADDRESS, PHONE) VALUES (?, '', ?, ?, '', '0000000000')",
+        (("admin@example.com", "Admin", "ADMIN"), ("shopper@example.com", "Shopper", "USER")),
+    )
+    conn.executemany(r"INSERT INTO CATEGORIES (NAME, DESCRIPTION) VALUES (?, '')", (("Tees",), ("Hoodies",), ("Caps",)))
+    conn.executemany(
+        r"INSERT INTO PRODUCTS (UNIQUE_ID, NAME, PRICE, DISPLAY_PRICE, DESCRIPTION, STOCK, SIZE, CATEGORY) VALUES (?, ?, 999, 1299, '', 5, ?, ?)",
+        ((f"U{i // 4:015}", f"Product {i // 4}", ("1", "10", "100", "1000")[i % 4], i // 4 % 3 + 1) for i in range(PRODUCTS)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def rate(client, path: str) -> float:
+    client.get(path)  # warm templates and, when enabled, the page cache
+    done = 0
+    deadline = time.perf_counter() + SECONDS
+    while time.perf_counter() < deadline:
+        response = client.get(path)
+        assert response.status_code == 200, (path, response.status_code)
+        done += 1
+    return done / SECONDS
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        database = pathlib.Path(tmp) / "pages.sqlite"
+        build(database)
+        os.environ["DATABASE"] = str(database)
+
+        from src.server import create_app
+
+        app = create_app({"SCHEDULER": False})
+        anonymous = app.test_client()
+        shopper = app.test_client()
+        with shopper.session_transaction() as session:
+            session["_user_id"] = "2"
+
+        for visitor, client in (("anonymous", anonymous), ("signed-in", shopper)):
+            print(f"{visitor} GETs, {SECONDS:.0f}s per path, single thread")
+            print(f"{'path':<32} {'uncached req/s':>15} {'cached req/s':>13} {'speedup':>8}")
+            for path in PATHS:
+                app.config["PAGE_CACHE"] = False
+                uncached = rate(client, path)
+                app.config["PAGE_CACHE"] = True
+                cached = rate(client, path)
+                print(f"{path:<32} {uncached:>15,.0f} {cached:>13,.0f} {cached / uncached:>7.1f}x")
+            print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Deep-page latency of the admin order listing: LIMIT/OFFSET vs keyset cursors.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_pagination [ROWS]
+"""
+
+from __future__ import annotations
+
+import pathlib
+import sqlite3
+import sys
+import time
+
+from src.order import Order
+from src.pagination import Cursor
+from src.utils import sqlite_row_factory
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+LIMIT = 15
+
+
+def build(rows: int) -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(pathlib.Path("schema.sql").read_text())
+    conn.execute(r"INSERT INTO USERS (EMAIL, PASSWORD, NAME, ADDRESS, PHONE) VALUES ('b@b', '', 'B', '', '')")
+    conn.execute(r"INSERT INTO CATEGORIES (NAME, DESCRIPTION) VALUES ('C', '')")
+    conn.execute(r"INSERT INTO PRODUCTS (UNIQUE_ID, NAME, PRICE, DESCRIPTION, SIZE, CATEGORY) VALUES ('U', 'P', 1, '', '1', 1)")
+    conn.executemany(
+        r"INSERT INTO ORDERS (USER_ID, PRODUCT_ID, QUANTITY, TOTAL_PRICE) VALUES (1, 1, 1, ?)",
+        ((i,) for i in range(rows)),
+    )
+    conn.commit()
+    conn.row_factory = sqlite_row_factory
+    return conn
+
+
+def timed(func, repeat: int = 20) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> None:
+    conn = build(ROWS)
+    print(f"{ROWS:,} orders, {LIMIT} rows per page")
+    print(f"{'depth':>10} {'offset ms':>12} {'keyset ms':>12}")
+
+    for depth in (0, ROWS // 100, ROWS // 10, ROWS // 2, ROWS - LIMIT):
+        offset_ms = timed(
+            lambda: [
+                Order(conn, **row)
+                for row in conn.execute(r"SELECT * FROM ORDERS ORDER BY ID DESC LIMIT ? OFFSET ?", (LIMIT, depth)).fetchall()
+            ]
+        )
+
+        # the cursor a user holds after paging to `depth`
+        key = conn.execute(r"SELECT ID FROM ORDERS ORDER BY ID DESC LIMIT 1 OFFSET ?", (max(depth - 1, 0),)).fetchone()[0]
+        cursor = Cursor((key,), position=depth) if depth else None
+        Order.page(conn, cursor=cursor, limit=LIMIT)  # warm the cached total
+        keyset_ms = timed(lambda: Order.page(conn, cursor=cursor, limit=LIMIT))
+
+        print(f"{depth:>10,} {offset_ms:>12.3f} {keyset_ms:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
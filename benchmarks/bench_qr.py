@@ -0,0 +1,61 @@
+"""Order QR labels: the old fixed version-40 symbol against right-sized, cached and batched rendering.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_qr [ORDERS]
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import sys
+import time
+
+ORDERS = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+
+def version_40_png(order_id: int) -> bytes:
+    import qrcode
+    from qrcode.constants import ERROR_CORRECT_H
+
+    from src.utils import OrderQR
+
+    qr = qrcode.QRCode(version=40, error_correction=ERROR_CORRECT_H, box_size=10, border=4)
+    qr.add_data(OrderQR(order_id=order_id).payload)
+    qr.make(fit=True)
+    buffer = io.BytesIO()
+    qr.make_image(fill_color="black", back_color="white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def timed(func, *args, **kwargs) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    from src.utils import render_order_qr, render_order_qrs
+
+    sample = range(1, 51)
+    old_seconds, old = timed(lambda: [version_40_png(order_id) for order_id in sample])
+    new_seconds, new = timed(lambda: [render_order_qr(order_id, "png") for order_id in sample])
+    hit_seconds, _ = timed(lambda: [render_order_qr(order_id, "png") for order_id in sample])
+
+    print(f"per label, {len(sample)} orders")
+    print(f"{'':<22} {'ms':>9} {'PNG bytes':>10}")
+    print(f"{'version 40':<22} {old_seconds / len(sample) * 1000:>9.2f} {sum(map(len, old)) // len(sample):>10,}")
+    print(f"{'right-sized':<22} {new_seconds / len(sample) * 1000:>9.2f} {sum(map(len, new)) // len(sample):>10,}")
+    print(f"{'right-sized, cached':<22} {hit_seconds / len(sample) * 1000:>9.4f}")
+
+    print(f"\n{ORDERS:,} labels in one batch")
+    for workers in sorted({1, os.cpu_count() or 1}):
+        render_order_qr.cache_clear()
+        seconds, labels = timed(render_order_qrs, range(10_000, 10_000 + ORDERS), workers=workers)
+        assert len(labels) == ORDERS
+        print(f"{workers} worker(s): {seconds:.2f} s, {ORDERS / seconds:,.0f} labels/s")
+
+
+if __name__ == "__main__":
+    main()
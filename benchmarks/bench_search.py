@@ -0,0 +1,85 @@
+"""Support search latency: `LIKE '%term%'` scans vs the FTS5 index, first page of results.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_search [MESSAGES]
+"""
+
+from __future__ import annotations
+
+import pathlib
+import random
+import sqlite3
+import sys
+import time
+
+from src.search import install_search, match_expression
+from src.ticket import Ticket
+from src.utils import sqlite_row_factory
+
+MESSAGES = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+LIMIT = 15
+
+# a Zipf-like vocabulary: shop words are common, the long tail is filler, one term is planted rarely
+WORDS = (
+    "order parcel delivery late refund size colour hoodie tshirt payment upi card wrong damaged "
+    "exchange courier address tracking cancel invoice discount coupon stitching fabric return"
+).split() + [f"w{i}" for i in range(5000)]
+WEIGHTS = [1 / (rank + 1) for rank in range(len(WORDS))]
+RARE = "chargeback"
+
+
+def build(messages: int) -> sqlite3.Connection:
+    rng = random.Random(42)
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(pathlib.Path("schema.sql").read_text())
+    conn.execute(r"INSERT INTO USERS (EMAIL, PASSWORD, NAME, ADDRESS, PHONE) VALUES ('b@b', '', 'B', '', '')")
+
+    def rows():
+        for i in range(messages):
+            words = rng.choices(WORDS, WEIGHTS, k=20)
+            if i % 10_000 == 0:
+                words[rng.randrange(20)] = RARE
+            yield (" ".join(words[:3]), " ".join(words))
+
+    conn.executemany(r"INSERT INTO TICKETS (USER_ID, SUBJECT, MESSAGE) VALUES (1, ?, ?)", rows())
+    conn.commit()
+    install_search(conn)
+    conn.row_factory = sqlite_row_factory
+    return conn
+
+
+def timed(func, repeat: int = 5) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> None:
+    start = time.perf_counter()
+    conn = build(MESSAGES)
+    print(f"{MESSAGES:,} messages, index built in {time.perf_counter() - start:.1f}s, {LIMIT} hits per page")
+    print(f"{'query':>22} {'matches':>10} {'like ms':>12} {'fts ms':>12}")
+
+    for text in (RARE, "w4321", "damaged hoodie", "courier tracking late", "refu", "order"):
+        matches = conn.execute(
+            r"SELECT COUNT(*) FROM TICKETS_FTS WHERE TICKETS_FTS MATCH ?", (match_expression(text),)
+        ).fetchone()[0]
+        like = " AND ".join("(SUBJECT LIKE ? OR MESSAGE LIKE ?)" for _ in text.split())
+        params = tuple(f"%{word}%" for word in text.split() for _ in range(2))
+        like_ms = timed(
+            lambda: [
+                Ticket(conn, **row)
+                for row in conn.execute(f"SELECT * FROM TICKETS WHERE {like} ORDER BY ID DESC LIMIT {LIMIT}", params)
+            ]
+        )
+
+        Ticket.search(conn, text, limit=LIMIT)  # warm the cached total
+        fts_ms = timed(lambda: Ticket.search(conn, text, limit=LIMIT))
+
+        print(f"{text!r:>22} {matches:>10,} {like_ms:>12.3f} {fts_ms:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
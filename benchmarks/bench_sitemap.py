@@ -0,0 +1,71 @@
+"""Sitemap generation over a large catalog: planning shards, a cold shard, a cached shard.
+
+Builds a scratch database of PRODUCTS rows (three sizes per product) and drives the sitemap
+routes through the test client.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_sitemap [ROWS]
+"""
+
+from __future__ import annotations
+
+import os
+import pathlib
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+SIZES = ("1", "10", "100")
+
+
+def build(path: pathlib.Path, rows: int) -> None:
+    conn = sqlite3.connect(path)
+    conn.executescript(pathlib.Path("schema.sql").read_text())
+    conn.execute(r"INSERT INTO CATEGORIES (NAME, DESCRIPTION) VALUES ('C', '')")
+    conn.executemany(
+        r"INSERT INTO PRODUCTS (UNIQUE_ID, NAME, PRICE, DESCRIPTION, SIZE, CATEGORY) VALUES (?, 'P', 1, '', ?, 1)",
+        ((f"U{i // len(SIZES):015}", SIZES[i % len(SIZES)]) for i in range(rows)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def timed(label: str, func) -> bytes:
+    tracemalloc.start()
+    start = time.perf_counter()
+    data = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{label:<34} {elapsed * 1000:>10.1f} ms {peak / 2**20:>10.1f} MiB peak {len(data) / 2**20:>8.2f} MiB body")
+    return data
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        database = pathlib.Path(tmp) / "sitemap.sqlite"
+        build(database, ROWS)
+        os.environ["DATABASE"] = str(database)
+
+        from src.server import create_app
+
+        client = create_app({"SCHEDULER": False}).test_client()
+        print(f"{ROWS:,} product rows, {ROWS // len(SIZES):,} products")
+
+        timed("index (plans the shards)", lambda: client.get("/sitemap.xml").data)
+        timed("index (cached)", lambda: client.get("/sitemap.xml").data)
+        timed("products shard 1 (cold, streamed)", lambda: client.get("/sitemap-products-1.xml").data)
+        timed("products shard 1 (cached, gzip)", lambda: client.get("/sitemap-products-1.xml", headers={"Accept-Encoding": "gzip"}).data)
+        timed("products shard 1 (cached, plain)", lambda: client.get("/sitemap-products-1.xml").data)
+
+        etag = client.get("/sitemap-products-1.xml").headers["ETag"]
+        timed("products shard 1 (If-None-Match)", lambda: client.get("/sitemap-products-1.xml", headers={"If-None-Match": etag}).data)
+
+
+if __name__ == "__main__":
+    main()
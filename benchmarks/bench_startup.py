@@ -0,0 +1,84 @@
+"""Cold start of a web worker: importing `src.server`, `create_app()` and the first request.
+
+Each measurement runs in a fresh interpreter against a scratch database holding 0, 10k and
+100k products, so nothing is shared between runs but the OS page cache.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_startup [RUNS]
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RUNS = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+SIZES = (0, 10_000, 100_000)
+CATEGORIES = 50
+
+CHILD = r"""
+import json, time
+
+start = time.perf_counter()
+import src.server
+imported = time.perf_counter()
+app = src.server.create_app({"SCHEDULER": False})
+created = time.perf_counter()
+response = app.test_client().get("/")
+assert response.status_code == 200, response.status_code
+served = time.perf_counter()
+
+print(json.dumps({"import": imported - start, "create_app": created - imported, "first request": served - created}))
+"""
+
+
+def build(path: pathlib.Path, products: int) -> None:
+    conn = sqlite3.connect(path)
+    conn.executescript(pathlib.Path("schema.sql").read_text())
+    conn.executemany(
+        r"INSERT INTO CATEGORIES (NAME, DESCRIPTION) VALUES (?, '')",
+        ((f"Category {i}",) for i in range(CATEGORIES)),
+    )
+    conn.executemany(
+        r"INSERT INTO PRODUCTS (UNIQUE_ID, NAME, PRICE, DESCRIPTION, SIZE, CATEGORY) VALUES (?, ?, 100, '', 'M', ?)",
+        ((f"U{i:015}", f"Product {i}", i % CATEGORIES + 1) for i in range(products)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def measure(database: pathlib.Path) -> dict[str, float]:
+    env = {**os.environ, "DATABASE": str(database)}
+    output = subprocess.run([sys.executable, "-c", CHILD], env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main() -> None:
+    print(f"median of {RUNS} fresh interpreters, milliseconds")
+    print(f"{'products':>10} {'import':>10} {'create_app':>12} {'first request':>15} {'total':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in SIZES:
+            database = pathlib.Path(tmp) / f"startup-{size}.sqlite"
+            build(database, size)
+            measure(database)  # compile bytecode and warm the page cache
+
+            runs = [measure(database) for _ in range(RUNS)]
+            phases = {phase: statistics.median(run[phase] for run in runs) * 1000 for phase in runs[0]}
+            total = statistics.median(sum(run.values()) for run in runs) * 1000
+
+            print(
+                f"{size:>10,} {phases['import']:>10.1f} {phases['create_app']:>12.1f} "
+                f"{phases['first request']:>15.1f} {total:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Product pictures downloading while a page renders, through one worker's ASGI app.
+
+Starts DOWNLOADS concurrent requests for a 4 MiB picture together with one request for `/faq`, and
+reports how long the page took and the total download throughput. "flask" sends the pictures with
+Flask's static view on the worker's WSGI thread; "asgi" sends them from the event loop.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_static [DOWNLOADS] [ROUNDS]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import pathlib
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+DOWNLOADS = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+ROUNDS = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+PICTURE_BYTES = 4 * 1024 * 1024
+PAGE = "/faq"
+
+
+async def request(app, path: str) -> tuple[int, int, float]:
+    """Status, body size and seconds until the last body message."""
+    status = 0
+    size = 0
+    start = time.perf_counter()
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status, size
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        else:
+            size += len(message.get("body", b""))
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"localhost")],
+        "server": ("localhost", 80),
+        "client": ("127.0.0.1", 1234),
+    }
+    await app(scope, receive, send)
+    return status, size, time.perf_counter() - start
+
+
+async def round_trip(app, picture: str) -> tuple[float, float]:
+    """Page latency in ms and download throughput in MiB/s for one round."""
+    start = time.perf_counter()
+    downloads = [asyncio.ensure_future(request(app, picture)) for _ in range(DOWNLOADS)]
+    await asyncio.sleep(0)
+    status, _, page_seconds = await request(app, PAGE)
+    assert status == 200, status
+
+    results = await asyncio.gather(*downloads)
+    assert all(status == 200 and size == PICTURE_BYTES for status, size, _ in results), results[0]
+    return page_seconds * 1000, DOWNLOADS * PICTURE_BYTES / 2**20 / (time.perf_counter() - start)
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        database = pathlib.Path(tmp) / "static.sqlite"
+        sqlite3.connect(database).executescript(pathlib.Path("schema.sql").read_text())
+        os.environ["DATABASE"] = str(database)
+        os.environ["CACHE_DATABASE"] = str(pathlib.Path(tmp) / "cache.sqlite")
+
+        from asgiref.wsgi import WsgiToAsgi
+
+        from src.server import app, create_app
+        from src.server.static_files import StaticFiles
+
+        create_app({"SCHEDULER": False})
+        folder = pathlib.Path(app.static_folder) / "product_pictures" / "_bench_static"
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / "picture.jpg").write_bytes(os.urandom(PICTURE_BYTES))
+        picture = "/static/product_pictures/_bench_static/picture.jpg"
+
+        try:
+            alone = asyncio.run(request(WsgiToAsgi(app), PAGE))[2] * 1000
+
+            rows = []
+            for delivery in ("flask", "asgi"):
+                worker = StaticFiles(WsgiToAsgi(app), delivery=delivery)
+                results = [asyncio.run(round_trip(worker, picture)) for _ in range(ROUNDS)]
+                rows.append((delivery, [page for page, _ in results], [speed for _, speed in results]))
+        finally:
+            shutil.rmtree(folder)
+
+    print(f"{PAGE} alone: {alone:.1f} ms")
+    print(f"{PAGE} started with {DOWNLOADS} downloads of a {PICTURE_BYTES // 2**20} MiB picture, {ROUNDS} rounds")
+    print(f"{'':<8} {'page p50 ms':>12} {'page max ms':>12} {'MiB/s':>8}")
+    for delivery, pages, speeds in rows:
+        print(f"{delivery:<8} {statistics.median(pages):>12.1f} {max(pages):>12.1f} {statistics.median(speeds):>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
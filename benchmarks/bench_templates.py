@@ -0,0 +1,85 @@
+"""First-request latency of a fresh worker with and without compiled templates.
+
+Each measurement runs in a fresh interpreter. It compares compiling templates on demand (the
+old behaviour), loading them from a bytecode cache filled by `precompile_templates.py`, and the
+same with the hot templates loaded by `create_app()` before the worker reports ready.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_templates [RUNS]
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RUNS = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+PATHS = ("/", "/category/tees", "/faq", "/missing-page")
+
+CHILD = r"""
+import json, sys, time
+
+start = time.perf_counter()
+import src.server
+app = src.server.create_app({"SCHEDULER": False})
+timings = {"create_app": time.perf_counter() - start}
+
+client = app.test_client()
+for path in sys.argv[1:]:
+    started = time.perf_counter()
+    client.get(path)
+    timings[path] = time.perf_counter() - started
+
+print(json.dumps(timings))
+"""
+
+SETUPS = (
+    ("compile on demand", {"TEMPLATE_CACHE": "", "TEMPLATE_WARMUP": "False"}),
+    ("bytecode cache", {"TEMPLATE_WARMUP": "False"}),
+    ("bytecode + warm-up", {"TEMPLATE_WARMUP": "True"}),
+)
+
+
+def build(path: pathlib.Path) -> None:
+    conn = sqlite3.connect(path)
+    conn.executescript(pathlib.Path("schema.sql").read_text())
+    conn.execute(r"INSERT INTO CATEGORIES (NAME, DESCRIPTION) VALUES ('Tees', '')")
+    conn.executemany(
+        r"INSERT INTO PRODUCTS (UNIQUE_ID, NAME, PRICE, DISPLAY_PRICE, DESCRIPTION, SIZE, CATEGORY) VALUES (?, ?, 100, 120, '', '1', 1)",
+        ((f"U{i:015}", f"Product {i}") for i in range(50)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def measure(env: dict[str, str]) -> dict[str, float]:
+    output = subprocess.run([sys.executable, "-c", CHILD, *PATHS], env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        database = pathlib.Path(tmp) / "templates.sqlite"
+        build(database)
+        base = {**os.environ, "DATABASE": str(database), "PAGE_CACHE_SHARED": "False", "TEMPLATE_CACHE": f"{tmp}/bytecode"}
+        subprocess.run([sys.executable, "precompile_templates.py"], env=base, capture_output=True, check=True)
+
+        print(f"median of {RUNS} fresh interpreters, milliseconds")
+        print(f"{'':<20} {'create_app':>11}" + "".join(f" {path:>15}" for path in PATHS))
+        for name, overrides in SETUPS:
+            env = {**base, **overrides}
+            measure(env)  # warm the OS page cache and Python's bytecode
+            runs = [measure(env) for _ in range(RUNS)]
+            phases = {phase: statistics.median(run[phase] for run in runs) * 1000 for phase in runs[0]}
+            print(f"{name:<20} {phases['create_app']:>11.1f}" + "".join(f" {phases[path]:>15.1f}" for path in PATHS))
+
+
+if __name__ == "__main__":
+    main()
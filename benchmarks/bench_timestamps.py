@@ -0,0 +1,101 @@
+"""Hydrating and rendering 10k orders, with timestamps parsed eagerly by arrow or lazily by `Timestamp`.
+
+"eager" reproduces the old behaviour: `arrow.get` on every row at construction, and a
+`datetimeformat` filter that parses again, formats with arrow's tokens and humanizes against a
+fresh now per row. "lazy" is the current code.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_timestamps [ROWS]
+"""
+
+from __future__ import annotations
+
+import os
+import pathlib
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+TABLE = "{% for order in orders %}<tr><td>{{ order.id }}</td><td>{{ order.created_at | datetimeformat }}</td></tr>{% endfor %}"
+
+
+def rows() -> list[dict]:
+    random.seed(1)
+    start = 1_700_000_000
+    return [
+        {
+            "id": i,
+            "user_id": 1,
+            "product_id": 1,
+            "quantity": 1,
+            "total_price": 999,
+            "created_at": time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(start + random.randrange(30_000_000))),
+            "status": "PEND",
+            "razorpay_order_id": None,
+        }
+        for i in range(ROWS)
+    ]
+
+
+def best(func, repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        database = pathlib.Path(tmp) / "timestamps.sqlite"
+        sqlite3.connect(database).executescript(pathlib.Path("schema.sql").read_text())
+        os.environ["DATABASE"] = str(database)
+
+        import arrow
+
+        from src.order import Order
+        from src.server import app, create_app
+
+        create_app({"SCHEDULER": False})
+        data = rows()
+
+        def hydrate_eager() -> list[Order]:
+            orders = [Order(None, **row) for row in data]  # type: ignore[arg-type]
+            for order in orders:
+                order.created_at = arrow.get(order._created_at)
+            return orders
+
+        def hydrate_lazy() -> list[Order]:
+            return [Order(None, **row) for row in data]  # type: ignore[arg-type]
+
+        def eager_filter(value):
+            dt = arrow.get(value)
+            return f"{dt.format('YYYY-MM-DD HH:mm:ss')} ({dt.humanize()})"
+
+        lazy_filter = app.jinja_env.filters["datetimeformat"]
+        template = app.jinja_env.from_string(TABLE)
+
+        results = {}
+        for name, hydrate, datetimeformat in (("eager", hydrate_eager, eager_filter), ("lazy", hydrate_lazy, lazy_filter)):
+            app.jinja_env.filters["datetimeformat"] = datetimeformat
+
+            def render() -> str:
+                with app.test_request_context():
+                    return template.render(orders=hydrate())
+
+            results[name] = (best(hydrate), best(render))
+        app.jinja_env.filters["datetimeformat"] = lazy_filter
+
+    print(f"{ROWS:,} orders, best of 3")
+    print(f"{'':<8} {'hydrate ms':>11} {'hydrate + render ms':>20}")
+    for name, (hydrate_ms, render_ms) in results.items():
+        print(f"{name:<8} {hydrate_ms:>11.1f} {render_ms:>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Memory and disk cost of image uploads, read-whole-file versus streamed into the object store.
+
+Werkzeug has already spooled each upload to a temporary file; this measures what the view does
+with it. Peak Python allocations are traced while saving one large upload, then the same
+picture is saved for many products to compare disk use.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_uploads [MEGABYTES]
+"""
+
+from __future__ import annotations
+
+import os
+import pathlib
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import src.uploads
+from src.uploads import link_upload, store_upload
+
+MEGABYTES = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+REPEATS = 30
+PICTURE_BYTES = 4 * 1024 * 1024
+
+
+def upload() -> tempfile.SpooledTemporaryFile:
+    """A JPEG-looking upload as werkzeug hands it over: rolled over to disk."""
+    file = tempfile.SpooledTemporaryFile(max_size=500 * 1024)
+    file.write(b"\xff\xd8\xff\xe0" + os.urandom(MEGABYTES * 1024 * 1024 - 4))
+    file.seek(0)
+    return file
+
+
+def traced(func) -> tuple[float, float]:
+    """(peak MiB allocated, seconds) while `func` saves a fresh upload."""
+    with upload() as file:
+        tracemalloc.start()
+        start = time.perf_counter()
+        func(file)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return peak / 2**20, elapsed
+
+
+def disk_usage(*paths: pathlib.Path) -> int:
+    """Bytes used by the files under `paths`, counting hard links to one file once."""
+    inodes = {file.stat().st_ino: file.stat().st_size for path in paths for file in path.rglob("*") if file.is_file()}
+    return sum(inodes.values())
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = pathlib.Path(tmp)
+        src.uploads.OBJECTS = root / "objects"
+
+        def read_whole(file) -> None:
+            with open(root / "whole.jpg", "wb+") as target:
+                target.write(file.read())
+
+        def streamed(file) -> None:
+            link_upload(store_upload(file, max_bytes=2**40), root / "streamed.jpg")
+
+        print(f"one {MEGABYTES} MiB upload")
+        print(f"{'':<22} {'peak MiB':>9} {'seconds':>8}")
+        for name, func in (("read whole file", read_whole), ("streamed + hashed", streamed)):
+            peak, elapsed = traced(func)
+            print(f"{name:<22} {peak:>9.1f} {elapsed:>8.2f}")
+
+        shutil.rmtree(src.uploads.OBJECTS)
+        content = b"\xff\xd8\xff\xe0" + os.urandom(PICTURE_BYTES - 4)
+        for i in range(REPEATS):
+            (root / "copies" / str(i)).mkdir(parents=True)
+            (root / "copies" / str(i) / "front.jpg").write_bytes(content)
+            with open(root / "copies" / str(i) / "front.jpg", "rb") as file:
+                link_upload(store_upload(file, max_bytes=2**40), root / "linked" / str(i) / "front.jpg")
+
+        print(f"\nthe same {PICTURE_BYTES // 2**20} MiB picture for {REPEATS} products, MiB on disk")
+        print(f"{'copied per product':<22} {disk_usage(root / 'copies') / 2**20:>9.1f}")
+        print(f"{'content-addressed':<22} {disk_usage(root / 'linked', root / 'objects') / 2**20:>9.1f}")
+        shutil.rmtree(root / "copies")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Throughput of `main.py` as the number of worker processes grows from 1 to N.
+
+Starts the server on a scratch database for each worker count and drives the home page
+with keep-alive client processes.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_workers [MAX_WORKERS] [SECONDS]
+"""
+
+from __future__ import annotations
+
+import http.client
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+MAX_WORKERS = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1
+SECONDS = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+CLIENTS = max(MAX_WORKERS * 2, 4)
+PATH = "/"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_ready(port: int, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            client = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            client.request("GET", PATH)
+            if client.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    error = f"server on port {port} did not come up"
+    raise RuntimeError(error)
+
+
+def drive(port: int, seconds: float) -> int:
+    client = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    deadline = time.monotonic() + seconds
+    done = 0
+
+    while time.monotonic() < deadline:
+        client.request("GET", PATH)
+        response = client.getresponse()
+        response.read()
+        done += response.status == 200
+
+    return done
+
+
+def run(workers: int) -> float:
+    port = free_port()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        env = dict(
+            os.environ,
+            WORKERS=str(workers),
+            PORT=str(port),
+            HOST="127.0.0.1",
+            DATABASE=os.path.join(scratch, "database.sqlite"),
+            CACHE_DATABASE=os.path.join(scratch, "cache.sqlite"),
+        )
+        server = subprocess.Popen(
+            [sys.executable, "main.py"], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            wait_ready(port)
+            time.sleep(workers * 0.5)  # let every worker finish booting
+
+            with multiprocessing.Pool(CLIENTS) as pool:
+                counts = pool.starmap(drive, [(port, SECONDS)] * CLIENTS)
+        finally:
+            server.terminate()
+            server.wait()
+
+    return sum(counts) / SECONDS
+
+
+def main() -> None:
+    print(f"GET {PATH}, {CLIENTS} keep-alive clients, {SECONDS:.0f}s per run, {os.cpu_count()} cores")
+    print(f"{'workers':>8} {'req/s':>10} {'scaling':>8}")
+
+    baseline = None
+    for workers in range(1, MAX_WORKERS + 1):
+        rate = run(workers)
+        baseline = baseline or rate
+        print(f"{workers:>8} {rate:>10.1f} {rate / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Which modules make `import src.server` slow, from `python -X importtime`.
+
+Prints the modules with the largest cumulative import time, and their own (self) time.
+
+Run from the repository root:
+
+    python -m benchmarks.profile_imports [MODULE] [TOP]
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+MODULE = sys.argv[1] if len(sys.argv) > 1 else "src.server"
+TOP = int(sys.argv[2]) if len(sys.argv) > 2 else 25
+
+
+def profile(module: str) -> list[tuple[str, int, int]]:
+    """(module, self µs, cumulative µs) for every module imported by `import module`."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line.removeprefix("import time:").split("|")
+        rows.append((name.strip(), int(own), int(cumulative)))
+    return rows
+
+
+def main() -> None:
+    rows = profile(MODULE)
+    total = max(cumulative for _, _, cumulative in rows)
+
+    print(f"import {MODULE}: {total / 1000:.1f} ms, {len(rows)} modules")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, own, cumulative in sorted(rows, key=lambda row: row[2], reverse=True)[:TOP]:
+        print(f"{cumulative / 1000:>14.1f} {own / 1000:>9.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+"""Deploy step: copy static assets under content-hashed names, precompress them and write the manifest."""
+
+from __future__ import annotations
+
+from src.assets import ASSETS, build_assets
+
+manifest, removed = build_assets()
+print(f"built {len(manifest)} assets into {ASSETS}, removed {removed} stale files")
+for name, built in manifest.items():
+    print(f"{name} -> {built}")
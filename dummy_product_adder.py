@@ -3,11 +3,11 @@ import random
 import sqlite3
 import string
 
-from PIL import Image
-
 import first  # noqa
 from src.carousel import Carousel
+from src.images import PICTURES, derive_folder
 from src.product import Category, Product
+from src.uploads import link_upload, store_upload
 from src.utils import size_names, sqlite_row_factory
 
 first
@@ -23,7 +23,6 @@ with open("schema.sql") as f:
 conn.row_factory = sqlite_row_factory
 conn.commit()
 
-UPLOAD_FOLDER = "src/server/static/product_pictures"
 PRICES = [1800, 1900, 1799, 1500, 2500, 3000]
 DISPLAY_PRICE = [2000, 2100, 1999, 1600, 2700, 3600]
 KEYWORDS = [
@@ -44,21 +43,26 @@ def generate_unique_identifier():
     return "".join(random.choices(string.ascii_uppercase + string.digits, k=16))
 
 
+def add_picture(path, folder, position):
+    with open(path, "rb") as file:
+        stored = store_upload(file)
+    link_upload(stored, PICTURES / folder / f"{position:02}-{stored.name}")
+
+
 product_image_path = [r"front-image.png", r"back-image.png"]
 carosel_image_path = r"placeholder-2000x800.png"
 
+picture_folders = []
+
 for i in range(1, 4):
     cat = Category.create(conn, name=f"Category {i}", description=f"Category {i} Description")
 
-    imgs = [Image.open(path) for path in product_image_path]
     for k in range(10):
         sub_folder = generate_unique_identifier()
+        picture_folders.append(sub_folder)
 
-        for j, img in enumerate(imgs):
-            if not os.path.exists(f"{UPLOAD_FOLDER}/{sub_folder}"):
-                os.makedirs(f"{UPLOAD_FOLDER}/{sub_folder}")
-
-            img.save(f"{UPLOAD_FOLDER}/{sub_folder}/{j}-{generate_unique_identifier()}.png")
+        for j, path in enumerate(product_image_path):
+            add_picture(path, sub_folder, j)
 
         for size in size_names:
             Product.create(
@@ -74,12 +78,9 @@ for i in range(1, 4):
                 size=size,
             )
 
-caro_image = Image.open(carosel_image_path)
 sub_folder = generate_unique_identifier()
-if not os.path.exists(f"{UPLOAD_FOLDER}/{sub_folder}"):
-    os.makedirs(f"{UPLOAD_FOLDER}/{sub_folder}")
-
-caro_image.save(f"{UPLOAD_FOLDER}/{sub_folder}/{generate_unique_identifier()}.png")
+add_picture(carosel_image_path, sub_folder, 0)
+picture_folders.append(sub_folder)
 
 for i in range(1, 4):
     Carousel.create(
@@ -89,5 +90,8 @@ for i in range(1, 4):
         description="Carousel Description",
     )
 
+for folder in picture_folders:
+    derive_folder(folder)
+
 conn.commit()
 conn.close()
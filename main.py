@@ -4,10 +4,9 @@ import asyncio
 import os
 
 import uvicorn
-from asgiref.wsgi import WsgiToAsgi
 from dotenv import load_dotenv
 
-from src.server import app
+from src.hashing import web_workers
 
 if os.name == "nt":
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
@@ -24,9 +23,34 @@ load_dotenv()
 PORT = int(os.getenv("PORT", 80))
 DEBUG = os.getenv("DEBUG", "False").lower() == "true"
 HOST = os.getenv("HOST", "0.0.0.0")
+WORKERS = web_workers()
+GRACEFUL_TIMEOUT = int(os.getenv("GRACEFUL_TIMEOUT", 30))
 
+# workers import the app themselves, so the supervisor never opens the database or starts the scheduler
+ASGI_APP = "src.server.asgi:asgi_app"
+
+
+def __getattr__(name: str):
+    # keeps `uvicorn main:asgi_app` working
+    if name == "asgi_app":
+        from src.server.asgi import asgi_app
+
+        return asgi_app
+
+    error = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(error)
 
-asgi_app = WsgiToAsgi(app)
 
 if __name__ == "__main__":
-    uvicorn.run(asgi_app, host=HOST, port=PORT, reload=DEBUG, log_level="debug", lifespan="off")
+    # with WORKERS > 1 the supervisor binds the socket once and shares it with every worker;
+    # it replaces workers that die, and SIGHUP restarts them one at a time
+    uvicorn.run(
+        ASGI_APP,
+        host=HOST,
+        port=PORT,
+        reload=DEBUG,
+        workers=1 if DEBUG else WORKERS,
+        timeout_graceful_shutdown=GRACEFUL_TIMEOUT,
+        log_level="debug",
+        lifespan="on",
+    )
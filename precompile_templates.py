@@ -0,0 +1,13 @@
+"""Deploy step: compile every template into the bytecode cache the workers load from."""
+
+from __future__ import annotations
+
+from src.server.templating import TEMPLATE_CACHE, precompile_templates
+
+if not TEMPLATE_CACHE:
+    raise SystemExit("TEMPLATE_CACHE is empty, there is nowhere to store compiled templates")
+
+compiled, failed = precompile_templates()
+print(f"compiled {compiled} templates into {TEMPLATE_CACHE}")
+for name in failed:
+    print(f"failed to compile {name}")
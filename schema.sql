@@ -29,6 +29,7 @@ CREATE TABLE IF NOT EXISTS `PRODUCTS` (
     `KEYWORDS`  TEXT            DEFAULT         "",
 
     `CREATED_AT` TIMESTAMP      DEFAULT         CURRENT_TIMESTAMP,
+    `UPDATED_AT` TIMESTAMP      DEFAULT         CURRENT_TIMESTAMP,
 
     FOREIGN KEY (`CATEGORY`)    REFERENCES `CATEGORIES`(`ID`) ON DELETE CASCADE
 );
@@ -100,7 +101,9 @@ CREATE TABLE IF NOT EXISTS `LOGS` (
     `MESSAGE`   TEXT            NOT NULL,
     `CREATED_AT` TIMESTAMP      DEFAULT         CURRENT_TIMESTAMP,
     `LEVEL`     CHAR(5)         DEFAULT         'INFO',
-    `NAME`      TEXT            DEFAULT         NULL
+    `NAME`      TEXT            DEFAULT         NULL,
+    `REQUEST_ID` TEXT           DEFAULT         NULL,
+    `LATENCY`   REAL            DEFAULT         NULL
 );
 
 CREATE TABLE IF NOT EXISTS `CATEGORIES` (
@@ -146,4 +149,86 @@ CREATE TABLE IF NOT EXISTS `RETURN_REQUESTS` (
     FOREIGN KEY (`ORDER_ID`)    REFERENCES `ORDERS`(`ID`)   ON DELETE CASCADE
 );
 
+-- one row per scheduled job; the worker holding an unexpired lease is the one that runs it
+CREATE TABLE IF NOT EXISTS `JOB_LEASES` (
+    `NAME`      TEXT            PRIMARY KEY,
+    `OWNER`     TEXT            NOT NULL,
+    `EXPIRES_AT` REAL           NOT NULL
+);
+
+-- one counter per table, bumped by the triggers below, so workers can tell when their in-memory copies are stale.
+-- PRODUCTS changes on every write, stock included; CATALOG only when products are added, removed or edited.
+-- IMAGES has no trigger, the picture pipeline bumps it once a folder's derivatives are rebuilt.
+CREATE TABLE IF NOT EXISTS `VERSIONS` (
+    `NAME`      TEXT            PRIMARY KEY,
+    `VERSION`   INTEGER         NOT NULL        DEFAULT 0,
+    `UPDATED_AT` TIMESTAMP      DEFAULT         CURRENT_TIMESTAMP
+);
+
+INSERT OR IGNORE INTO `VERSIONS` (`NAME`) VALUES ('CATEGORIES'), ('PRODUCTS'), ('CATALOG'), ('CAROUSEL'), ('IMAGES');
+
+CREATE TRIGGER IF NOT EXISTS `CATEGORIES_VERSION_INSERT` AFTER INSERT ON `CATEGORIES` BEGIN
+    UPDATE `VERSIONS` SET `VERSION` = `VERSION` + 1, `UPDATED_AT` = CURRENT_TIMESTAMP WHERE `NAME` = 'CATEGORIES';
+END;
+
+CREATE TRIGGER IF NOT EXISTS `CATEGORIES_VERSION_UPDATE` AFTER UPDATE ON `CATEGORIES` BEGIN
+    UPDATE `VERSIONS` SET `VERSION` = `VERSION` + 1, `UPDATED_AT` = CURRENT_TIMESTAMP WHERE `NAME` = 'CATEGORIES';
+END;
+
+CREATE TRIGGER IF NOT EXISTS `CATEGORIES_VERSION_DELETE` AFTER DELETE ON `CATEGORIES` BEGIN
+    UPDATE `VERSIONS` SET `VERSION` = `VERSION` + 1, `UPDATED_AT` = CURRENT_TIMESTAMP WHERE `NAME` = 'CATEGORIES';
+END;
+
+CREATE TRIGGER IF NOT EXISTS `CAROUSEL_VERSION_INSERT` AFTER INSERT ON `CAROUSEL` BEGIN
+    UPDATE `VERSIONS` SET `VERSION` = `VERSION` + 1, `UPDATED_AT` = CURRENT_TIMESTAMP WHERE `NAME` = 'CAROUSEL';
+END;
+
+CREATE TRIGGER IF NOT EXISTS `CAROUSEL_VERSION_UPDATE` AFTER UPDATE ON `CAROUSEL` BEGIN
+    UPDATE `VERSIONS` SET `VERSION` = `VERSION` + 1, `UPDATED_AT` = CURRENT_TIMESTAMP WHERE `NAME` = 'CAROUSEL';
+END;
+
+CREATE TRIGGER IF NOT EXISTS `CAROUSEL_VERSION_DELETE` AFTER DELETE ON `CAROUSEL` BEGIN
+    UPDATE `VERSIONS` SET `VERSION` = `VERSION` + 1, `UPDATED_AT` = CURRENT_TIMESTAMP WHERE `NAME` = 'CAROUSEL';
+END;
+
+CREATE TRIGGER IF NOT EXISTS `PRODUCTS_VERSION_INSERT` AFTER INSERT ON `PRODUCTS` BEGIN
+    UPDATE `VERSIONS` SET `VERSION` = `VERSION` + 1, `UPDATED_AT` = CURRENT_TIMESTAMP WHERE `NAME` IN ('PRODUCTS', 'CATALOG');
+END;
+
+-- databases migrated to `UPDATED_AT` got the column without its default, which `ALTER TABLE` cannot add
+CREATE TRIGGER IF NOT EXISTS `PRODUCTS_UPDATED_AT_INSERT` AFTER INSERT ON `PRODUCTS` WHEN NEW.`UPDATED_AT` IS NULL BEGIN
+    UPDATE `PRODUCTS` SET `UPDATED_AT` = NEW.`CREATED_AT` WHERE `ID` = NEW.`ID`;
+END;
+
+CREATE TRIGGER IF NOT EXISTS `PRODUCTS_VERSION_DELETE` AFTER DELETE ON `PRODUCTS` BEGIN
+    UPDATE `VERSIONS` SET `VERSION` = `VERSION` + 1, `UPDATED_AT` = CURRENT_TIMESTAMP WHERE `NAME` IN ('PRODUCTS', 'CATALOG');
+END;
+
+CREATE TRIGGER IF NOT EXISTS `PRODUCTS_VERSION_UPDATE` AFTER UPDATE ON `PRODUCTS` BEGIN
+    UPDATE `VERSIONS` SET `VERSION` = `VERSION` + 1, `UPDATED_AT` = CURRENT_TIMESTAMP WHERE `NAME` = 'PRODUCTS';
+END;
+
+-- `Product.update` rewrites every column, so only real content changes count as an edit
+CREATE TRIGGER IF NOT EXISTS `PRODUCTS_CATALOG_UPDATE` AFTER UPDATE ON `PRODUCTS`
+WHEN NEW.`NAME` IS NOT OLD.`NAME` OR NEW.`PRICE` IS NOT OLD.`PRICE` OR NEW.`DISPLAY_PRICE` IS NOT OLD.`DISPLAY_PRICE`
+    OR NEW.`DESCRIPTION` IS NOT OLD.`DESCRIPTION` OR NEW.`SIZE` IS NOT OLD.`SIZE` OR NEW.`CATEGORY` IS NOT OLD.`CATEGORY`
+    OR NEW.`KEYWORDS` IS NOT OLD.`KEYWORDS` OR NEW.`UNIQUE_ID` IS NOT OLD.`UNIQUE_ID`
+BEGIN
+    UPDATE `PRODUCTS` SET `UPDATED_AT` = CURRENT_TIMESTAMP WHERE `ID` = NEW.`ID`;
+    UPDATE `VERSIONS` SET `VERSION` = `VERSION` + 1, `UPDATED_AT` = CURRENT_TIMESTAMP WHERE `NAME` = 'CATALOG';
+END;
+
+CREATE INDEX IF NOT EXISTS `FAVOURITES_USER_ID`     ON `FAVOURITES` (`USER_ID`);
+CREATE INDEX IF NOT EXISTS `PRODUCTS_UNIQUE_ID`     ON `PRODUCTS` (`UNIQUE_ID`);
+CREATE INDEX IF NOT EXISTS `PRODUCTS_CATEGORY`      ON `PRODUCTS` (`CATEGORY`);
+CREATE INDEX IF NOT EXISTS `PRODUCTS_CATEGORY_PRICE` ON `PRODUCTS` (`CATEGORY`, `PRICE`);
+CREATE INDEX IF NOT EXISTS `ORDERS_STATUS`          ON `ORDERS` (`STATUS`);
+CREATE INDEX IF NOT EXISTS `ORDERS_USER_ID`         ON `ORDERS` (`USER_ID`);
+CREATE INDEX IF NOT EXISTS `ORDERS_CREATED_AT`      ON `ORDERS` (`CREATED_AT`);
+CREATE INDEX IF NOT EXISTS `TICKETS_REPLIED_TO`     ON `TICKETS` (`REPLIED_TO`) WHERE `REPLIED_TO` IS NOT NULL;
+CREATE INDEX IF NOT EXISTS `TICKETS_STATUS_CREATED_AT` ON `TICKETS` (`STATUS`, `CREATED_AT`) WHERE `REPLIED_TO` IS NULL;
+CREATE INDEX IF NOT EXISTS `TICKETS_CREATED_AT`     ON `TICKETS` (`CREATED_AT`) WHERE `REPLIED_TO` IS NULL;
+CREATE INDEX IF NOT EXISTS `LOGS_CREATED_AT`        ON `LOGS` (`CREATED_AT`);
+CREATE INDEX IF NOT EXISTS `LOGS_LEVEL_CREATED_AT`  ON `LOGS` (`LEVEL`, `CREATED_AT`);
+
 COMMIT;
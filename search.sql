@@ -0,0 +1,42 @@
+-- Full-text indexes for support tickets and return requests.
+-- Kept apart from schema.sql because FTS5 is an optional SQLite extension.
+
+BEGIN TRANSACTION;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS `TICKETS_FTS` USING fts5(
+    `SUBJECT`, `MESSAGE`,
+    content='TICKETS', content_rowid='ID', tokenize='porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS `TICKETS_FTS_INSERT` AFTER INSERT ON `TICKETS` BEGIN
+    INSERT INTO `TICKETS_FTS` (`ROWID`, `SUBJECT`, `MESSAGE`) VALUES (NEW.`ID`, NEW.`SUBJECT`, NEW.`MESSAGE`);
+END;
+
+CREATE TRIGGER IF NOT EXISTS `TICKETS_FTS_DELETE` AFTER DELETE ON `TICKETS` BEGIN
+    INSERT INTO `TICKETS_FTS` (`TICKETS_FTS`, `ROWID`, `SUBJECT`, `MESSAGE`) VALUES ('delete', OLD.`ID`, OLD.`SUBJECT`, OLD.`MESSAGE`);
+END;
+
+CREATE TRIGGER IF NOT EXISTS `TICKETS_FTS_UPDATE` AFTER UPDATE OF `SUBJECT`, `MESSAGE` ON `TICKETS` BEGIN
+    INSERT INTO `TICKETS_FTS` (`TICKETS_FTS`, `ROWID`, `SUBJECT`, `MESSAGE`) VALUES ('delete', OLD.`ID`, OLD.`SUBJECT`, OLD.`MESSAGE`);
+    INSERT INTO `TICKETS_FTS` (`ROWID`, `SUBJECT`, `MESSAGE`) VALUES (NEW.`ID`, NEW.`SUBJECT`, NEW.`MESSAGE`);
+END;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS `RETURN_REQUESTS_FTS` USING fts5(
+    `REASON`,
+    content='RETURN_REQUESTS', content_rowid='ID', tokenize='porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS `RETURN_REQUESTS_FTS_INSERT` AFTER INSERT ON `RETURN_REQUESTS` BEGIN
+    INSERT INTO `RETURN_REQUESTS_FTS` (`ROWID`, `REASON`) VALUES (NEW.`ID`, NEW.`REASON`);
+END;
+
+CREATE TRIGGER IF NOT EXISTS `RETURN_REQUESTS_FTS_DELETE` AFTER DELETE ON `RETURN_REQUESTS` BEGIN
+    INSERT INTO `RETURN_REQUESTS_FTS` (`RETURN_REQUESTS_FTS`, `ROWID`, `REASON`) VALUES ('delete', OLD.`ID`, OLD.`REASON`);
+END;
+
+CREATE TRIGGER IF NOT EXISTS `RETURN_REQUESTS_FTS_UPDATE` AFTER UPDATE OF `REASON` ON `RETURN_REQUESTS` BEGIN
+    INSERT INTO `RETURN_REQUESTS_FTS` (`RETURN_REQUESTS_FTS`, `ROWID`, `REASON`) VALUES ('delete', OLD.`ID`, OLD.`REASON`);
+    INSERT INTO `RETURN_REQUESTS_FTS` (`ROWID`, `REASON`) VALUES (NEW.`ID`, NEW.`REASON`);
+END;
+
+COMMIT;
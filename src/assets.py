@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import pathlib
+from typing import Callable
+
+STATIC = pathlib.Path(__file__).parent / "server" / "static"
+# built copies named by content; never change once written, so clients may keep them for good
+ASSETS = STATIC / "assets"
+MANIFEST = "manifest.json"
+
+# static folders whose files pages link to with `url_for("static", ...)`
+ASSET_FOLDERS = ("fonts",)
+# worth a precompressed copy; images and woff2 fonts are compressed already
+COMPRESSIBLE = (".css", ".js", ".json", ".svg", ".txt", ".xml", ".otf", ".ttf", ".eot", ".ico")
+# a copy that saves less than this is not worth a second file and a `Vary`
+MIN_SAVING = 0.1
+
+HASH_LENGTH = 10
+
+
+def hashed_name(path: str, content: bytes, /) -> str:
+    """
+    >>> hashed_name("fonts/horizon.otf", b"")
+    'fonts/horizon.786a02f742.otf'
+    """
+    digest = hashlib.blake2b(content).hexdigest()[:HASH_LENGTH]
+    stem, dot, suffix = path.rpartition(".")
+    return f"{stem}.{digest}.{suffix}" if dot and "/" not in suffix else f"{path}.{digest}"
+
+
+def _compressors() -> dict[str, Callable[[bytes], bytes]]:
+    """Encoding suffix -> compress function, gzip always and brotli when the package is installed."""
+    compressors: dict[str, Callable[[bytes], bytes]] = {".gz": lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+    try:
+        import brotli
+    except ImportError:
+        pass
+    else:
+        compressors[".br"] = lambda data: brotli.compress(data, quality=11)
+    return compressors
+
+
+def _write(path: pathlib.Path, content: bytes) -> None:
+    if path.exists():
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(f"{path.name}.{os.getpid()}")
+    partial.write_bytes(content)
+    os.replace(partial, path)
+
+
+def build_assets() -> tuple[dict[str, str], int]:
+    """Copy every asset under its content-hashed name with precompressed siblings, then swap in the manifest.
+
+    Returns the new manifest and how many files were removed. Files of the previous build are
+    kept, so pages rendered before a deploy can still load theirs; older ones are deleted.
+    """
+    compressors = _compressors()
+    manifest: dict[str, str] = {}
+
+    for folder in ASSET_FOLDERS:
+        for source in sorted(path for path in (STATIC / folder).rglob("*") if path.is_file()):
+            name = source.relative_to(STATIC).as_posix()
+            content = source.read_bytes()
+            target = ASSETS / hashed_name(name, content)
+            _write(target, content)
+
+            if source.suffix.lower() in COMPRESSIBLE:
+                for suffix, compress in compressors.items():
+                    compressed = compress(content)
+                    if len(compressed) <= len(content) * (1 - MIN_SAVING):
+                        _write(target.with_name(target.name + suffix), compressed)
+
+            manifest[name] = target.relative_to(STATIC).as_posix()
+
+    ASSETS.mkdir(parents=True, exist_ok=True)
+    previous = read_manifest()
+    keep = {STATIC / path for path in [*manifest.values(), *previous.values()]}
+    removed = 0
+    for path in [path for path in ASSETS.rglob("*") if path.is_file() and path.name not in (MANIFEST, ".gitignore")]:
+        original = path.with_suffix("") if path.suffix in (".gz", ".br") else path
+        if original not in keep:
+            path.unlink()
+            removed += 1
+
+    partial = ASSETS / f"{MANIFEST}.{os.getpid()}"
+    partial.write_text(json.dumps(manifest, indent=1, sort_keys=True))
+    os.replace(partial, ASSETS / MANIFEST)
+
+    return manifest, removed
+
+
+def read_manifest() -> dict[str, str]:
+    try:
+        return json.loads((ASSETS / MANIFEST).read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+_manifest: tuple[int, dict[str, str]] = (0, {})
+
+
+def asset_name(filename: str, /) -> str:
+    """The built copy of static `filename`, or `filename` itself when it has none (no build yet, or not an asset)."""
+    global _manifest
+
+    try:
+        version = (ASSETS / MANIFEST).stat().st_mtime_ns
+    except FileNotFoundError:
+        return filename
+
+    if _manifest[0] != version:
+        _manifest = (version, read_manifest())
+    return _manifest[1].get(filename, filename)
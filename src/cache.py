@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import os
+import pathlib
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+
+# unset, the store lives next to the main database rather than wherever the process was started
+CACHE_DATABASE = os.environ.get("CACHE_DATABASE") or None
+EVENT_RETENTION = 3600
+
+_MISSING = object()
+
+
+class TTLCache(Generic[T]):
+    """Thread-safe in-process LRU cache whose entries also expire after `ttl` seconds.
+
+    >>> cache = TTLCache(maxsize=2, ttl=60)
+    >>> cache.set("a", 1); cache.set("b", 2); cache.set("c", 3)
+    >>> cache.get("a") is None, cache.get("c")
+    (True, 3)
+    """
+
+    def __init__(self, *, maxsize: int = 1024, ttl: float = 300) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+        self.__entries: OrderedDict[Hashable, tuple[float, T]] = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, key: Hashable, default: T | None = None) -> T | None:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return default
+
+            if entry[0] <= time.monotonic():
+                del self.__entries[key]
+                return default
+
+            self.__entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Hashable, value: T, *, ttl: float | None = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+
+        with self.__lock:
+            self.__entries[key] = (expires_at, value)
+            self.__entries.move_to_end(key)
+
+            while len(self.__entries) > self.maxsize:
+                self.__entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self.__lock:
+            self.__entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+
+class SharedStore:
+    """A small SQLite key/value file shared by every worker process on the host.
+
+    Besides values it keeps an append-only log of invalidated keys, so each process can
+    evict its own in-memory copies without asking the store on every read.
+    """
+
+    def __init__(self, path: str | None = CACHE_DATABASE) -> None:
+        self.path = path
+
+        self.__conn: sqlite3.Connection | None = None
+        self.__lock = threading.Lock()
+
+    def place_beside(self, database: str, /) -> None:
+        """Keep the store as `cache.sqlite` in `database`'s directory, unless a path was given or it is open already."""
+        if self.path is None:
+            self.path = str(pathlib.Path(database).with_name("cache.sqlite"))
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self.__conn is None:
+            self.place_beside(os.environ.get("DATABASE", "database.sqlite"))
+            assert self.path is not None
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5, isolation_level=None)
+            conn.executescript(
+                r"""
+                PRAGMA journal_mode = WAL;
+                PRAGMA synchronous = NORMAL;
+
+                CREATE TABLE IF NOT EXISTS STORE (
+                    KEY TEXT PRIMARY KEY,
+                    VALUE BLOB NOT NULL,
+                    EXPIRES_AT REAL NOT NULL
+                ) WITHOUT ROWID;
+
+                CREATE TABLE IF NOT EXISTS EVENTS (
+                    SEQ INTEGER PRIMARY KEY AUTOINCREMENT,
+                    KEY TEXT NOT NULL,
+                    CREATED_AT REAL NOT NULL
+                );
+                """
+            )
+            self.__conn = conn
+        return self.__conn
+
+    def get(self, key: str) -> Any:
+        query = r"SELECT VALUE FROM STORE WHERE KEY = ? AND EXPIRES_AT > ?"
+
+        with self.__lock:
+            row = self.conn.execute(query, (key, time.time())).fetchone()
+
+        return _MISSING if row is None else pickle.loads(row[0])
+
+    def set(self, key: str, value: Any, *, ttl: float) -> None:
+        query = r"INSERT OR REPLACE INTO STORE (KEY, VALUE, EXPIRES_AT) VALUES (?, ?, ?)"
+
+        with self.__lock:
+            self.conn.execute(query, (key, pickle.dumps(value), time.time() + ttl))
+
+    def delete(self, key: str) -> None:
+        """Drop `key` and log it, so other processes evict their copies on their next sync."""
+        now = time.time()
+
+        with self.__lock:
+            self.conn.execute(r"BEGIN IMMEDIATE")
+            self.conn.execute(r"DELETE FROM STORE WHERE KEY = ?", (key,))
+            self.conn.execute(r"INSERT INTO EVENTS (KEY, CREATED_AT) VALUES (?, ?)", (key, now))
+            self.conn.execute(r"DELETE FROM EVENTS WHERE CREATED_AT < ?", (now - EVENT_RETENTION,))
+            self.conn.execute(r"COMMIT")
+
+    def last_event(self) -> int:
+        with self.__lock:
+            row = self.conn.execute(r"SELECT COALESCE(MAX(SEQ), 0) FROM EVENTS").fetchone()
+        return row[0]
+
+    def events_since(self, seq: int) -> list[tuple[int, str]]:
+        with self.__lock:
+            return self.conn.execute(r"SELECT SEQ, KEY FROM EVENTS WHERE SEQ > ? ORDER BY SEQ", (seq,)).fetchall()
+
+
+shared_store = SharedStore()
+
+
+class SharedCache(Generic[T]):
+    """Read-through cache: process memory first, then the shared store, then the loader.
+
+    The shared store keeps the plain data returned by `load`; `build` turns it into the
+    object handed out and kept in process memory. Invalidations reach other processes
+    within `sync_interval` seconds, and every entry expires after `ttl` regardless.
+    With `store=None` the cache stays in process memory.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        *,
+        store: SharedStore | None = shared_store,
+        maxsize: int = 1024,
+        ttl: float = 300,
+        sync_interval: float = 1.0,
+    ) -> None:
+        self.namespace = namespace
+        self.store = store
+        self.ttl = ttl
+        self.sync_interval = sync_interval
+
+        self.local: TTLCache[T] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.__seq: int | None = None
+        self.__synced_at = 0.0
+        self.__lock = threading.Lock()
+
+    def _key(self, key: Hashable) -> str:
+        return f"{self.namespace}:{key}"
+
+    def sync(self) -> None:
+        """Apply invalidations logged by other processes, at most once per `sync_interval`."""
+        now = time.monotonic()
+        if self.store is None or now - self.__synced_at < self.sync_interval or not self.__lock.acquire(blocking=False):
+            return
+
+        try:
+            if self.__seq is None:
+                self.__seq = self.store.last_event()
+            else:
+                prefix = f"{self.namespace}:"
+                for seq, key in self.store.events_since(self.__seq):
+                    self.__seq = seq
+                    if key.startswith(prefix):
+                        self.local.pop(key)
+            self.__synced_at = now
+        finally:
+            self.__lock.release()
+
+    def get(self, key: Hashable, *, load: Callable[[], Any], build: Callable[[Any], T]) -> T | None:
+        self.sync()
+
+        shared_key = self._key(key)
+        value = self.local.get(shared_key)
+        if value is not None:
+            return value
+
+        data = _MISSING if self.store is None else self.store.get(shared_key)
+        if data is _MISSING:
+            data = load()
+            if data is None:
+                return None
+            if self.store is not None:
+                self.store.set(shared_key, data, ttl=self.ttl)
+
+        value = build(data)
+        self.local.set(shared_key, value)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        shared_key = self._key(key)
+        self.local.pop(shared_key)
+        if self.store is not None:
+            self.store.delete(shared_key)
+
+    def clear(self) -> None:
+        self.local.clear()
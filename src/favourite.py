@@ -8,8 +8,12 @@ if TYPE_CHECKING:
 
 import sqlite3
 
+from .pagination import DEFAULT_LIMIT, Cursor, Page, paginate
+
 
 class Favourite:
+    __slots__ = ("__conn", "id", "user_id", "product_unique_id", "__user", "__product")
+
     def __init__(self, conn: sqlite3.Connection, *, id: int, user_id: int, product_unique_id: str) -> None:
         self.__conn = conn
         self.id = id
@@ -78,6 +82,11 @@ class Favourite:
 
         return [cls(conn, **row) for row in cursor.fetchall()]
 
+    @classmethod
+    def page(cls, conn: sqlite3.Connection, *, cursor: Cursor | None = None, limit: int = DEFAULT_LIMIT) -> Page[Favourite]:
+        query = r"SELECT * FROM FAVOURITES"
+        return paginate(conn, query, factory=lambda row: cls(conn, **row), keys=("USER_ID", "ID"), cursor=cursor, limit=limit)
+
     @classmethod
     def from_user(cls, conn: sqlite3.Connection, *, user: User, product: Product) -> list[Favourite]:
         query = r"""
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+def web_workers() -> int:
+    """How many web worker processes serve the app: `WORKERS`, or `WEB_CONCURRENCY` as most hosts set it."""
+    return int(os.environ.get("WORKERS", os.environ.get("WEB_CONCURRENCY", 1)))
+
+
+# the cores are shared by every web worker process
+HASH_WORKERS = int(os.environ.get("HASH_WORKERS", (os.cpu_count() or 1) // web_workers() or 1))
+HASH_QUEUE = int(os.environ.get("HASH_QUEUE", HASH_WORKERS * 8))
+HASH_TIMEOUT = float(os.environ.get("HASH_TIMEOUT", 5))
+HASH_NICE = int(os.environ.get("HASH_NICE", 10))
+
+
+class HashingBusy(RuntimeError):
+    """Raised when every hashing worker is busy and the queue stayed full for `HASH_TIMEOUT` seconds."""
+
+
+def pbkdf2(password: str, salt: int, algorithm: str, iterations: int, /) -> str:
+    return hashlib.pbkdf2_hmac(algorithm, password.encode("utf-8"), salt.to_bytes(16, "big"), iterations).hex()
+
+
+def _lower_priority(nice: int) -> None:
+    # Linux schedules threads individually, so this only deprioritises the hashing worker
+    with contextlib.suppress(AttributeError, OSError):
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), nice)
+
+
+class HashingPool:
+    """Runs PBKDF2 off the request thread with at most `workers` hashes in flight.
+
+    `pbkdf2_hmac` releases the GIL, so worker threads hash on separate cores. Workers run
+    niced, so a login burst queues behind the pool instead of starving other requests.
+    At most `queue` more callers wait for a worker; past that, callers wait up to
+    `timeout` seconds for a slot and then get `HashingBusy`.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int = HASH_WORKERS,
+        queue: int = HASH_QUEUE,
+        timeout: float = HASH_TIMEOUT,
+        nice: int = HASH_NICE,
+    ) -> None:
+        self.workers = max(workers, 1)
+        self.timeout = timeout
+        self.nice = nice
+
+        self.__slots = threading.BoundedSemaphore(self.workers + max(queue, 0))
+        self.__executor: ThreadPoolExecutor | None = None
+        self.__lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self.__executor is None:
+            with self.__lock:
+                if self.__executor is None:
+                    self.__executor = ThreadPoolExecutor(
+                        self.workers,
+                        thread_name_prefix="hashing",
+                        initializer=_lower_priority,
+                        initargs=(self.nice,),
+                    )
+        return self.__executor
+
+    def submit(self, password: str, salt: int, algorithm: str, iterations: int, /) -> Future[str]:
+        if not self.__slots.acquire(timeout=self.timeout):
+            error = "Too many password checks in progress. Try again shortly."
+            raise HashingBusy(error)
+
+        try:
+            future = self.executor.submit(pbkdf2, password, salt, algorithm, iterations)
+        except BaseException:
+            self.__slots.release()
+            raise
+
+        future.add_done_callback(lambda _: self.__slots.release())
+        return future
+
+    def hash(self, password: str, salt: int, algorithm: str, iterations: int, /) -> str:
+        return self.submit(password, salt, algorithm, iterations).result()
+
+    async def hash_async(self, password: str, salt: int, algorithm: str, iterations: int, /) -> str:
+        # admission may block, so it waits in a thread rather than on the event loop
+        future = await asyncio.to_thread(self.submit, password, salt, algorithm, iterations)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        with self.__lock:
+            if self.__executor is not None:
+                self.__executor.shutdown(wait=wait)
+                self.__executor = None
+
+
+hashing_pool = HashingPool()
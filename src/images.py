@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import base64
+import io
+import json
+import multiprocessing
+import os
+import pathlib
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+STATIC = pathlib.Path(__file__).parent / "server" / "static"
+PICTURES = STATIC / "product_pictures"
+DERIVED = STATIC / "derived"
+MANIFEST = "manifest.json"
+
+# widths the pipeline scales every picture down to; a picture is never scaled up
+DERIVATIVE_WIDTHS = (240, 480, 960, 1600)
+# best first, a `<picture>` lists its sources in this order; those this Pillow can't encode are skipped
+DERIVATIVE_FORMATS = ("avif", "webp")
+QUALITY = {"avif": 55, "webp": 78}
+PLACEHOLDER_WIDTH = 16
+
+IMAGE_WORKERS = int(os.environ.get("IMAGE_WORKERS", 1))
+
+
+class ImageSet(NamedTuple):
+    """The derivatives of one uploaded picture, as recorded in its folder's manifest."""
+
+    src: str
+    width: int
+    height: int
+    placeholder: str
+    # format -> [(width, url)], narrowest first
+    sources: dict[str, list[tuple[int, str]]]
+
+    def srcset(self, format: str) -> str:
+        return ", ".join(f"{url} {width}w" for width, url in self.sources.get(format, ()))
+
+
+def _url(path: pathlib.Path) -> str:
+    return f"/{path.relative_to(STATIC.parent).as_posix()}"
+
+
+@lru_cache(maxsize=1)
+def encodable_formats() -> tuple[str, ...]:
+    from PIL import Image
+
+    Image.init()
+    return tuple(format for format in DERIVATIVE_FORMATS if format.upper() in Image.SAVE)
+
+
+def _placeholder(image: Image.Image) -> str:
+    """A blurred thumbnail a few hundred bytes long, inlined as a data URI."""
+    from PIL import Image, ImageFilter
+
+    height = max(1, round(image.height * PLACEHOLDER_WIDTH / image.width))
+    tiny = image.resize((PLACEHOLDER_WIDTH, height), Image.Resampling.BILINEAR).filter(ImageFilter.GaussianBlur(1))
+
+    format = "webp" if "webp" in encodable_formats() else "png"
+    buffer = io.BytesIO()
+    tiny.save(buffer, format, quality=30)
+    return f"data:image/{format};base64,{base64.b64encode(buffer.getvalue()).decode()}"
+
+
+def derive_image(original: pathlib.Path, target: pathlib.Path, /) -> dict:
+    """Write the width and format variants of `original` into `target`, returning its manifest entry."""
+    from PIL import Image, ImageOps
+
+    with Image.open(original) as opened:
+        image = ImageOps.exif_transpose(opened)
+        image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+
+    formats = encodable_formats()
+    widths = sorted({min(width, image.width) for width in DERIVATIVE_WIDTHS})
+    sources: dict[str, list[tuple[int, str]]] = {format: [] for format in formats}
+
+    for width in widths:
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.Resampling.LANCZOS)
+
+        for format in formats:
+            path = target / f"{original.stem}-{width}.{format}"
+            resized.save(path, format, quality=QUALITY[format])
+            sources[format].append((width, _url(path)))
+
+    stat = original.stat()
+    return {
+        "src": _url(original),
+        "width": image.width,
+        "height": image.height,
+        "placeholder": _placeholder(image),
+        "sources": sources,
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+    }
+
+
+def derive_folder(folder: str, /) -> int:
+    """Bring the derivatives of every picture in `folder` up to date; returns how many were (re)built.
+
+    The manifest is replaced atomically, so readers see either the old or the new set.
+    """
+    source = PICTURES / folder
+    target = DERIVED / folder
+    target.mkdir(parents=True, exist_ok=True)
+
+    manifest = read_manifest(folder)
+    entries: dict[str, dict] = {}
+    built = 0
+
+    for original in sorted(path for path in source.iterdir() if path.is_file()):
+        entry = manifest.get(original.name)
+        stat = original.stat()
+        if entry is None or (entry["mtime_ns"], entry["size"]) != (stat.st_mtime_ns, stat.st_size):
+            entry = derive_image(original, target)
+            built += 1
+        entries[original.name] = entry
+
+    if built or entries.keys() != manifest.keys():
+        partial = target / f"{MANIFEST}.{os.getpid()}"
+        partial.write_text(json.dumps(entries))
+        os.replace(partial, target / MANIFEST)
+
+    return built
+
+
+def read_manifest(folder: str, /) -> dict[str, dict]:
+    try:
+        return json.loads((DERIVED / folder / MANIFEST).read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+_manifests: dict[str, tuple[int, dict[str, dict]]] = {}
+
+
+def manifest_version(folder: str, /) -> int:
+    """Changes whenever the folder's derivatives are rebuilt; 0 before the first run."""
+    try:
+        return (DERIVED / folder / MANIFEST).stat().st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
+def image_set(src: str, /) -> ImageSet | None:
+    """The derivatives of the picture served at `src`, or None until they have been built."""
+    parts = src.rsplit("/", 2)
+    if len(parts) != 3:
+        return None
+    _, folder, name = parts
+
+    version = manifest_version(folder)
+    if not version:
+        return None
+
+    cached = _manifests.get(folder)
+    if cached is None or cached[0] != version:
+        cached = _manifests[folder] = (version, read_manifest(folder))
+
+    entry = cached[1].get(name)
+    if entry is None:
+        return None
+
+    sources = {format: [tuple(pair) for pair in pairs] for format, pairs in entry["sources"].items()}
+    return ImageSet(entry["src"], entry["width"], entry["height"], entry["placeholder"], sources)  # type: ignore[arg-type]
+
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def schedule_derivatives(folder: str, /) -> Future[int]:
+    """Build `folder`'s derivatives in the background process pool."""
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            # spawned rather than forked, so the web worker's threads and sockets stay behind
+            _pool = ProcessPoolExecutor(max_workers=IMAGE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+
+    return _pool.submit(derive_folder, folder)
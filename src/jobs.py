@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import contextlib
+import functools
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable
+
+LEASE_TTL = 30
+
+# identifies this worker process in JOB_LEASES
+OWNER = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+_held: set[str] = set()
+_lock = threading.Lock()
+
+
+def acquire_lease(conn: sqlite3.Connection, name: str, /, *, ttl: float = LEASE_TTL) -> bool:
+    """Take or renew the lease on `name`; True when this process holds it for the next `ttl` seconds."""
+    query = r"""
+        INSERT INTO JOB_LEASES (NAME, OWNER, EXPIRES_AT) VALUES (?, ?, ?)
+        ON CONFLICT (NAME) DO UPDATE SET OWNER = EXCLUDED.OWNER, EXPIRES_AT = EXCLUDED.EXPIRES_AT
+            WHERE JOB_LEASES.OWNER = EXCLUDED.OWNER OR JOB_LEASES.EXPIRES_AT < ?
+    """
+    now = time.time()
+
+    with _lock:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(query, (name, OWNER, now + ttl, now))
+            conn.commit()
+        except sqlite3.OperationalError as error:
+            conn.rollback()
+            # another worker is writing; it either holds the lease or will take it
+            if "database is locked" in str(error):
+                return False
+            raise
+
+        if cursor.rowcount > 0:
+            _held.add(name)
+            return True
+
+        _held.discard(name)
+        return False
+
+
+def release_leases(conn: sqlite3.Connection, /) -> None:
+    """Give up every lease this process holds so another worker can take over right away."""
+    with _lock:
+        if not _held:
+            return
+
+        names = tuple(_held)
+        query = rf"DELETE FROM JOB_LEASES WHERE OWNER = ? AND NAME IN ({', '.join('?' for _ in names)})"
+        with contextlib.suppress(sqlite3.Error):
+            conn.execute(query, (OWNER, *names))
+            conn.commit()
+        _held.clear()
+
+
+def singleton(conn: sqlite3.Connection, name: str, /, *, ttl: float = LEASE_TTL) -> Callable:
+    """Make a scheduled job run in only one worker process at a time.
+
+    Every worker schedules the job; each run first takes or renews the lease, and the
+    workers that don't hold it skip the run. `ttl` must be longer than the job interval,
+    otherwise the lease lapses between runs and the job may move to another worker.
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if acquire_lease(conn, name, ttl=ttl):
+                return func(*args, **kwargs)
+            return None
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from .pagination import DEFAULT_LIMIT, Cursor, Page, paginate
+from .timestamps import Timestamp
+
+LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+
+# records waiting for the writer; past this, new ones are dropped and counted rather than waited on
+LOG_QUEUE_SIZE = int(os.environ.get("LOG_QUEUE_SIZE", 10_000))
+LOG_BATCH_SIZE = int(os.environ.get("LOG_BATCH_SIZE", 500))
+LOG_FLUSH_INTERVAL = float(os.environ.get("LOG_FLUSH_INTERVAL", 1.0))
+LOG_RETENTION_DAYS = int(os.environ.get("LOG_RETENTION_DAYS", 14))
+PRUNE_BATCH = 5000
+
+# a separate log database only holds LOGS; the table and its indexes match schema.sql
+LOGS_SCHEMA = r"""
+    PRAGMA JOURNAL_MODE = WAL;
+    PRAGMA SYNCHRONOUS = 1;
+
+    CREATE TABLE IF NOT EXISTS `LOGS` (
+        `ID`        INTEGER         PRIMARY KEY     AUTOINCREMENT,
+        `MESSAGE`   TEXT            NOT NULL,
+        `CREATED_AT` TIMESTAMP      DEFAULT         CURRENT_TIMESTAMP,
+        `LEVEL`     CHAR(5)         DEFAULT         'INFO',
+        `NAME`      TEXT            DEFAULT         NULL,
+        `REQUEST_ID` TEXT           DEFAULT         NULL,
+        `LATENCY`   REAL            DEFAULT         NULL
+    );
+
+    CREATE INDEX IF NOT EXISTS `LOGS_CREATED_AT`        ON `LOGS` (`CREATED_AT`);
+    CREATE INDEX IF NOT EXISTS `LOGS_LEVEL_CREATED_AT`  ON `LOGS` (`LEVEL`, `CREATED_AT`);
+"""
+
+INSERT_QUERY = r"INSERT INTO LOGS (CREATED_AT, LEVEL, NAME, MESSAGE, REQUEST_ID, LATENCY) VALUES (?, ?, ?, ?, ?, ?)"
+
+LogRow = tuple[str, str, str, str, "str | None", "float | None"]
+
+
+def log_time(created: float, /) -> str:
+    """`created` in UTC as SQLite's `CURRENT_TIMESTAMP` writes it, plus milliseconds.
+
+    >>> log_time(1726395630.25)
+    '2024-09-15 10:20:30.250'
+    """
+    return f"{time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(created))}.{int(created % 1 * 1000):03d}"
+
+
+class Log:
+    """One row of `LOGS`, as the admin log viewer lists it."""
+
+    __slots__ = ("id", "message", "_created_at", "level", "name", "request_id", "latency")
+
+    created_at = Timestamp()
+
+    def __init__(
+        self,
+        *,
+        id: int,
+        message: str,
+        created_at: str,
+        level: str,
+        name: str | None,
+        request_id: str | None = None,
+        latency: float | None = None,
+    ) -> None:
+        self.id = id
+        self.message = message
+        self.created_at = created_at
+        self.level = level
+        self.name = name
+        self.request_id = request_id
+        self.latency = latency
+
+    @staticmethod
+    def filters(*, level: str | None = None, since: str | None = None, until: str | None = None) -> tuple[str, tuple]:
+        clauses: list[str] = []
+        params: tuple = ()
+
+        if level:
+            clauses.append("LEVEL = ?")
+            params += (level,)
+        if since:
+            clauses.append("CREATED_AT >= DATETIME(?)")
+            params += (since,)
+        if until:
+            clauses.append("CREATED_AT < DATETIME(?)")
+            params += (until,)
+
+        query = r"SELECT * FROM LOGS"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+
+        return query, params
+
+    @classmethod
+    def page(
+        cls,
+        connection: sqlite3.Connection,
+        *,
+        level: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        cursor: Cursor | None = None,
+        limit: int = DEFAULT_LIMIT,
+    ) -> Page[Log]:
+        """Newest first, served by `LOGS_LEVEL_CREATED_AT` or `LOGS_CREATED_AT`; the table is never counted."""
+        query, params = cls.filters(level=level, since=since, until=until)
+        return paginate(
+            connection,
+            query,
+            params,
+            factory=lambda row: cls(**row),
+            keys=("CREATED_AT", "ID"),
+            cursor=cursor,
+            limit=limit,
+            descending=True,
+            count=False,
+        )
+
+    def __repr__(self) -> str:
+        return f"<Log id={self.id} level={self.level} name={self.name!r}>"
+
+
+class LogSink:
+    """Writes log rows to `LOGS` from a background thread, in batches of one transaction each.
+
+    `put` never waits: when the queue is full the row is dropped and counted. The writer wakes
+    every `flush_interval`, or as soon as `batch_size` rows are waiting, and writes everything
+    queued, so rows reach the database within a second and a busy process commits a few large
+    batches rather than one per record. With `standalone`, `path` is a database of its own and
+    gets the `LOGS` table on first connect.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        standalone: bool = False,
+        maxsize: int = LOG_QUEUE_SIZE,
+        batch_size: int = LOG_BATCH_SIZE,
+        flush_interval: float = LOG_FLUSH_INTERVAL,
+    ) -> None:
+        self.path = path
+        self.standalone = standalone
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+        self.__queue: queue.Queue[LogRow] = queue.Queue(maxsize)
+        self.__stopping = threading.Event()
+        self.__wake = threading.Event()
+        self.__thread: threading.Thread | None = None
+        self.__lock = threading.Lock()
+
+    def connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+        if self.standalone:
+            conn.executescript(LOGS_SCHEMA)
+        return conn
+
+    @property
+    def running(self) -> bool:
+        return self.__thread is not None and self.__thread.is_alive()
+
+    def start(self) -> None:
+        with self.__lock:
+            if self.running:
+                return
+
+            self.__stopping.clear()
+            self.__thread = threading.Thread(target=self._run, name="log-sink", daemon=True)
+            self.__thread.start()
+
+    def stop(self, *, timeout: float = 5.0) -> None:
+        """Write what is still queued and stop the writer."""
+        with self.__lock:
+            if self.__thread is None:
+                return
+
+            self.__stopping.set()
+            self.__wake.set()
+            self.__thread.join(timeout)
+            self.__thread = None
+
+    def put(self, row: LogRow) -> bool:
+        try:
+            self.__queue.put_nowait(row)
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+        if self.__queue.qsize() >= self.batch_size:
+            self.__wake.set()
+        return True
+
+    def stats(self) -> dict[str, int]:
+        return {"queued": self.__queue.qsize(), "written": self.written, "dropped": self.dropped, "failed": self.failed}
+
+    def _batch(self) -> list[LogRow]:
+        batch: list[LogRow] = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.__queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, conn: sqlite3.Connection, batch: list[LogRow]) -> None:
+        try:
+            conn.execute(r"BEGIN IMMEDIATE")
+            conn.executemany(INSERT_QUERY, batch)
+            conn.execute(r"COMMIT")
+        except sqlite3.Error:
+            # logging about a failed log write would only queue more rows for the same database
+            if conn.in_transaction:
+                conn.execute(r"ROLLBACK")
+            self.failed += len(batch)
+        else:
+            self.written += len(batch)
+
+    def _run(self) -> None:
+        conn = self.connect()
+        try:
+            while True:
+                self.__wake.wait(self.flush_interval)
+                self.__wake.clear()
+                # checked before draining, so rows queued while `stop` was called are still written
+                stopping = self.__stopping.is_set()
+                while batch := self._batch():
+                    self._write(conn, batch)
+                if stopping:
+                    return
+        finally:
+            conn.close()
+
+    def prune(self, *, days: int = LOG_RETENTION_DAYS) -> int:
+        """Delete rows older than `days`, a few thousand per transaction so writers are never held up for long."""
+        query = r"""
+            DELETE FROM LOGS WHERE ID IN (SELECT ID FROM LOGS WHERE CREATED_AT < DATETIME('now', ?) LIMIT ?)
+        """
+        deleted = 0
+
+        conn = self.connect()
+        try:
+            while True:
+                cursor = conn.execute(query, (f"-{days} days", PRUNE_BATCH))
+                deleted += cursor.rowcount
+                if cursor.rowcount < PRUNE_BATCH:
+                    return deleted
+        finally:
+            conn.close()
+
+
+class SinkHandler(logging.Handler):
+    """Logging handler that hands each record to a `LogSink` as a structured row.
+
+    `request_id` and `latency` (in milliseconds) come from the record, set through `extra=` or by a filter.
+    """
+
+    def __init__(self, sink: LogSink, level: int | str = logging.NOTSET) -> None:
+        super().__init__(level)
+        self.sink = sink
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            message = record.getMessage()
+            if record.exc_info:
+                message = f"{message}\n{(self.formatter or logging.Formatter()).formatException(record.exc_info)}"
+
+            self.sink.put(
+                (
+                    log_time(record.created),
+                    record.levelname,
+                    record.name,
+                    message,
+                    getattr(record, "request_id", None),
+                    getattr(record, "latency", None),
+                )
+            )
+        except Exception:
+            self.handleError(record)
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import sqlite3
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Iterator, Literal
 
 import arrow
 
-from .utils import SQLITE_OLD
+from .pagination import DEFAULT_LIMIT, Cursor, Page, iterate, paginate
+from .timestamps import Timestamp
+from .utils import SQLITE_OLD, size_names
 
 if TYPE_CHECKING:
     from .product import Product
@@ -18,8 +20,166 @@ VALID_STATUS = Literal["PEND", "CONF", "PAID", "COD"]
 # PAID - Paid
 # COD - Cash on Delivery
 
+ORDER_LINES_QUERY = r"""
+    SELECT
+        ORDERS.ID, ORDERS.USER_ID, USERS.NAME AS USER_NAME, USERS.EMAIL AS USER_EMAIL,
+        ORDERS.PRODUCT_ID, PRODUCTS.NAME AS PRODUCT_NAME, PRODUCTS.SIZE AS PRODUCT_SIZE,
+        ORDERS.QUANTITY, ORDERS.TOTAL_PRICE, ORDERS.STATUS, ORDERS.CREATED_AT, ORDERS.RAZORPAY_ORDER_ID
+    FROM ORDERS
+    JOIN USERS ON USERS.ID = ORDERS.USER_ID
+    JOIN PRODUCTS ON PRODUCTS.ID = ORDERS.PRODUCT_ID
+"""
+
+
+class OrderLine:
+    """A denormalized, read-only order row for the admin order table and its CSV export."""
+
+    __slots__ = (
+        "id",
+        "user_id",
+        "user_name",
+        "user_email",
+        "product_id",
+        "product_name",
+        "product_size",
+        "quantity",
+        "total_price",
+        "status",
+        "created_at",
+        "razorpay_order_id",
+    )
+
+    CSV_HEADER = (
+        "ORDER_ID",
+        "USER_ID",
+        "USER_NAME",
+        "USER_EMAIL",
+        "PRODUCT_ID",
+        "PRODUCT_NAME",
+        "PRODUCT_SIZE",
+        "QUANTITY",
+        "TOTAL_PRICE",
+        "STATUS",
+        "CREATED_AT",
+        "RAZORPAY_ORDER_ID",
+    )
+
+    def __init__(
+        self,
+        *,
+        id: int,
+        user_id: int,
+        user_name: str,
+        user_email: str,
+        product_id: int,
+        product_name: str,
+        product_size: str | None,
+        quantity: int,
+        total_price: float,
+        status: str,
+        created_at: str,
+        razorpay_order_id: str | None = None,
+    ) -> None:
+        self.id = id
+        self.user_id = user_id
+        self.user_name = user_name
+        self.user_email = user_email
+        self.product_id = product_id
+        self.product_name = product_name
+        self.product_size = product_size
+        self.quantity = quantity
+        self.total_price = total_price
+        self.status = status
+        self.created_at = created_at
+        self.razorpay_order_id = razorpay_order_id
+
+    @property
+    def product_size_name(self) -> str:
+        return size_names.get(self.product_size or "", "")
+
+    def csv_row(self) -> tuple:
+        return (
+            self.id,
+            self.user_id,
+            self.user_name,
+            self.user_email,
+            self.product_id,
+            self.product_name,
+            self.product_size_name,
+            self.quantity,
+            self.total_price,
+            self.status,
+            self.created_at,
+            self.razorpay_order_id or "",
+        )
+
+    @staticmethod
+    def filters(
+        *,
+        status: str | None = None,
+        user_id: int | None = None,
+        since: str | None = None,
+        until: str | None = None,
+    ) -> tuple[str, tuple]:
+        clauses: list[str] = []
+        params: tuple = ()
+
+        if status:
+            clauses.append("ORDERS.STATUS = ?")
+            params += (status,)
+        if user_id:
+            clauses.append("ORDERS.USER_ID = ?")
+            params += (user_id,)
+        if since:
+            clauses.append("ORDERS.CREATED_AT >= DATE(?)")
+            params += (since,)
+        if until:
+            clauses.append("ORDERS.CREATED_AT < DATE(?, '+1 day')")
+            params += (until,)
+
+        query = ORDER_LINES_QUERY
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+
+        return query, params
+
+    @classmethod
+    def page(
+        cls,
+        connection: sqlite3.Connection,
+        *,
+        status: str | None = None,
+        user_id: int | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        cursor: Cursor | None = None,
+        limit: int = DEFAULT_LIMIT,
+    ) -> Page[OrderLine]:
+        query, params = cls.filters(status=status, user_id=user_id, since=since, until=until)
+        return paginate(connection, query, params, factory=lambda row: cls(**row), cursor=cursor, limit=limit, descending=True)
+
+    @classmethod
+    def iterate(
+        cls,
+        connection: sqlite3.Connection,
+        *,
+        status: str | None = None,
+        user_id: int | None = None,
+        since: str | None = None,
+        until: str | None = None,
+    ) -> Iterator[OrderLine]:
+        query, params = cls.filters(status=status, user_id=user_id, since=since, until=until)
+        return iterate(connection, query, params, factory=lambda row: cls(**row), descending=True)
+
+    def __repr__(self) -> str:
+        return f"<OrderLine id={self.id} user={self.user_name!r} product={self.product_name!r} status={self.status}>"
+
 
 class Order:
+    __slots__ = ("connection", "id", "user_id", "product_id", "quantity", "total_price", "_created_at", "status", "razorpay_order_id")
+
+    created_at = Timestamp()
+
     def __init__(
         self,
         connection: sqlite3.Connection,
@@ -39,7 +199,7 @@ class Order:
         self.product_id = product_id
         self.quantity = quantity
         self.total_price = total_price
-        self.created_at = arrow.get(created_at)
+        self.created_at = created_at
         self.status = status
         self.razorpay_order_id = razorpay_order_id
 
@@ -121,8 +281,12 @@ class Order:
             query = r"SELECT * FROM ORDERS LIMIT ? OFFSET ?"
             cursor.execute(query, (limit, offset))
 
-        rows = cursor.fetchall()
-        return [cls(connection, **row) for row in rows]
+        return [cls(connection, **row) for row in cursor]
+
+    @classmethod
+    def page(cls, connection: sqlite3.Connection, *, cursor: Cursor | None = None, limit: int = DEFAULT_LIMIT) -> Page[Order]:
+        query = r"SELECT * FROM ORDERS"
+        return paginate(connection, query, factory=lambda row: cls(connection, **row), cursor=cursor, limit=limit, descending=True)
 
     @classmethod
     def total_count(cls, connection: sqlite3.Connection) -> int:
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import sqlite3
+from typing import Any, Callable, Generic, Iterator, TypeVar
+
+from .cache import TTLCache
+
+T = TypeVar("T")
+
+DEFAULT_LIMIT = 15
+MAX_LIMIT = 100
+COUNT_TTL = 30
+COUNT_CACHE_SIZE = 1024
+
+
+class Cursor:
+    """Opaque keyset position: the sort key of a boundary row plus its position in the listing.
+
+    >>> Cursor.decode(Cursor((42,), position=15).encode()).key
+    (42,)
+    >>> Cursor.decode("garbage") is None
+    True
+    """
+
+    def __init__(self, key: tuple, /, *, position: int = 0, backwards: bool = False) -> None:
+        self.key = tuple(key)
+        self.position = max(int(position), 0)
+        self.backwards = backwards
+
+    def encode(self) -> str:
+        payload = json.dumps([list(self.key), self.position, int(self.backwards)], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str | None) -> Cursor | None:
+        if not token:
+            return None
+
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            key, position, backwards = json.loads(raw)
+            return cls(tuple(key), position=position, backwards=bool(backwards))
+        except (binascii.Error, ValueError, TypeError):
+            return None
+
+    def __repr__(self) -> str:
+        return f"<Cursor key={self.key} position={self.position} backwards={self.backwards}>"
+
+
+class Page(Generic[T]):
+    def __init__(
+        self,
+        items: list[T],
+        /,
+        *,
+        limit: int,
+        start: int,
+        next_cursor: str | None,
+        prev_cursor: str | None,
+        total: int | None = None,
+    ) -> None:
+        self.items = items
+        self.limit = limit
+        self.start = start
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self.total = total
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self) -> bool:
+        return self.prev_cursor is not None
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __getitem__(self, index: int) -> T:
+        return self.items[index]
+
+    def __repr__(self) -> str:
+        return f"<Page start={self.start} size={len(self.items)} total={self.total}>"
+
+
+class CountCache:
+    """Caches `COUNT(*)` results for a few seconds so listing pages don't rescan whole tables per view."""
+
+    def __init__(self, *, maxsize: int = COUNT_CACHE_SIZE, ttl: float = COUNT_TTL) -> None:
+        # every filter and search combination is its own key, so the oldest are dropped past `maxsize`
+        self.__counts: TTLCache[int] = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, connection: sqlite3.Connection, query: str, params: tuple = ()) -> int:
+        key = (query, tuple(params))
+
+        count = self.__counts.get(key)
+        if count is not None:
+            return count
+
+        cursor = connection.cursor()
+        cursor.execute(query, params)
+        count = int(cursor.fetchone()[0] or 0)
+
+        self.__counts.set(key, count)
+        return count
+
+    def clear(self) -> None:
+        self.__counts.clear()
+
+
+total_counts = CountCache()
+
+
+def _keyset_clause(keys: tuple[str, ...], *, greater: bool) -> str:
+    columns = ", ".join(keys)
+    placeholders = ", ".join("?" for _ in keys)
+    operator = ">" if greater else "<"
+
+    if len(keys) == 1:
+        return f"{columns} {operator} {placeholders}"
+    return f"({columns}) {operator} ({placeholders})"
+
+
+def _order_clause(keys: tuple[str, ...], *, descending: bool) -> str:
+    direction = "DESC" if descending else "ASC"
+    return ", ".join(f"{key} {direction}" for key in keys)
+
+
+def paginate(
+    connection: sqlite3.Connection,
+    query: str,
+    params: tuple = (),
+    *,
+    factory: Callable[[Any], T],
+    keys: tuple[str, ...] = ("ID",),
+    cursor: Cursor | None = None,
+    limit: int = DEFAULT_LIMIT,
+    descending: bool = False,
+    count: bool = True,
+    max_limit: int = MAX_LIMIT,
+) -> Page[T]:
+    """Fetch one page of `query` using keyset (seek) pagination on `keys`.
+
+    `query` is a plain `SELECT ... FROM ... [WHERE ...]` without ORDER BY or LIMIT; SQLite flattens
+    the wrapping subquery so the seek condition and ordering are served by the table's indexes.
+    `keys` must be unique together and appear in the result columns, the last one is usually `ID`.
+    """
+    limit = min(max(int(limit), 1), max_limit)
+
+    backwards = bool(cursor and cursor.backwards)
+    greater = descending == backwards
+
+    sql = f"SELECT * FROM ({query})"
+    args = tuple(params)
+    if cursor is not None and len(cursor.key) == len(keys):
+        sql += f" WHERE {_keyset_clause(keys, greater=greater)}"
+        args += cursor.key
+    else:
+        cursor = None
+        backwards = False
+
+    sql += f" ORDER BY {_order_clause(keys, descending=descending != backwards)} LIMIT ?"
+
+    db_cursor = connection.cursor()
+    db_cursor.execute(sql, args + (limit + 1,))
+    rows = db_cursor.fetchall()
+
+    more = len(rows) > limit
+    rows = rows[:limit]
+    if backwards:
+        rows.reverse()
+
+    if cursor is None:
+        start = 0
+    elif backwards:
+        start = max(cursor.position - len(rows), 0)
+    else:
+        start = cursor.position
+
+    first_key = tuple(rows[0][key] for key in keys) if rows else None
+    last_key = tuple(rows[-1][key] for key in keys) if rows else None
+
+    has_next = (more and not backwards) or (backwards and cursor is not None)
+    has_prev = (more and backwards) or (not backwards and cursor is not None and start > 0)
+
+    next_cursor = Cursor(last_key, position=start + len(rows)).encode() if has_next and last_key else None
+    prev_cursor = Cursor(first_key, position=start, backwards=True).encode() if has_prev and first_key else None
+
+    total = total_counts.get(connection, f"SELECT COUNT(*) FROM ({query})", tuple(params)) if count else None
+
+    return Page(
+        [factory(row) for row in rows],
+        limit=limit,
+        start=start,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+        total=total,
+    )
+
+
+def iterate(
+    connection: sqlite3.Connection,
+    query: str,
+    params: tuple = (),
+    *,
+    factory: Callable[[Any], T],
+    keys: tuple[str, ...] = ("ID",),
+    batch: int = 500,
+    descending: bool = False,
+) -> Iterator[T]:
+    """Walk every row of `query` in keyset order, fetching `batch` rows per statement."""
+    cursor: Cursor | None = None
+
+    while True:
+        page = paginate(
+            connection,
+            query,
+            params,
+            factory=lambda row: row,
+            keys=keys,
+            cursor=cursor,
+            limit=batch,
+            descending=descending,
+            count=False,
+            max_limit=batch,
+        )
+        for row in page:
+            yield factory(row)
+
+        if not page.has_next:
+            return
+
+        cursor = Cursor.decode(page.next_cursor)
@@ -1,22 +1,34 @@
 from __future__ import annotations
 
 import sqlite3
+import threading
 from typing import TYPE_CHECKING, Literal
 
-import arrow
-from fuzzywuzzy.fuzz import partial_ratio
-
-from .utils import SQLITE_OLD, generate_gift_card_code, get_product_pictures, size_names
+from .pagination import DEFAULT_LIMIT, Cursor, Page, paginate
+from .timestamps import Timestamp
+from .utils import SQLITE_OLD, generate_gift_card_code, get_product_pictures, size_names, slugify, table_version
 
 VALID_STARS = Literal[1, 2, 3, 4, 5]
 PRODUCT_ID = int
 QUANTITY = int
 
+# ?sort= value -> (keyset columns, descending)
+CATEGORY_SORTS: dict[str, tuple[tuple[str, ...], bool]] = {
+    "featured": (("ID",), False),
+    "newest": (("ID",), True),
+    "price-low": (("PRICE", "ID"), False),
+    "price-high": (("PRICE", "ID"), True),
+}
+
 if TYPE_CHECKING:
     from .user import User
 
 
 class Review:
+    __slots__ = ("__conn", "id", "user_id", "product_id", "stars", "review", "_created_at")
+
+    created_at = Timestamp()
+
     def __init__(
         self,
         connection: sqlite3.Connection,
@@ -34,7 +46,7 @@ class Review:
         self.product_id = product_id
         self.stars = stars
         self.review = review
-        self.created_at = arrow.get(created_at) if created_at else None
+        self.created_at = created_at
 
     @property
     def user(self) -> User:
@@ -97,6 +109,8 @@ class Review:
 
 
 class Category:
+    __slots__ = ("__conn", "id", "name", "description")
+
     def __init__(self, connection: sqlite3.Connection, *, id: int, name: str, description: str):
         self.__conn = connection
         self.id = id
@@ -109,6 +123,10 @@ class Category:
     def __eq__(self, other: Category) -> bool:
         return self.id == other.id
 
+    @property
+    def slug(self) -> str:
+        return slugify(self.name)
+
     def delete(self) -> None:
         query = r"DELETE FROM CATEGORIES WHERE ID = ?"
         cursor = self.__conn.cursor()
@@ -156,12 +174,17 @@ class Category:
 
     @classmethod
     def all(cls, connection: sqlite3.Connection) -> list[Category]:
-        query = r"SELECT * FROM CATEGORIES"
+        query = r"SELECT * FROM CATEGORIES ORDER BY ID"
         cursor = connection.cursor()
         cursor.execute(query)
         rows = cursor.fetchall()
         return [cls(connection, **row) for row in rows]
 
+    @classmethod
+    def page(cls, connection: sqlite3.Connection, *, cursor: Cursor | None = None, limit: int = DEFAULT_LIMIT) -> Page[Category]:
+        query = r"SELECT * FROM CATEGORIES"
+        return paginate(connection, query, factory=lambda row: cls(connection, **row), cursor=cursor, limit=limit)
+
     @staticmethod
     def total_count(connection: sqlite3.Connection) -> int:
         query = r"SELECT COUNT(*) FROM CATEGORIES"
@@ -182,6 +205,29 @@ class Category:
 
 
 class Product:
+    # listings hydrate thousands of these; relations and derived lists are loaded on first use
+    __slots__ = (
+        "__conn",
+        "id",
+        "unique_id",
+        "name",
+        "price",
+        "display_price",
+        "description",
+        "stock",
+        "size",
+        "_category_id",
+        "_category",
+        "_keywords",
+        "_images",
+        "_available_sizes",
+        "_created_at",
+        "_updated_at",
+    )
+
+    created_at = Timestamp()
+    updated_at = Timestamp()
+
     def __init__(
         self,
         connection: sqlite3.Connection,
@@ -197,6 +243,7 @@ class Product:
         category: int,
         keywords: str = "",
         created_at: str = "",
+        updated_at: str | None = None,
     ):
         self.__conn = connection
         self.id = id
@@ -205,15 +252,47 @@ class Product:
         self.price = price
         self.display_price = display_price
         self.description = description
-        self.images = get_product_pictures(unique_id)
         self.stock = stock
         self.size = size
-        self.size_name = size_names[size]
-        self.category = Category.from_id(connection, category)
-        self.keywords = [keyword.strip() for keyword in keywords.split(";")]
+        self._category_id = category
+        self._category: Category | None = None
+        self._keywords: str | list[str] = keywords
+        self._images: list[str] | None = None
+
+        self._available_sizes: list[str] = []
+        self.created_at = created_at
+        self.updated_at = updated_at or created_at
+
+    @property
+    def size_name(self) -> str:
+        return size_names[self.size]
+
+    @property
+    def category(self) -> Category:
+        if self._category is None:
+            self._category = Category.from_id(self.__conn, self._category_id)
+        return self._category
 
-        self._available_sizes = []
-        self.created_at = arrow.get(created_at)
+    @category.setter
+    def category(self, category: Category) -> None:
+        self._category = category
+        self._category_id = category.id
+
+    @property
+    def keywords(self) -> list[str]:
+        if isinstance(self._keywords, str):
+            self._keywords = [keyword.strip() for keyword in self._keywords.split(";")]
+        return self._keywords
+
+    @keywords.setter
+    def keywords(self, keywords: list[str]) -> None:
+        self._keywords = keywords
+
+    @property
+    def images(self) -> list[str]:
+        if self._images is None:
+            self._images = get_product_pictures(self.unique_id)
+        return self._images
 
     def update(self) -> None:
         query = r"""
@@ -231,7 +310,7 @@ class Product:
                 self.description,
                 self.stock,
                 self.size,
-                self.category.id,
+                self._category_id,
                 ";".join(self.keywords),
                 self.id,
             ),
@@ -465,8 +544,13 @@ class Product:
 
         cursor = connection.cursor()
         cursor.execute(query, params)
-        rows = cursor.fetchall()
-        return [cls(connection, **row) for row in rows]
+        # build from the cursor rather than `fetchall()`, so each row is freed once its object exists
+        return [cls(connection, **row) for row in cursor]
+
+    @classmethod
+    def page(cls, connection: sqlite3.Connection, *, cursor: Cursor | None = None, limit: int = DEFAULT_LIMIT) -> Page[Product]:
+        query = r"SELECT * FROM PRODUCTS"
+        return paginate(connection, query, factory=lambda row: cls(connection, **row), cursor=cursor, limit=limit)
 
     @staticmethod
     def total_count(connection: sqlite3.Connection) -> int:
@@ -476,8 +560,35 @@ class Product:
         count = cursor.fetchone()
         return int(count[0])
 
+    @staticmethod
+    def catalog_version(connection: sqlite3.Connection) -> str:
+        """Changes whenever products are added, removed or edited, the categories change or pictures are processed."""
+        return f"{table_version(connection, 'CATALOG')}.{table_version(connection, 'CATEGORIES')}.{table_version(connection, 'IMAGES')}"
+
+    @staticmethod
+    def page_version(connection: sqlite3.Connection, product_id: PRODUCT_ID) -> str | None:
+        """Changes whenever the product page would: the catalog, this product's sizes and stock, its reviews.
+
+        None if there is no such product.
+        """
+        query = r"""
+            SELECT
+                GROUP_CONCAT(P.ID || ':' || (P.STOCK > 0) || ':' || IFNULL(P.UPDATED_AT, ''), ','),
+                (SELECT COUNT(*) || ':' || IFNULL(SUM(STARS), 0) || ':' || IFNULL(MAX(ID), 0) FROM REVIEWS WHERE PRODUCT_ID = ?)
+            FROM PRODUCTS AS P
+            WHERE P.UNIQUE_ID = (SELECT UNIQUE_ID FROM PRODUCTS WHERE ID = ?)
+        """
+        cursor = connection.cursor()
+        cursor.execute(query, (product_id, product_id))
+        row = cursor.fetchone()
+        if row[0] is None:
+            return None
+        return f"{Product.catalog_version(connection)}|{row[0]}|{row[1]}"
+
     @classmethod
     def search(cls, connection: sqlite3.Connection, query: str) -> list[Product]:
+        from fuzzywuzzy.fuzz import partial_ratio
+
         all_products = cls.all(connection)
 
         return sorted(
@@ -518,17 +629,31 @@ class Product:
         return categories
 
     @classmethod
-    def get_by_category(cls, conn: sqlite3.Connection, category: Category) -> list[Product]:
-        query = r"SELECT * FROM PRODUCTS WHERE CATEGORY = ? AND ROWID IN (SELECT MIN(ROWID) FROM PRODUCTS GROUP BY UNIQUE_ID)"
-        cursor = conn.cursor()
-        cursor.execute(query, (category.id,))
-
-        products = []
-
-        while row := cursor.fetchone():
-            products.append(cls(conn, **row))
-
-        return products
+    def get_by_category(
+        cls,
+        conn: sqlite3.Connection,
+        category: Category,
+        *,
+        sort: str = "featured",
+        cursor: Cursor | None = None,
+        limit: int = DEFAULT_LIMIT,
+    ) -> Page[Product]:
+        # one row per UNIQUE_ID (its first size), found through the UNIQUE_ID index instead of grouping the whole table
+        query = r"""
+            SELECT P.* FROM PRODUCTS AS P
+            WHERE P.CATEGORY = ? AND NOT EXISTS (SELECT 1 FROM PRODUCTS AS Q WHERE Q.UNIQUE_ID = P.UNIQUE_ID AND Q.ID < P.ID)
+        """
+        keys, descending = CATEGORY_SORTS.get(sort, CATEGORY_SORTS["featured"])
+        return paginate(
+            conn,
+            query,
+            (category.id,),
+            factory=lambda row: cls(conn, **row),
+            keys=keys,
+            cursor=cursor,
+            limit=limit,
+            descending=descending,
+        )
 
 
 class Cart:
@@ -642,6 +767,10 @@ class Cart:
 
 
 class GiftCard:
+    __slots__ = ("conn", "id", "price", "user_id", "__code", "used", "_created_at", "used_at")
+
+    created_at = Timestamp()
+
     def __init__(
         self,
         connection: sqlite3.Connection,
@@ -660,7 +789,7 @@ class GiftCard:
         self.user_id = user_id
         self.__code = code
         self.used = bool(int(used))
-        self.created_at = arrow.get(created_at) if created_at else None
+        self.created_at = created_at
         self.used_at = used_at
 
     @property
@@ -739,5 +868,42 @@ class GiftCard:
         query = r"SELECT * FROM GIFT_CARDS"
         cursor = conn.cursor()
         cursor.execute(query)
-        rows = cursor.fetchall()
-        return [cls(conn, **row) for row in rows]
+        return [cls(conn, **row) for row in cursor]
+
+    @classmethod
+    def page(cls, conn: sqlite3.Connection, *, cursor: Cursor | None = None, limit: int = DEFAULT_LIMIT) -> Page[GiftCard]:
+        query = r"SELECT * FROM GIFT_CARDS"
+        return paginate(conn, query, factory=lambda row: cls(conn, **row), cursor=cursor, limit=limit, descending=True)
+
+
+class CategoryIndex:
+    """This worker's slug -> category map, reloaded whenever the `CATEGORIES` version changes."""
+
+    def __init__(self) -> None:
+        self.__version: int | None = None
+        self.__categories: dict[str, Category] = {}
+        self.__lock = threading.Lock()
+
+    def refresh(self, connection: sqlite3.Connection) -> dict[str, Category]:
+        version = table_version(connection, "CATEGORIES")
+        if version != self.__version:
+            with self.__lock:
+                if version != self.__version:
+                    categories: dict[str, Category] = {}
+                    for category in Category.all(connection):
+                        # on a slug clash the older category keeps the URL
+                        categories.setdefault(category.slug, category)
+
+                    self.__categories = categories
+                    self.__version = version
+
+        return self.__categories
+
+    def get(self, connection: sqlite3.Connection, slug: str) -> Category | None:
+        return self.refresh(connection).get(slug)
+
+    def all(self, connection: sqlite3.Connection) -> list[Category]:
+        return list(self.refresh(connection).values())
+
+
+category_index = CategoryIndex()
@@ -3,7 +3,9 @@ from __future__ import annotations
 import sqlite3
 from typing import TYPE_CHECKING
 
-import arrow
+from .pagination import DEFAULT_LIMIT, Cursor, Page
+from .search import SearchHit, match_expression, search_page
+from .timestamps import Timestamp
 
 if TYPE_CHECKING:
     from .order import Order
@@ -11,10 +13,15 @@ if TYPE_CHECKING:
 
 
 class Refund:
+    __slots__ = ("conn", "id", "order_id", "reason", "_created_at")
+
+    created_at = Timestamp()
+
     def __init__(
         self,
         conn: sqlite3.Connection,
-        *id: int,
+        *,
+        id: int,
         order_id: int,
         reason: str,
         created_at: str,
@@ -23,7 +30,7 @@ class Refund:
         self.id = id
         self.order_id = order_id
         self.reason = reason
-        self.created_at = arrow.get(created_at)
+        self.created_at = created_at
 
     @classmethod
     def create(cls, conn: sqlite3.Connection, *, order: Order, reason: str) -> Refund:
@@ -77,3 +84,45 @@ class Refund:
 
         rows = cur.fetchall()
         return [cls(conn, **row) for row in rows]
+
+    @classmethod
+    def search(
+        cls,
+        conn: sqlite3.Connection,
+        text: str,
+        *,
+        status: str | None = None,
+        user_id: int | None = None,
+        cursor: Cursor | None = None,
+        limit: int = DEFAULT_LIMIT,
+    ) -> Page[SearchHit[Refund]]:
+        """Best matching return reasons first; `status` and `user_id` filter on the returned order."""
+        match = match_expression(text)
+        if not match:
+            return Page([], limit=limit, start=0, next_cursor=None, prev_cursor=None, total=0)
+
+        source = r"""
+            RETURN_REQUESTS_FTS
+            JOIN RETURN_REQUESTS ON RETURN_REQUESTS.ID = RETURN_REQUESTS_FTS.ROWID
+            JOIN ORDERS ON ORDERS.ID = RETURN_REQUESTS.ORDER_ID
+            WHERE RETURN_REQUESTS_FTS MATCH ?
+        """
+        params: tuple = (match,)
+
+        if status:
+            source += " AND ORDERS.STATUS = ?"
+            params += (status,)
+        if user_id:
+            source += " AND ORDERS.USER_ID = ?"
+            params += (user_id,)
+
+        return search_page(
+            conn,
+            "RETURN_REQUESTS_FTS",
+            "RETURN_REQUESTS.*",
+            source,
+            params,
+            build=lambda row: cls(conn, **row),
+            cursor=cursor,
+            limit=limit,
+        )
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import pathlib
+import re
+import sqlite3
+from typing import Any, Callable, Generic, TypeVar
+
+from .pagination import DEFAULT_LIMIT, Cursor, Page, paginate
+
+T = TypeVar("T")
+
+SEARCH_SCHEMA = pathlib.Path(__file__).parent.parent / "search.sql"
+SEARCH_TABLES = {"TICKETS_FTS": "TICKETS", "RETURN_REQUESTS_FTS": "RETURN_REQUESTS"}
+
+# snippet() wraps matched terms in these; `highlight` turns them into <mark> after escaping the text
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_END = "\x03"
+
+# only the newest matches are ranked, so broad queries sort and snippet a bounded set;
+# older ones follow, newest first, in the index's own order
+SEARCH_WINDOW = 1000
+# a key every ranked row sorts before, since bm25 ranks are negative
+_AFTER_RANKED = (1.0, 0)
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+class SearchHit(Generic[T]):
+    def __init__(self, item: T, /, *, snippet: str, rank: float | None) -> None:
+        self.item = item
+        self.snippet = snippet
+        self.rank = rank
+
+    def __repr__(self) -> str:
+        return f"<SearchHit item={self.item!r} rank={self.rank}>"
+
+
+def _window_start(fts_table: str, source: str, /) -> str:
+    """Subquery for the lowest rowid among the newest `window` rows of `source`; takes `source`'s params and the window."""
+    return rf"""
+        SELECT COALESCE(MIN(ROWID), 0) FROM (
+            SELECT {fts_table}.ROWID AS ROWID FROM {source} ORDER BY {fts_table}.ROWID DESC LIMIT ?
+        )
+    """
+
+
+def search_query(
+    fts_table: str, columns: str, source: str, params: tuple, /, *, window: int = SEARCH_WINDOW
+) -> tuple[str, tuple]:
+    """Wrap `source` (`FROM ... WHERE <fts_table> MATCH ? ...`) into a ranked, snippeted query for `paginate`.
+
+    Ranking is limited to the newest `window` rows of `source`; rare terms rank every match.
+    """
+    query = rf"""
+        SELECT
+            {columns}, {fts_table}.ROWID AS SEARCH_ID, {fts_table}.RANK AS SEARCH_RANK,
+            SNIPPET({fts_table}, -1, ?, ?, '...', 16) AS SEARCH_SNIPPET
+        FROM {source} AND {fts_table}.ROWID >= ({_window_start(fts_table, source)})
+    """
+    return query, (HIGHLIGHT_START, HIGHLIGHT_END) + params + params + (window,)
+
+
+def older_query(
+    fts_table: str, columns: str, source: str, params: tuple, /, *, window: int = SEARCH_WINDOW
+) -> tuple[str, tuple]:
+    """The matches `search_query` leaves out, unranked, for `paginate` on `SEARCH_ID` descending."""
+    query = rf"""
+        SELECT
+            {columns}, {fts_table}.ROWID AS SEARCH_ID, NULL AS SEARCH_RANK,
+            SNIPPET({fts_table}, -1, ?, ?, '...', 16) AS SEARCH_SNIPPET
+        FROM {source} AND {fts_table}.ROWID < ({_window_start(fts_table, source)})
+    """
+    return query, (HIGHLIGHT_START, HIGHLIGHT_END) + params + params + (window,)
+
+
+def search_hit(row: Any, build: Callable[[Any], T], /) -> SearchHit[T]:
+    """Split the `SEARCH_*` columns off a search row and build the model from the rest."""
+    rank = row["SEARCH_RANK"]
+    snippet = row["SEARCH_SNIPPET"]
+    del row["SEARCH_RANK"]
+    del row["SEARCH_SNIPPET"]
+    del row["SEARCH_ID"]
+
+    return SearchHit(build(row), snippet=snippet, rank=rank)
+
+
+def search_page(
+    conn: sqlite3.Connection,
+    fts_table: str,
+    columns: str,
+    source: str,
+    params: tuple,
+    /,
+    *,
+    build: Callable[[Any], T],
+    cursor: Cursor | None = None,
+    limit: int = DEFAULT_LIMIT,
+    window: int = SEARCH_WINDOW,
+) -> Page[SearchHit[T]]:
+    """One page of matches: the newest `window` best first, then every older one, newest first.
+
+    Only the window is sorted by rank and snippeted as a whole; older pages seek on the rowid and
+    read the index in order. Their cursors carry a one-column key, which tells the two apart.
+    """
+    ranked_query, ranked_params = search_query(fts_table, columns, source, params, window=window)
+    older, older_params = older_query(fts_table, columns, source, params, window=window)
+
+    def newest_older() -> int | None:
+        row = conn.execute(rf"SELECT SEARCH_ID FROM ({older}) ORDER BY SEARCH_ID DESC LIMIT 1", older_params).fetchone()
+        return row[0] if row else None
+
+    if cursor is None or len(cursor.key) != 1:
+        page = paginate(
+            conn,
+            ranked_query,
+            ranked_params,
+            factory=lambda row: search_hit(row, build),
+            keys=("SEARCH_RANK", "ID"),
+            cursor=cursor,
+            limit=limit,
+            count=False,
+        )
+        # the last ranked page leads on to the older matches
+        if page.next_cursor is None and (newest := newest_older()) is not None:
+            page.next_cursor = Cursor((newest + 1,), position=page.start + len(page)).encode()
+        return page
+
+    page = paginate(
+        conn,
+        older,
+        older_params,
+        factory=lambda row: search_hit(row, build),
+        keys=("SEARCH_ID",),
+        cursor=cursor,
+        limit=limit,
+        descending=True,
+        count=False,
+    )
+    # and the first older page leads back to the ranked ones
+    newest = newest_older()
+    if page.prev_cursor is None or newest is None or (not cursor.backwards and cursor.key[0] > newest):
+        page.prev_cursor = Cursor(_AFTER_RANKED, position=page.start, backwards=True).encode()
+    return page
+
+
+def install_search(conn: sqlite3.Connection, /) -> bool:
+    """Create the FTS5 indexes and their triggers, back-filling them the first time.
+
+    Returns False when this SQLite build has no FTS5, in which case search stays disabled.
+    """
+    cursor = conn.cursor()
+    query = r"SELECT NAME FROM sqlite_master WHERE TYPE = 'table' AND NAME IN (?, ?)"
+    cursor.execute(query, tuple(SEARCH_TABLES))
+    existing = {row[0] for row in cursor.fetchall()}
+
+    try:
+        conn.executescript(SEARCH_SCHEMA.read_text())
+    except sqlite3.OperationalError:
+        if conn.in_transaction:
+            conn.rollback()
+        return False
+
+    for fts_table in SEARCH_TABLES:
+        if fts_table not in existing:
+            cursor.execute(f"INSERT INTO {fts_table} ({fts_table}) VALUES ('rebuild')")
+    conn.commit()
+
+    return True
+
+
+def match_expression(text: str, /) -> str:
+    """Turn free text into a safe FTS5 query: every word must match, the last one as a prefix.
+
+    >>> match_expression('late "parcel" refu')
+    '"late" "parcel" "refu"*'
+    >>> match_expression("  ")
+    ''
+    """
+    tokens = _TOKEN.findall(text)
+    if not tokens:
+        return ""
+
+    quoted = [f'"{token}"' for token in tokens]
+    quoted[-1] += "*"
+    return " ".join(quoted)
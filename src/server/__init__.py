@@ -1,71 +1,210 @@
 from __future__ import annotations
 
+import atexit
 import os
 import pathlib
 import sqlite3
-from typing import TYPE_CHECKING
+import threading
+from typing import TYPE_CHECKING, Any, Mapping
 
-import razorpay
-from apscheduler.schedulers.background import BackgroundScheduler
 from dotenv import load_dotenv
 from flask import Flask
 from flask_login import LoginManager, current_user
-from flask_sitemapper import Sitemapper
 from flask_wtf import CSRFProtect
+from werkzeug.local import LocalProxy
 
+from src.cache import shared_store
+from src.jobs import release_leases, singleton
+from src.sitemap import Sitemap
 from src.user import User
-from src.utils import SQLITE_OLD, backup_sqlite_database, sqlite_row_factory
+from src.utils import SQLITE_OLD, backup_sqlite_database, migrate_schema, sqlite_row_factory
 
 load_dotenv()
 
 RAZORPAY_KEY = os.getenv("RAZORPAY_KEY")
 RAZORPAY_SECRET = os.getenv("RAZORPAY_SECRET")
 SECRET_KEY = os.getenv("SECRET_KEY")
+DATABASE = os.getenv("DATABASE", "database.sqlite")
 
+SCHEMA = pathlib.Path(__file__).parent.parent.parent / "schema.sql"
 
 if TYPE_CHECKING:
     assert isinstance(current_user, User)
+    from apscheduler.schedulers.background import BackgroundScheduler
+
     from src.type_hints import Client as RazorpayClient
-else:
-    RazorpayClient = razorpay.Client
 
 TODAY = "2024-09-15"
 
 app = Flask(__name__)
 app.secret_key = f"{SECRET_KEY}"
-
-schema = pathlib.Path("schema.sql").read_text()
-conn: sqlite3.Connection = sqlite3.connect("database.sqlite", check_same_thread=False)
-conn.executescript(schema)
-conn.row_factory = sqlite_row_factory
+app.config.update(DATABASE=DATABASE, SCHEDULER=True)
 
 login_manager = LoginManager()
 csrf = CSRFProtect(app)
-sitemapper = Sitemapper()
+sitemapper = Sitemap()
 
 login_manager.init_app(app)
-sitemapper.init_app(app)
 
-razorpay_client: RazorpayClient = RazorpayClient(auth=(RAZORPAY_KEY, RAZORPAY_SECRET))
-razorpay_client.set_app_details({"title": "SteezTM App", "version": "1.0"})
+app.jinja_env.trim_blocks = True
+app.jinja_env.lstrip_blocks = True
+
+# the database, the Razorpay client and the scheduler are set up on first use rather than at
+# import, so importing the package stays cheap for scripts and for workers that never need them
+_setup_lock = threading.RLock()
+_connection: sqlite3.Connection | None = None
+_lease_connection: sqlite3.Connection | None = None
+_razorpay_client: RazorpayClient | None = None
+_scheduler: BackgroundScheduler | None = None
+_search_enabled = False
+_created = False
+
+
+def get_connection() -> sqlite3.Connection:
+    """The process-wide connection, opened and migrated on first call."""
+    global _connection, _search_enabled
+
+    if _connection is not None:
+        return _connection
+
+    with _setup_lock:
+        if _connection is None:
+            from src.search import install_search
+
+            connection = sqlite3.connect(app.config["DATABASE"], check_same_thread=False)
+            migrate_schema(connection)
+            connection.executescript(SCHEMA.read_text())
+            connection.row_factory = sqlite_row_factory
+
+            _search_enabled = install_search(connection)
+            if not _search_enabled:
+                app.logger.warning("**SQLITE IS BUILT WITHOUT FTS5. SUPPORT SEARCH IS DISABLED.**")
+
+            _connection = connection
+
+    return _connection
+
+
+def search_enabled() -> bool:
+    get_connection()
+    return _search_enabled
+
+
+def get_razorpay_client() -> RazorpayClient:
+    global _razorpay_client
+
+    if _razorpay_client is None:
+        with _setup_lock:
+            if _razorpay_client is None:
+                import razorpay
+
+                client = razorpay.Client(auth=(RAZORPAY_KEY, RAZORPAY_SECRET))
+                client.set_app_details({"title": "SteezTM App", "version": "1.0"})
+                _razorpay_client = client
+
+    return _razorpay_client
+
+
+conn: sqlite3.Connection = LocalProxy(get_connection)  # type: ignore[assignment]
+razorpay_client: RazorpayClient = LocalProxy(get_razorpay_client)  # type: ignore[assignment]
 
 if SQLITE_OLD:
     app.logger.warning("**SQLITE VERSION IS TOO OLD. PLEASE USE 3.35.0 OR NEWER. FEW FEATURES MAY NOT WORK.**")
 
-scheduler = BackgroundScheduler()
 
-scheduler.add_job(
-    backup_sqlite_database,
-    "interval",
-    seconds=5,
-    args=(conn,),
-)
+def start_scheduler() -> None:
+    """Start this worker's scheduler; `singleton` leases let only one worker run each job."""
+    global _scheduler, _lease_connection
 
-scheduler.start()
+    with _setup_lock:
+        if _scheduler is not None:
+            return
+
+        from apscheduler.schedulers.background import BackgroundScheduler
+
+        from .logs import LOG_PRUNE_INTERVAL, prune_logs
+
+        # the lease connection skips migrations, so JOB_LEASES must exist before the first run
+        get_connection()
+
+        database = pathlib.Path(app.config["DATABASE"])
+        _lease_connection = sqlite3.connect(database, check_same_thread=False)
+
+        scheduler = BackgroundScheduler()
+        scheduler.add_job(
+            singleton(_lease_connection, "backup_sqlite_database", ttl=15)(backup_sqlite_database),
+            "interval",
+            seconds=5,
+            args=(conn,),
+            kwargs={"path": str(database.with_name(f"{database.stem}-bak.sqlite"))},
+        )
+        scheduler.add_job(
+            singleton(_lease_connection, "prune_logs", ttl=LOG_PRUNE_INTERVAL * 1.5)(prune_logs),
+            "interval",
+            seconds=LOG_PRUNE_INTERVAL,
+        )
+        scheduler.start()
+        _scheduler = scheduler
+
+
+def shutdown() -> None:
+    """Stop this worker's scheduler, hand its job leases to the other workers and flush its logs."""
+    from .logs import stop_log_sink
+
+    if _scheduler is not None and _scheduler.running:
+        _scheduler.shutdown(wait=False)
+    if _lease_connection is not None:
+        release_leases(_lease_connection)
+    stop_log_sink()
+
+
+atexit.register(shutdown)
+
+
+def create_app(config: Mapping[str, Any] | None = None) -> Flask:
+    """Finish setting up `app` for serving: apply `config`, start the scheduler, warm up rendering.
+
+    Later calls just return the app. Set `SCHEDULER` to False in scripts and tests that must not
+    run background jobs, `LOG_SINK` to False to keep log records out of the database, and
+    `TEMPLATE_WARMUP` to False to load templates and render the error pages on first use instead.
+    """
+    global _created
+
+    from .error_pages import prerender_error_pages
+    from .logs import start_log_sink
+    from .templating import warm_templates
+
+    with _setup_lock:
+        if _created:
+            return app
+
+        if config:
+            app.config.update(config)
+
+        shared_store.place_beside(app.config["DATABASE"])
+        start_log_sink()
+
+        if app.config["SCHEDULER"]:
+            start_scheduler()
+
+        # workers report ready only after this, so their first visitors don't pay for compiling
+        if app.config["TEMPLATE_WARMUP"]:
+            warm_templates()
+            prerender_error_pages()
+
+        _created = True
+
+    return app
 
-app.jinja_env.trim_blocks = True
-app.jinja_env.lstrip_blocks = True
 
 from .filters import *  # noqa
+from .templating import *  # noqa
+from .error_pages import *  # noqa
 from .login_manager import *  # noqa
+from .caching import *  # noqa
+from .assets import *  # noqa
+from .page_cache import *  # noqa
+from .fragment_cache import *  # noqa
+from .pictures import *  # noqa
+from .logs import *  # noqa
 from .routes import *  # noqa
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+from typing import Any, Callable
+
+from asgiref.wsgi import WsgiToAsgi
+
+from src.server import create_app, shutdown
+from src.server.compression import Compression
+from src.server.static_files import StaticFiles
+
+
+class WorkerApp:
+    """ASGI entry point of one worker process around the WSGI app.
+
+    Each request runs as a task in a fresh context. uvicorn starts the next request on a
+    keep-alive connection from inside the previous request's task. That request would inherit
+    asgiref's "sync thread in use" flag, and asgiref would reject it as a deadlock.
+    Lifespan shutdown runs `on_shutdown`; uvicorn re-raises SIGTERM after a graceful shutdown,
+    so atexit handlers never run in workers.
+    """
+
+    def __init__(self, app: Callable, /, *, on_shutdown: Callable[[], Any]) -> None:
+        self.app = app
+        self.on_shutdown = on_shutdown
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "lifespan":
+            request = contextvars.Context().run(asyncio.ensure_future, self.app(scope, receive, send))
+            return await request
+
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.on_shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+asgi_app = WorkerApp(Compression(StaticFiles(WsgiToAsgi(create_app()))), on_shutdown=shutdown)
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+import os
+
+from src.assets import asset_name
+from src.server import app
+
+# link pages to the built, content-hashed copies of assets once `python build_assets.py` has run
+HASHED_ASSETS = os.environ.get("HASHED_ASSETS", "True").lower() == "true"
+
+app.config.setdefault("HASHED_ASSETS", HASHED_ASSETS)
+
+
+@app.url_defaults
+def hashed_static_url(endpoint: str, values: dict) -> None:
+    """Make `url_for("static", filename=...)` point at the asset's hashed copy when there is one."""
+    if endpoint == "static" and app.config["HASHED_ASSETS"] and "filename" in values:
+        values["filename"] = asset_name(values["filename"])
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import time
+from typing import Callable, TypeVar
+
+from flask import Response, make_response, request, session
+from flask_login import current_user
+
+from src.server import app
+
+F = TypeVar("F", bound=Callable)
+
+# Cache-Control per endpoint; `static/<prefix>` entries match static files by path, longest first.
+# Pages are revalidated on every view, so a repeat visit costs a 304 rather than a render.
+CACHE_POLICIES: dict[str, str] = {
+    "product": "no-cache",
+    "category_page": "no-cache",
+    "static": "public, max-age=3600",
+    "static/product_pictures/": "public, max-age=86400, stale-while-revalidate=604800",
+    "static/derived/": "public, max-age=86400, stale-while-revalidate=604800",
+    # content-hashed, a changed asset gets a new URL
+    "static/assets/": "public, max-age=31536000, immutable",
+}
+# pages of signed-in visitors carry their cart and name, so no shared cache may keep them
+AUTHENTICATED_POLICY = "private, no-cache"
+
+app.config.setdefault("CACHE_POLICIES", CACHE_POLICIES)
+
+
+def cache_policy(endpoint: str | None, filename: str | None = None) -> str | None:
+    policies: dict[str, str] = app.config["CACHE_POLICIES"]
+
+    if endpoint == "static" and filename:
+        path = f"static/{filename}"
+        prefixes = [prefix for prefix in policies if prefix.startswith("static/") and path.startswith(prefix)]
+        if prefixes:
+            return policies[max(prefixes, key=len)]
+
+    return policies.get(endpoint or "")
+
+
+def page_etag(version: str) -> str:
+    """Weak validator for an anonymous page built from `version`.
+
+    Pages embed CSRF tokens, so the tag also covers this session's CSRF secret and changes
+    halfway through the token's lifetime; a page revalidated by a 304 never carries a dead token.
+    """
+    time_limit = app.config.get("WTF_CSRF_TIME_LIMIT", 3600) or 0
+    window = int(time.time() // (time_limit / 2)) if time_limit else 0
+    secret = session.get(app.config.get("WTF_CSRF_FIELD_NAME", "csrf_token"), "")
+
+    return hashlib.blake2b(f"{version}|{secret}|{window}".encode(), digest_size=12).hexdigest()
+
+
+def conditional(version: Callable[..., str | None]) -> Callable[[F], F]:
+    """Answer anonymous GETs with `304 Not Modified` before the view renders anything.
+
+    `version` gets the view's URL arguments and returns a string that changes whenever the
+    page would, or None to always render (the view then reports the missing row itself).
+    Goes below `@app.route`.
+    """
+
+    def decorator(view: F) -> F:
+        @functools.wraps(view)
+        def wrapper(**kwargs):
+            if request.method not in ("GET", "HEAD") or current_user.is_authenticated:
+                return view(**kwargs)
+
+            tag = version(**kwargs)
+            if tag is None:
+                return view(**kwargs)
+
+            if request.if_none_match.contains_weak(page_etag(tag)):
+                response = Response(status=304)
+            else:
+                response = make_response(view(**kwargs))
+
+            # rendering may have created the session's CSRF secret, so tag after the view ran
+            response.set_etag(page_etag(tag), weak=True)
+            response.vary.add("Cookie")
+            return response
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+@app.after_request
+def apply_cache_policy(response: Response) -> Response:
+    if request.method not in ("GET", "HEAD") or response.status_code not in (200, 304):
+        return response
+    # `send_file` always marks static files no-cache, anything else that set a policy keeps it
+    if request.endpoint != "static" and "Cache-Control" in response.headers:
+        return response
+
+    filename = (request.view_args or {}).get("filename")
+    policy = cache_policy(request.endpoint, filename)
+    if policy is None:
+        return response
+
+    if request.endpoint != "static" and current_user.is_authenticated:
+        policy = AUTHENTICATED_POLICY
+
+    response.headers["Cache-Control"] = policy
+    return response
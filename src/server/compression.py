@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import os
+import zlib
+from typing import Callable
+
+from werkzeug.http import parse_accept_header
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# bodies smaller than this go out as they are; below about a packet, compressing saves nothing on the wire
+COMPRESS_MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", 1024))
+# dynamic responses are compressed per request, so trade a little ratio for CPU
+GZIP_LEVEL = int(os.environ.get("GZIP_LEVEL", 6))
+BROTLI_QUALITY = int(os.environ.get("BROTLI_QUALITY", 4))
+
+COMPRESSIBLE_TYPES = frozenset(
+    (
+        "text/html",
+        "text/css",
+        "text/plain",
+        "text/xml",
+        "text/javascript",
+        "text/csv",
+        "application/javascript",
+        "application/json",
+        "application/xml",
+        "application/rss+xml",
+        "application/manifest+json",
+        "image/svg+xml",
+    )
+)
+
+
+def negotiate(accept_encoding: str, /) -> str | None:
+    """The encoding to compress with for this `Accept-Encoding`, brotli when both it and gzip are equally welcome.
+
+    >>> negotiate("gzip, deflate"), negotiate("gzip;q=0, identity"), negotiate("")
+    ('gzip', None, None)
+    """
+    accepted = parse_accept_header(accept_encoding)
+    offered = ("br", "gzip") if brotli is not None else ("gzip",)
+    quality, encoding = max(((accepted[encoding], -i), encoding) for i, encoding in enumerate(offered))
+    return encoding if quality[0] > 0 else None
+
+
+class Encoder:
+    """Incremental gzip or brotli compressor; `compress` returns what can be sent so far."""
+
+    def __init__(self, encoding: str) -> None:
+        self.encoding = encoding
+        if encoding == "br":
+            self.compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self.compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, *, flush: bool = False) -> bytes:
+        """Compress `data`; with `flush`, also everything still buffered, so a streamed chunk reaches the client now."""
+        if self.encoding == "br":
+            return self.compressor.process(data) + (self.compressor.flush() if flush else b"")
+        return self.compressor.compress(data) + (self.compressor.flush(zlib.Z_SYNC_FLUSH) if flush else b"")
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self.encoding == "br":
+            return self.compressor.process(data) + self.compressor.finish()
+        return self.compressor.compress(data) + self.compressor.flush()
+
+
+class _Response:
+    """Compresses one response while passing it on to the server's `send`."""
+
+    def __init__(self, send: Callable, encoding: str | None, minimum_size: int) -> None:
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+
+        self.start: dict | None = None
+        self.buffered: list[bytes] = []
+        self.size = 0
+        self.length: int | None = None
+        self.encoder: Encoder | None = None
+        self.passthrough = False
+
+    @staticmethod
+    def eligible(message: dict, headers: dict[bytes, bytes]) -> bool:
+        content_type = headers.get(b"content-type", b"").split(b";", 1)[0].strip().decode("latin-1").lower()
+        return (
+            message["status"] >= 200
+            and message["status"] not in (204, 206, 304)
+            # sitemaps, error pages, cached pages and static siblings arrive compressed already
+            and b"content-encoding" not in headers
+            and b"content-range" not in headers
+            and b"no-transform" not in headers.get(b"cache-control", b"")
+            and content_type in COMPRESSIBLE_TYPES
+        )
+
+    async def __call__(self, message: dict) -> None:
+        if message["type"] == "http.response.start":
+            return await self.response_start(message)
+        if message["type"] != "http.response.body" or self.passthrough:
+            return await self.send(message)
+        await self.response_body(message)
+
+    async def response_start(self, message: dict) -> None:
+        headers = {name.lower(): value for name, value in message["headers"]}
+        if not self.eligible(message, headers):
+            self.passthrough = True
+            return await self.send(message)
+
+        # caches must keep one copy per encoding, whether or not this client gets a compressed one
+        vary = headers.get(b"vary", b"")
+        if b"accept-encoding" not in vary.lower() and vary != b"*":
+            message = {**message, "headers": [(name, value) for name, value in message["headers"] if name.lower() != b"vary"]}
+            message["headers"].append((b"vary", b"%s, Accept-Encoding" % vary if vary else b"Accept-Encoding"))
+
+        if self.encoding is None:
+            self.passthrough = True
+            return await self.send(message)
+
+        self.start = message
+        if b"content-length" in headers:
+            self.length = int(headers[b"content-length"])
+
+    async def response_body(self, message: dict) -> None:
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+
+        if self.encoder is not None:
+            chunk = self.encoder.compress(body, flush=True) if more_body else self.encoder.finish(body)
+            if chunk or not more_body:
+                await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+            return
+
+        self.buffered.append(body)
+        self.size += len(body)
+        complete = not more_body or self.size == self.length
+        if not complete and self.size < self.minimum_size:
+            return
+
+        data = b"".join(self.buffered)
+        self.buffered.clear()
+        if complete and self.size < self.minimum_size:
+            return await self.send_unchanged(data, more_body)
+
+        assert self.encoding is not None and self.start is not None
+        self.encoder = Encoder(self.encoding)
+        if complete:
+            compressed = self.encoder.finish(data)
+            if len(compressed) >= self.size:
+                return await self.send_unchanged(data, more_body)
+            await self.send({**self.start, "headers": self.headers(len(compressed))})
+            await self.send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+            # whatever the app still sends is the empty end of the body, already covered by `finish`
+            self.passthrough = True
+            return
+
+        # the length is unknown until the end, so the server falls back to chunked encoding
+        await self.send({**self.start, "headers": self.headers(None)})
+        await self.send({"type": "http.response.body", "body": self.encoder.compress(data, flush=True), "more_body": True})
+
+    def headers(self, length: int | None) -> list[tuple[bytes, bytes]]:
+        assert self.start is not None and self.encoding is not None
+        headers = []
+        for name, value in self.start["headers"]:
+            name = name.lower()
+            if name == b"content-length":
+                continue
+            if name == b"etag" and not value.startswith(b"W/"):
+                # the compressed body is a different byte sequence, only weakly the same entity
+                value = b"W/" + value
+            headers.append((name, value))
+
+        headers.append((b"content-encoding", self.encoding.encode()))
+        if length is not None:
+            headers.append((b"content-length", str(length).encode()))
+        return headers
+
+    async def send_unchanged(self, data: bytes, more_body: bool) -> None:
+        assert self.start is not None
+        self.passthrough = True
+        await self.send(self.start)
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+
+class Compression:
+    """ASGI middleware compressing text responses with gzip, or brotli when it is installed and accepted.
+
+    Bodies under `minimum_size` and responses that already carry a `Content-Encoding` pass through.
+    A body that arrives whole is compressed in one go and keeps a `Content-Length`; a streamed one
+    is compressed chunk by chunk, each flushed so the client sees it as soon as the app sends it.
+    """
+
+    def __init__(self, app: Callable, /, *, minimum_size: int = COMPRESS_MIN_SIZE) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            return await self.app(scope, receive, send)
+
+        accept_encoding = next((value for name, value in scope["headers"] if name.lower() == b"accept-encoding"), b"")
+        encoding = negotiate(accept_encoding.decode("latin-1"))
+        await self.app(scope, receive, _Response(send, encoding, self.minimum_size))
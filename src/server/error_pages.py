@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import gzip
+import threading
+from typing import NamedTuple
+
+from flask import Response, request
+
+from src.server import app
+
+# every error page is static HTML, so each is rendered once per worker rather than per error
+ERROR_TEMPLATES: dict[int, str] = {
+    403: "error/403.html",
+    404: "error/404.html",
+    500: "error/500.html",
+    502: "error/502.html",
+    503: "error/503.html",
+    504: "error/504.html",
+    505: "error/505.html",
+}
+
+
+class ErrorPage(NamedTuple):
+    body: bytes
+    gzipped: bytes
+
+
+_error_pages: dict[int, ErrorPage] = {}
+_error_pages_lock = threading.Lock()
+
+
+def prerender_error_pages() -> dict[int, ErrorPage]:
+    if len(_error_pages) == len(ERROR_TEMPLATES):
+        return _error_pages
+
+    with _error_pages_lock:
+        for status, name in ERROR_TEMPLATES.items():
+            if status not in _error_pages:
+                body = app.jinja_env.get_template(name).render().encode("utf-8")
+                _error_pages[status] = ErrorPage(body, gzip.compress(body, compresslevel=9, mtime=0))
+
+    return _error_pages
+
+
+def error_page(status: int, headers: dict[str, str] | None = None) -> Response:
+    """The pre-rendered page for `status`, gzipped when the client takes it."""
+    page = prerender_error_pages()[status]
+
+    if request.accept_encodings["gzip"]:
+        response = Response(page.gzipped, status=status, mimetype="text/html", headers={"Content-Encoding": "gzip"})
+    else:
+        response = Response(page.body, status=status, mimetype="text/html")
+
+    if headers:
+        response.headers.update(headers)
+    response.vary.add("Accept-Encoding")
+    return response
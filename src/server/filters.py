@@ -2,23 +2,39 @@ import contextlib
 import locale
 
 import arrow
+from flask import g
+from markupsafe import Markup, escape
 
+from src.search import HIGHLIGHT_END, HIGHLIGHT_START
 from src.server import app
+from src.timestamps import parse_timestamp
 
 with contextlib.suppress(locale.Error):
     locale.setlocale(locale.LC_ALL, "en_IN")
 
 
+def render_now() -> arrow.Arrow:
+    """The instant every date on the page being rendered is humanized against."""
+    try:
+        return g.render_now
+    except AttributeError:
+        g.render_now = now = arrow.utcnow()
+        return now
+    except RuntimeError:
+        # rendering outside an app context
+        return arrow.utcnow()
+
+
 @app.template_filter("datetimeformat")
 def datetimeformat(value):
-    dt = arrow.get(value)
-    return f"{dt.format('YYYY-MM-DD HH:mm:ss')} ({dt.humanize()})"
+    # model timestamps arrive parsed already; `strftime` skips arrow's token formatter
+    dt = parse_timestamp(value)
+    return f"{dt.strftime('%Y-%m-%d %H:%M:%S')} ({dt.humanize(render_now())})"
 
 
 @app.template_filter("datetimeformat_short")
 def datetimeformat_short(value):
-    dt = arrow.get(value)
-    return dt.humanize()
+    return parse_timestamp(value).humanize(render_now())
 
 
 @app.template_filter("format_currency")
@@ -39,3 +55,9 @@ def format_currency_direct(value):
         return cur.replace(RUPEE, "INR. ")
     except ValueError:
         return f"{(value or 0)}"
+
+
+@app.template_filter("highlight")
+def highlight(value):
+    text = str(escape(value or ""))
+    return Markup(text.replace(HIGHLIGHT_START, "<mark>").replace(HIGHLIGHT_END, "</mark>"))
@@ -123,3 +123,8 @@ class TicketForm(FlaskForm):
     subject = StringField("Subject", validators=[DataRequired()])
     message = TextAreaField("Message", validators=[DataRequired()])
     submit = SubmitField("Submit Ticket")
+
+
+class TicketReplyForm(FlaskForm):
+    message = TextAreaField("Reply", validators=[DataRequired()])
+    submit = SubmitField("Send Reply")
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import hashlib
+import os
+
+from flask import g
+from jinja2 import Template
+from markupsafe import Markup
+
+from src.cache import TTLCache
+from src.product import Product
+from src.server import app, conn
+from src.utils import table_version
+
+CARD_CACHE_SIZE = int(os.environ.get("CARD_CACHE_SIZE", 4096))
+CARD_CACHE_TTL = float(os.environ.get("CARD_CACHE_TTL", 24 * 3600))
+CARD_TEMPLATE = "fragments/product_card.html"
+
+app.config.setdefault("CARD_CACHE", True)
+
+card_cache: TTLCache[Markup] = TTLCache(maxsize=CARD_CACHE_SIZE, ttl=CARD_CACHE_TTL)
+
+_template_versions: dict[str, tuple[Template, str]] = {}
+
+
+def template_version(name: str) -> tuple[Template, str]:
+    """The compiled template and a digest of its source; the digest changes when Jinja reloads an edited file."""
+    template = app.jinja_env.get_template(name)
+
+    known = _template_versions.get(name)
+    if known is None or known[0] is not template:
+        source, _, _ = app.jinja_env.loader.get_source(app.jinja_env, name)  # type: ignore[union-attr]
+        known = _template_versions[name] = (template, hashlib.blake2b(source.encode(), digest_size=8).hexdigest())
+
+    return known
+
+
+def _images_version() -> int:
+    """The `IMAGES` version, read once per request however many cards it renders."""
+    if "images_version" not in g:
+        g.images_version = table_version(conn, "IMAGES")
+    return g.images_version
+
+
+def card_version(product: Product) -> str:
+    """Changes whenever anything a card can show does: an edit of the row, its stock, its pictures and their derivatives.
+
+    Pictures and derivatives are covered by the `IMAGES` version they move on, so nothing here touches the disk.
+    """
+    return f"{product.id}:{product.updated_at}:{product.stock}:{_images_version()}"
+
+
+@app.template_global()
+def product_card(product: Product) -> Markup:
+    """The product's listing card, rendered once per product version and shared by every grid."""
+    template, version = template_version(CARD_TEMPLATE)
+    if not app.config["CARD_CACHE"]:
+        return Markup(template.render(product=product))
+
+    key = (product.unique_id, card_version(product), version)
+    card = card_cache.get(key)
+    if card is None:
+        card = Markup(template.render(product=product))
+        card_cache.set(key, card)
+    return card
@@ -3,10 +3,10 @@ from __future__ import annotations
 from functools import wraps
 from typing import TYPE_CHECKING
 
-from flask import Request, render_template
+from flask import Request
 from flask_login import current_user
 
-from src.server import conn, login_manager
+from src.server import conn, error_page, login_manager
 from src.user import Admin, User
 
 if TYPE_CHECKING:
@@ -20,13 +20,10 @@ HTTP_UNAUTHORIZED = 403
 def load_user(user_id: str | int) -> User | None:
     user_id = int(user_id)
 
-    try:
-        if user_id == ADMIN_ID:
-            return Admin.from_id(conn, user_id)
+    if user_id == ADMIN_ID:
+        return Admin.cached(conn, user_id)
 
-        return User.from_id(conn, user_id)
-    except ValueError:
-        return None
+    return User.cached(conn, user_id)
 
 
 @login_manager.request_loader
@@ -49,6 +46,6 @@ def admin_login_required(func):
         if current_user.is_authenticated and current_user.is_admin:
             return func(*args, **kwargs)
 
-        return render_template("error/403.html"), HTTP_UNAUTHORIZED
+        return error_page(HTTP_UNAUTHORIZED)
 
     return wrapper
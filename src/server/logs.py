@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+
+from flask import Response, g, has_request_context, request
+from werkzeug.local import LocalProxy
+
+from src.logs import LOG_RETENTION_DAYS, LOGS_SCHEMA, LogSink, SinkHandler
+from src.server import app, get_connection
+from src.utils import sqlite_row_factory
+
+# send log records, the app's and its libraries', to the LOGS table
+LOG_SINK = os.environ.get("LOG_SINK", "True").lower() == "true"
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+# one INFO record per request, with its status and latency
+LOG_REQUESTS = os.environ.get("LOG_REQUESTS", "True").lower() == "true"
+# a database of their own keeps log writes off the file every order and session writes to
+LOG_DATABASE = os.environ.get("LOG_DATABASE") or None
+LOG_PRUNE_INTERVAL = 3600
+
+app.config.setdefault("LOG_SINK", LOG_SINK)
+app.config.setdefault("LOG_LEVEL", LOG_LEVEL)
+app.config.setdefault("LOG_REQUESTS", LOG_REQUESTS)
+app.config.setdefault("LOG_DATABASE", LOG_DATABASE)
+app.config.setdefault("LOG_RETENTION_DAYS", LOG_RETENTION_DAYS)
+
+# ids a proxy hands in are kept when they look like one, so its logs and ours line up
+REQUEST_ID = re.compile(r"[A-Za-z0-9._-]{1,64}")
+
+access_logger = logging.getLogger("src.server.access")
+
+_log_lock = threading.Lock()
+_sink: LogSink | None = None
+_handler: SinkHandler | None = None
+_log_connection: sqlite3.Connection | None = None
+
+
+def stamp_request(record: logging.LogRecord) -> bool:
+    """Tag records logged while handling a request with its id."""
+    if not hasattr(record, "request_id") and has_request_context():
+        record.request_id = g.get("request_id")
+    return True
+
+
+def start_log_sink() -> None:
+    """Start this worker's log writer and route records at `LOG_LEVEL` and above to it."""
+    global _sink, _handler
+
+    with _log_lock:
+        if _sink is not None or not app.config["LOG_SINK"]:
+            return
+
+        database = app.config["LOG_DATABASE"]
+        if database is None:
+            # the writer inserts into LOGS as soon as it starts, so it must have been migrated
+            get_connection()
+
+        sink = LogSink(database or app.config["DATABASE"], standalone=database is not None)
+        handler = SinkHandler(sink, app.config["LOG_LEVEL"])
+        handler.addFilter(stamp_request)
+
+        logging.getLogger().addHandler(handler)
+        if app.logger.level == logging.NOTSET:
+            app.logger.setLevel(app.config["LOG_LEVEL"])
+        if app.config["LOG_REQUESTS"]:
+            access_logger.setLevel(logging.INFO)
+
+        sink.start()
+        _sink, _handler = sink, handler
+
+
+def stop_log_sink() -> None:
+    """Detach the handler and let the writer finish what is queued."""
+    global _sink, _handler
+
+    with _log_lock:
+        if _handler is not None:
+            logging.getLogger().removeHandler(_handler)
+        if _sink is not None:
+            _sink.stop()
+        _sink = _handler = None
+
+
+def log_sink() -> LogSink | None:
+    return _sink
+
+
+def prune_logs() -> None:
+    if _sink is not None:
+        _sink.prune(days=app.config["LOG_RETENTION_DAYS"])
+
+
+def get_log_connection() -> sqlite3.Connection:
+    """The connection the log viewer reads with: the main one, or one to `LOG_DATABASE`."""
+    global _log_connection
+
+    if app.config["LOG_DATABASE"] is None:
+        return get_connection()
+
+    if _log_connection is None:
+        with _log_lock:
+            if _log_connection is None:
+                connection = sqlite3.connect(app.config["LOG_DATABASE"], check_same_thread=False)
+                connection.executescript(LOGS_SCHEMA)
+                connection.row_factory = sqlite_row_factory
+                _log_connection = connection
+
+    return _log_connection
+
+
+log_conn: sqlite3.Connection = LocalProxy(get_log_connection)  # type: ignore[assignment]
+
+
+@app.before_request
+def start_request_log() -> None:
+    g.request_started = time.perf_counter()
+    request_id = request.headers.get("X-Request-ID", "")
+    g.request_id = request_id if REQUEST_ID.fullmatch(request_id) else uuid.uuid4().hex
+
+
+@app.after_request
+def log_request(response: Response) -> Response:
+    if request_id := g.get("request_id"):
+        response.headers.setdefault("X-Request-ID", request_id)
+
+    if access_logger.isEnabledFor(logging.INFO) and "request_started" in g:
+        # until the view returned; a streamed body is still being sent after this
+        latency = round((time.perf_counter() - g.request_started) * 1000, 2)
+        path = request.full_path if request.query_string else request.path
+        access_logger.info("%s %s %s", request.method, path, response.status_code, extra={"latency": latency})
+
+    return response
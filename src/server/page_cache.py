@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import functools
+import os
+import re
+import struct
+import zlib
+from typing import Callable, NamedTuple, TypeVar
+
+from flask import Response, g, make_response, render_template, request, session
+from flask_login import current_user
+from flask_wtf.csrf import generate_csrf
+from markupsafe import Markup
+
+from src.cache import SharedCache, shared_store
+from src.server import app, conn
+from src.utils import table_version
+
+F = TypeVar("F", bound=Callable)
+
+PAGE_CACHE_SIZE = int(os.environ.get("PAGE_CACHE_SIZE", 256))
+PAGE_CACHE_TTL = float(os.environ.get("PAGE_CACHE_TTL", 600))
+# share rendered pages between workers through the cache database, not just within one
+PAGE_CACHE_SHARED = os.environ.get("PAGE_CACHE_SHARED", "False").lower() == "true"
+
+# stored pages carry this instead of a CSRF token; each response gets the visitor's own
+CSRF_PLACEHOLDER = "__PAGE_CACHE_CSRF_TOKEN__"
+
+# the per-visitor parts of shared pages, rendered for each response and stitched into the stored copy
+HOLES: dict[str, str] = {
+    "navbar_user": "holes/navbar_user.html",
+    "admin_banner": "holes/admin_banner.html",
+}
+HOLE_MARKER = re.compile(r"<!--hole:(\w+)-->")
+# where stored pages are cut, so their fixed parts can be compressed once
+PAGE_MARKER = re.compile(rf"(<!--hole:\w+-->|{CSRF_PLACEHOLDER})")
+
+# gzip member header: deflate, no name, mtime 0, unknown OS
+GZIP_HEADER = b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff"
+# an empty final deflate block, closing a run of sync-flushed ones
+DEFLATE_END = b"\x03\x00"
+
+app.config.setdefault("PAGE_CACHE", True)
+
+page_cache: SharedCache[str] = SharedCache(
+    "page",
+    store=shared_store if PAGE_CACHE_SHARED else None,
+    maxsize=PAGE_CACHE_SIZE,
+    ttl=PAGE_CACHE_TTL,
+)
+
+
+@app.template_global()
+def hole(name: str) -> Markup:
+    """A per-visitor fragment: inline on a normal render, a marker in a page being stored."""
+    if g.get("page_cache_render"):
+        return Markup(f"<!--hole:{name}-->")
+    return Markup(render_template(HOLES[name]))
+
+
+def _deflate(data: bytes, level: int) -> bytes:
+    """Raw deflate blocks for `data` that can be followed by other such blocks, and closed by `DEFLATE_END`."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+class CachedPage(NamedTuple):
+    """A stored page cut at its markers: `parts` alternate fixed text and markers, starting with text."""
+
+    parts: list[str]
+    encoded: list[bytes]
+    # each fixed part compressed on its own, so a gzip body is assembled around fresh holes without recompressing it
+    deflated: list[bytes]
+
+    @classmethod
+    def build(cls, body: str) -> CachedPage:
+        parts = PAGE_MARKER.split(body)
+        encoded = [part.encode() for part in parts[::2]]
+        return cls(parts, encoded, [_deflate(part, 9) for part in encoded])
+
+    def fills(self) -> list[str]:
+        """What goes in place of each marker for this response."""
+        fragments: dict[str, str] = {}
+        filled = []
+        for marker in self.parts[1::2]:
+            if marker not in fragments:
+                hole = HOLE_MARKER.fullmatch(marker)
+                fragments[marker] = render_template(HOLES[hole[1]]) if hole else generate_csrf()
+            filled.append(fragments[marker])
+        return filled
+
+    def text(self) -> str:
+        fills = self.fills()
+        return "".join(part if i % 2 == 0 else fills[i // 2] for i, part in enumerate(self.parts))
+
+    def gzip(self) -> bytes:
+        """The stitched page as a gzip body; only the holes are compressed per response."""
+        fills = [fill.encode() for fill in self.fills()]
+        chunks = [GZIP_HEADER]
+        crc = size = 0
+        for i, (encoded, deflated) in enumerate(zip(self.encoded, self.deflated)):
+            chunks.append(deflated)
+            crc = zlib.crc32(encoded, crc)
+            size += len(encoded)
+            if i < len(fills):
+                chunks.append(_deflate(fills[i], 6))
+                crc = zlib.crc32(fills[i], crc)
+                size += len(fills[i])
+
+        chunks.append(DEFLATE_END)
+        chunks.append(struct.pack("<II", crc, size & 0xFFFFFFFF))
+        return b"".join(chunks)
+
+
+def _cacheable(*, anonymous_only: bool) -> bool:
+    return (
+        app.config["PAGE_CACHE"]
+        and request.method == "GET"
+        and not (anonymous_only and current_user.is_authenticated)
+        # a pending flash message is shown once, to this visitor only
+        and "_flashes" not in session
+    )
+
+
+def _page_key(tables: tuple[str, ...]) -> str:
+    versions = ".".join(str(table_version(conn, table)) for table in tables)
+    query = "&".join(sorted(f"{key}={value}" for key, value in request.args.items(multi=True)))
+    # pages may branch on being signed in outside the holes, never on who is
+    audience = "user" if current_user.is_authenticated else "anon"
+    return f"{request.path}?{query}|{versions}|{audience}"
+
+
+def cached_page(*tables: str, anonymous_only: bool = False) -> Callable[[F], F]:
+    """Serve GETs of the view from a rendered copy until one of `tables` changes.
+
+    `tables` are `VERSIONS` names. The copy is keyed by path and query string, and is only
+    kept for 200 responses. Everything that differs between signed-in visitors must sit in a
+    `hole()`; holes and CSRF tokens are filled in per response. Views that show a visitor's
+    own data elsewhere pass `anonymous_only`. Clients accepting gzip get a body assembled from
+    parts compressed when the page was stored. Goes below `@app.route` (and below `@conditional`).
+    """
+
+    def decorator(view: F) -> F:
+        @functools.wraps(view)
+        def wrapper(**kwargs):
+            if not _cacheable(anonymous_only=anonymous_only):
+                return view(**kwargs)
+
+            rendered: list[Response] = []
+
+            def render() -> str | None:
+                field_name = app.config.get("WTF_CSRF_FIELD_NAME", "csrf_token")
+                setattr(g, field_name, CSRF_PLACEHOLDER)
+                g.page_cache_render = True
+                try:
+                    response = make_response(view(**kwargs))
+                finally:
+                    g.pop(field_name, None)
+                    g.pop("page_cache_render", None)
+
+                rendered.append(response)
+                if response.status_code != 200 or response.is_streamed or "Set-Cookie" in response.headers:
+                    return None
+                return response.get_data(as_text=True)
+
+            page = page_cache.get(_page_key(tables), load=render, build=CachedPage.build)
+            if page is None:
+                return rendered[0]
+
+            if request.accept_encodings["gzip"]:
+                response = make_response(page.gzip())
+                response.content_encoding = "gzip"
+            else:
+                response = make_response(page.text())
+            response.headers["X-Page-Cache"] = "MISS" if rendered else "HIT"
+            response.vary.update(("Cookie", "Accept-Encoding"))
+            return response
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
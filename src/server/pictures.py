@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import sqlite3
+from concurrent.futures import Future
+from typing import Iterable
+
+from markupsafe import Markup, escape
+from werkzeug.datastructures import FileStorage
+
+from src.images import PICTURES, image_set, schedule_derivatives
+from src.server import app, conn
+from src.uploads import UPLOAD_MAX_BYTES, StoredUpload, link_upload, store_upload
+from src.utils import bump_version
+
+UPLOAD_MAX_FILES = 10
+
+# werkzeug refuses bigger request bodies before any of it reaches a view
+app.config.setdefault("MAX_CONTENT_LENGTH", UPLOAD_MAX_BYTES * UPLOAD_MAX_FILES)
+
+
+def _attributes(attributes: dict[str, object]) -> str:
+    return "".join(f' {name}="{escape(value)}"' for name, value in attributes.items() if value is not None)
+
+
+@app.template_global()
+def picture(src: str, alt: str = "", *, sizes: str = "100vw", class_: str = "", style: str = "", loading: str = "lazy") -> Markup:
+    """An uploaded picture with `srcset`s of its derivatives, or a plain `<img>` until they are built.
+
+    `sizes` is how wide the slot is, so the browser picks the narrowest variant that fills it.
+    The blurred placeholder shows behind the image until it has loaded.
+    """
+    img = {"src": src or "", "alt": alt, "class": class_ or None, "style": style or None, "loading": loading}
+
+    images = image_set(src) if src else None
+    if images is None:
+        return Markup(f"<img{_attributes(img)} />")
+
+    img.update(
+        width=images.width,
+        height=images.height,
+        style=f"background: url({images.placeholder}) center / cover no-repeat; {style}",
+        decoding="async",
+        onload="this.style.backgroundImage='none'",
+    )
+    sources = "".join(
+        f"<source{_attributes({'type': f'image/{format}', 'srcset': images.srcset(format), 'sizes': sizes})} />"
+        for format in images.sources
+    )
+    # `display: contents` lays the `<img>` out exactly as if it had no wrapper
+    return Markup(f'<picture style="display: contents">{sources}<img{_attributes(img)} /></picture>')
+
+
+def _pictures_processed(future: Future[int]) -> None:
+    if (error := future.exception()) is not None:
+        app.logger.error("building picture derivatives failed", exc_info=error)
+        return
+
+    if future.result():
+        # runs on the pool's callback thread, so it gets a connection of its own
+        connection = sqlite3.connect(app.config["DATABASE"])
+        try:
+            bump_version(connection, "IMAGES")
+        finally:
+            connection.close()
+
+
+def process_pictures(folder: str) -> Future[int]:
+    """Build the derivatives of a freshly uploaded picture folder in the background.
+
+    Once they exist the `IMAGES` version moves on, so cached pages pick up the new `srcset`s.
+    """
+    future = schedule_derivatives(folder)
+    future.add_done_callback(_pictures_processed)
+    return future
+
+
+def store_pictures(files: Iterable[FileStorage]) -> list[StoredUpload]:
+    """Stream uploaded pictures into the object store. Raises ValueError for the first one refused."""
+    stored = []
+    for file in files:
+        try:
+            stored.append(store_upload(file.stream))
+        except ValueError as error:
+            message = f"{file.filename}: {error}"
+            raise ValueError(message) from None
+    return stored
+
+
+def add_pictures(folder: str, pictures: list[StoredUpload]) -> None:
+    """Show `pictures`, in order, from `folder` and start building their derivatives."""
+    existing = len(list((PICTURES / folder).glob("*"))) if (PICTURES / folder).exists() else 0
+    for position, stored in enumerate(pictures, existing):
+        # named by position then content hash, so the listing order is the upload order
+        link_upload(stored, PICTURES / folder / f"{position:02}-{stored.name}")
+
+    # cards and pages list the new pictures straight away, before their derivatives exist
+    bump_version(conn, "IMAGES")
+    process_pictures(folder)
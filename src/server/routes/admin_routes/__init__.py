@@ -2,6 +2,8 @@ from .admin_carousel import *  # noqa
 from .admin_category import *  # noqa
 from .admin_giftcard import *  # noqa
 from .admin_login import *  # noqa
+from .admin_logs import *  # noqa
 from .admin_product import *  # noqa
 from .admin_razorpay import *  # noqa
+from .admin_support import *  # noqa
 from .admin_user import *  # noqa
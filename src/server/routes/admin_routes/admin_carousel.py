@@ -1,17 +1,14 @@
 from __future__ import annotations
 
-import os
 import random
 import string
 
 from flask import redirect, render_template, url_for
 
 from src.carousel import Carousel
-from src.server import admin_login_required, app, conn
+from src.server import add_pictures, admin_login_required, app, conn, store_pictures
 from src.server.forms import CarouselForm
 
-UPLOAD_FOLDER = "src/server/static/product_pictures"
-
 
 def generate_unique_identifier():
     return "".join(random.choices(string.ascii_uppercase + string.digits, k=16))
@@ -41,15 +38,14 @@ def admin_add_carousel():
     if form.validate_on_submit():
         assert form.image.data and form.heading.data and form.description.data
 
-        image = form.image.data
-        filename = image.filename
-        _id = generate_unique_identifier()
-
-        if not os.path.exists(f"{UPLOAD_FOLDER}/{_id}/"):
-            os.makedirs(f"{UPLOAD_FOLDER}/{_id}/")
+        try:
+            pictures = store_pictures([form.image.data])
+        except ValueError as error:
+            app.logger.warning("carousel picture refused: %s", error)
+            return redirect(url_for("admin_manage_carousel"))
 
-        with open(f"{UPLOAD_FOLDER}/{_id}/{filename}", "wb+") as f:
-            f.write(image.read())
+        _id = generate_unique_identifier()
+        add_pictures(_id, pictures)
 
         Carousel.create(
             conn,
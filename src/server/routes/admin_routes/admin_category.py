@@ -1,5 +1,6 @@
 from flask import redirect, render_template, request, url_for
 
+from src.pagination import Cursor
 from src.product import Category
 from src.server import admin_login_required, app, conn
 from src.server.forms import CategoryAddForm
@@ -8,7 +9,10 @@ from src.server.forms import CategoryAddForm
 @app.route("/admin/manage/category", methods=["GET"])
 @admin_login_required
 def admin_manage_category():
-    categories = Category.all(conn)
+    cursor = Cursor.decode(request.args.get("cursor"))
+    limit = int(request.args.get("limit", 15))
+
+    categories = Category.page(conn, cursor=cursor, limit=limit)
     addform: CategoryAddForm = CategoryAddForm()
     return render_template("admin/admin_manage_category.html", categories=categories, form=addform)
 
@@ -24,7 +28,8 @@ def admin_add_category():
         Category.create(conn, name=addform.name.data, description=addform.description.data)
 
         return redirect(url_for("admin_manage_category"))
-    return render_template("admin/admin_manage_category.html", form=addform)
+    categories = Category.page(conn)
+    return render_template("admin/admin_manage_category.html", categories=categories, form=addform)
 
 
 @app.route("/admin/manage/category/delete/<int:id>", methods=["GET"])
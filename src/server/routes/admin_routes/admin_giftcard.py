@@ -2,9 +2,10 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from flask import redirect, render_template, url_for
+from flask import redirect, render_template, request, url_for
 from flask_login import current_user
 
+from src.pagination import Cursor
 from src.product import GiftCard
 from src.server import admin_login_required, app, conn
 from src.server.forms import GiftCardForm
@@ -18,7 +19,10 @@ if TYPE_CHECKING:
 @app.route("/admin/giftcards")
 @admin_login_required
 def admin_giftcards():
-    gift_cards = GiftCard.all(conn)
+    cursor = Cursor.decode(request.args.get("cursor"))
+    limit = int(request.args.get("limit", 15))
+
+    gift_cards = GiftCard.page(conn, cursor=cursor, limit=limit)
     form = GiftCardForm()
     return render_template("admin/admin_manage_giftcard.html", gift_cards=gift_cards, form=form)
 
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from flask import render_template, request
+
+from src.logs import LEVELS, Log
+from src.pagination import Cursor
+from src.server import admin_login_required, app, log_conn, log_sink
+
+
+@app.route("/admin/logs", methods=["GET"])
+@admin_login_required
+def admin_logs():
+    args = request.args
+    cursor = Cursor.decode(args.get("cursor"))
+    limit = int(args.get("limit", 50))
+
+    level = args.get("level") or None
+    filters = {
+        "level": level if level in LEVELS else None,
+        "since": args.get("since") or None,
+        "until": args.get("until") or None,
+    }
+    logs = Log.page(log_conn, cursor=cursor, limit=limit, **filters)
+
+    sink = log_sink()
+    return render_template(
+        "admin/admin_logs.html",
+        logs=logs,
+        filters=filters,
+        levels=LEVELS,
+        stats=sink.stats() if sink is not None else None,
+    )
@@ -1,20 +1,17 @@
 from __future__ import annotations
 
-import os
 import random
 import string
 
-import markdown
 from flask import redirect, render_template, request, url_for
 from flask_login import current_user
 
+from src.pagination import Cursor
 from src.product import Category, Product
-from src.server import admin_login_required, app, conn
+from src.server import add_pictures, admin_login_required, app, conn, store_pictures
 from src.server.forms import ProductAddForm, ProductUpdateForm
 from src.utils import size_names
 
-UPLOAD_FOLDER = "src/server/static/product_pictures"
-
 
 def generate_unique_identifier():
     return "".join(random.choices(string.ascii_uppercase + string.digits, k=16))
@@ -23,10 +20,9 @@ def generate_unique_identifier():
 @app.route("/admin/manage/product", methods=["GET"])
 @admin_login_required
 def admin_manage_product():
-    page = max(int(request.args.get("page", 1)), 1)
+    cursor = Cursor.decode(request.args.get("cursor"))
     limit = int(request.args.get("limit", 15))
-    skip = (page - 1) * limit
-    products = Product.all(conn, admin=True, limit=limit, offset=skip)
+    products = Product.page(conn, cursor=cursor, limit=limit)
 
     product_edit_forms: list[ProductUpdateForm] = [ProductUpdateForm(conn, product=product) for product in products]
     addform: ProductAddForm = ProductAddForm(conn)
@@ -35,9 +31,6 @@ def admin_manage_product():
         products=products,
         size_names=size_names,
         form=addform,
-        page=page,
-        limit=limit,
-        skip=skip,
         editforms=product_edit_forms,
     )
 
@@ -45,11 +38,19 @@ def admin_manage_product():
 @app.route("/admin/manage/product/add", methods=["POST"])
 @admin_login_required
 def admin_add_product():
+    import markdown
+
     addform: ProductAddForm = ProductAddForm(conn)
 
     if addform.validate_on_submit() and request.method == "POST":
         assert addform.name.data and addform.price.data and addform.stock.data and addform.description.data and addform.sizes.data
 
+        try:
+            pictures = store_pictures(addform.images.data)
+        except ValueError as error:
+            app.logger.warning("product pictures refused: %s", error)
+            return redirect(url_for("admin_manage_product"))
+
         _id = generate_unique_identifier()
 
         for size in addform.sizes.data:
@@ -66,14 +67,7 @@ def admin_add_product():
                 size=size,
             )
 
-        images = addform.images.data
-
-        for image in images:
-            if not os.path.exists(f"{UPLOAD_FOLDER}/{product.unique_id}/"):
-                os.makedirs(f"{UPLOAD_FOLDER}/{product.unique_id}/")
-
-            with open(f"{UPLOAD_FOLDER}/{product.unique_id}/{image.filename}", "wb+") as f:
-                f.write(image.read())
+        add_pictures(product.unique_id, pictures)
 
     return redirect(url_for("admin_manage_product"))
 
@@ -81,6 +75,8 @@ def admin_add_product():
 @app.route("/admin/manage/product/edit/<int:id>", methods=["POST"])
 @admin_login_required
 def admin_edit_product(id: int):
+    import markdown
+
     product = Product.from_id(conn, id)
     product_update_form: ProductUpdateForm = ProductUpdateForm(conn, product=product)
 
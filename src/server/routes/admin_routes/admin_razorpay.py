@@ -1,13 +1,28 @@
 from __future__ import annotations
 
+import csv
+import io
 import json
 
-from flask import render_template, request
+from flask import Response, render_template, request, stream_with_context
 
-from src.order import Order
+from src.order import OrderLine
+from src.pagination import Cursor
 from src.server import admin_login_required, app, conn, razorpay_client
 
 
+def order_filters() -> dict:
+    args = request.args
+    user_id = args.get("user_id", "").removeprefix("USR_")
+
+    return {
+        "status": args.get("status") or None,
+        "user_id": int(user_id) if user_id.isdigit() else None,
+        "since": args.get("since") or None,
+        "until": args.get("until") or None,
+    }
+
+
 @app.route("/admin/manage/razorpay-orders", methods=["GET"])
 @admin_login_required
 def admin_manage_razorpay_order():
@@ -37,18 +52,43 @@ def admin_manage_razorpay_order():
 @app.route("/admin/manage/orders", methods=["GET"])
 @admin_login_required
 def admin_manage_order():
-    page = max(int(request.args.get("page", 1)), 1)
+    cursor = Cursor.decode(request.args.get("cursor"))
     limit = int(request.args.get("limit", 15))
-    skip = (page - 1) * limit
 
-    orders = Order.all(conn, limit=limit, offset=skip)
+    filters = order_filters()
+    orders = OrderLine.page(conn, cursor=cursor, limit=limit, **filters)
 
     return render_template(
         "admin/admin_manage_partial_order.html",
         orders=orders,
-        page=page,
-        skip=skip,
-        limit=limit,
+        filters=filters,
+    )
+
+
+@app.route("/admin/manage/orders/export", methods=["GET"])
+@admin_login_required
+def admin_export_orders():
+    filters = order_filters()
+
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(OrderLine.CSV_HEADER)
+
+        for index, line in enumerate(OrderLine.iterate(conn, **filters), start=1):
+            writer.writerow(line.csv_row())
+
+            if index % 500 == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        yield buffer.getvalue()
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/csv",
+        headers={"Content-Disposition": "attachment; filename=orders.csv"},
     )
 
 
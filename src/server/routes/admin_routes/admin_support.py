@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from flask import abort, redirect, render_template, request, url_for
+from flask_login import current_user
+
+from src.pagination import Cursor
+from src.refund import Refund
+from src.server import admin_login_required, app, conn, search_enabled
+from src.server.forms import TicketReplyForm
+from src.ticket import VALID_STATUS, Ticket
+
+if TYPE_CHECKING:
+    from src.user import Admin
+
+    assert isinstance(current_user, Admin)
+
+
+@app.route("/admin/manage/tickets", methods=["GET"])
+@admin_login_required
+def admin_manage_tickets():
+    status = request.args.get("status", "OPEN")
+    cursor = Cursor.decode(request.args.get("cursor"))
+    limit = int(request.args.get("limit", 15))
+
+    tickets = Ticket.page(conn, status=status if status in VALID_STATUS else None, cursor=cursor, limit=limit)
+
+    return render_template(
+        "admin/admin_manage_tickets.html",
+        tickets=tickets,
+        counts=Ticket.inbox(conn),
+        status=status,
+    )
+
+
+@app.route("/admin/manage/tickets/search", methods=["GET"])
+@admin_login_required
+def admin_search_tickets():
+    if not search_enabled():
+        abort(404)
+
+    query = request.args.get("q", "").strip()
+    kind = request.args.get("kind", "tickets")
+    status = request.args.get("status") or None
+    user_id = request.args.get("user_id", "").removeprefix("USR_")
+    cursor = Cursor.decode(request.args.get("cursor"))
+    limit = int(request.args.get("limit", 15))
+
+    model = Refund if kind == "refunds" else Ticket
+    hits = model.search(
+        conn,
+        query,
+        status=status,
+        user_id=int(user_id) if user_id.isdigit() else None,
+        cursor=cursor,
+        limit=limit,
+    )
+
+    return render_template(
+        "admin/admin_search_tickets.html",
+        hits=hits,
+        query=query,
+        kind="refunds" if model is Refund else "tickets",
+        status=status,
+        user_id=user_id,
+    )
+
+
+@app.route("/admin/manage/tickets/<int:id>", methods=["GET"])
+@admin_login_required
+def admin_ticket_thread(id: int):
+    try:
+        thread = Ticket.from_id(conn, id).thread()
+    except ValueError:
+        abort(404)
+
+    return render_template(
+        "admin/admin_ticket_thread.html",
+        root=thread[0],
+        thread=thread,
+        form=TicketReplyForm(),
+        valid_status=VALID_STATUS,
+    )
+
+
+@app.route("/admin/manage/tickets/<int:id>/reply", methods=["POST"])
+@admin_login_required
+def admin_reply_ticket(id: int):
+    form: TicketReplyForm = TicketReplyForm()
+
+    if form.validate_on_submit() and form.message.data:
+        try:
+            thread = Ticket.from_id(conn, id).thread()
+        except ValueError:
+            abort(404)
+
+        thread[-1].reply(current_user, form.message.data)
+
+        if thread[0].status == "OPEN":
+            thread[0].update_status("PROC")
+
+    return redirect(url_for("admin_ticket_thread", id=id))
+
+
+@app.route("/admin/manage/tickets/<int:id>/status/<string:status>", methods=["GET"])
+@admin_login_required
+def admin_ticket_status(id: int, status: str):
+    if status not in VALID_STATUS:
+        abort(404)
+
+    try:
+        ticket = Ticket.from_id(conn, id)
+    except ValueError:
+        abort(404)
+
+    ticket.root.update_status(status)
+    return redirect(url_for("admin_ticket_thread", id=id))
@@ -1,5 +1,6 @@
-from flask import render_template
+from flask import render_template, request
 
+from src.pagination import Cursor
 from src.server import admin_login_required, app, conn
 from src.user import User
 
@@ -7,5 +8,8 @@ from src.user import User
 @app.route("/admin/manage/user", methods=["GET", "POST"])
 @admin_login_required
 def admin_manage_user():
-    users = User.all(conn)
+    cursor = Cursor.decode(request.args.get("cursor"))
+    limit = int(request.args.get("limit", 15))
+
+    users = User.page(conn, cursor=cursor, limit=limit)
     return render_template("admin/admin_manage_user.html", users=users)
@@ -3,15 +3,15 @@ from __future__ import annotations
 from functools import lru_cache
 from typing import TYPE_CHECKING
 
-import arrow
-from flask import jsonify, redirect, render_template, request, url_for
+from flask import abort, jsonify, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
 
 from src.carousel import Carousel
-from src.product import Category, Product
-from src.server import TODAY, app, conn, sitemapper
+from src.pagination import Cursor
+from src.product import CATEGORY_SORTS, Category, Product, category_index
+from src.server import TODAY, app, cached_page, conditional, conn, sitemapper
 from src.server.forms import AddToCartForm, GiftCardForm, LoginForm, SearchForm, SubscribeNewsLetterForm, TicketForm
-from src.utils import FAQ_DATA, newsletter_email_add_to_db
+from src.utils import faq_data, newsletter_email_add_to_db
 
 if TYPE_CHECKING:
     from src.user import User
@@ -21,6 +21,7 @@ if TYPE_CHECKING:
 
 @sitemapper.include(lastmod=TODAY, changefreq="daily", priority=0.9)
 @app.route("/")
+@cached_page("PRODUCTS", "CAROUSEL", "CATEGORIES", "IMAGES")
 def home():
     products = Product.all(conn, limit=6)
     categories = Product.categorise_products(products, limit=6)
@@ -43,11 +44,12 @@ def home():
 @sitemapper.include(lastmod=TODAY, changefreq="yearly", priority=0.5)
 @app.route("/faq/")
 @app.route("/faq")
+@cached_page("CATEGORIES")
 def faq():
     return render_template(
         "faq.html",
         current_user=current_user,
-        FAQ=FAQ_DATA,
+        FAQ=faq_data(),
         search_form=SearchForm(),
         categories=Category.all(conn),
         newsletter_form=SubscribeNewsLetterForm(),
@@ -102,6 +104,7 @@ def autocomplete():
 @sitemapper.include(lastmod=TODAY, changefreq="monthly", priority=0.6)
 @app.route("/refund-policy/")
 @app.route("/refund-policy")
+@cached_page("CATEGORIES")
 def refund_policy():
     return render_template(
         "refund_policy.html",
@@ -124,7 +127,6 @@ def order_history():
         "order_history.html",
         orders=orders,
         current_user=current_user,
-        arrow=arrow,
         search_form=SearchForm(),
         newsletter_form=SubscribeNewsLetterForm(),
         categories=Category.all(conn),
@@ -135,6 +137,7 @@ def order_history():
 @sitemapper.include(lastmod=TODAY)
 @app.route("/contact-us/")
 @app.route("/contact-us")
+@cached_page(anonymous_only=True)
 def contact_us():
     return render_template(
         "contact_us.html",
@@ -149,6 +152,7 @@ def contact_us():
 @sitemapper.include(lastmod=TODAY)
 @app.route("/about-us/")
 @app.route("/about-us")
+@cached_page()
 def about_us():
     return render_template(
         "about_us.html",
@@ -171,23 +175,32 @@ def subscribe():
     return redirect(url_for("home"))
 
 
-for category in Category.all(conn):
-
-    def category_page(category=category):
-        products = Product.get_by_category(conn, category=category)
-        return render_template(
-            "front_search.html",
-            products=products,
-            category=category,
-            current_user=current_user,
-            search_form=SearchForm(),
-            newsletter_form=SubscribeNewsLetterForm(),
-            categories=Category.all(conn),
-            login_form=LoginForm(),
-        )
-
-    app.add_url_rule(
-        f"/category/{category.name.lower().replace(' ', '-')}",
-        f"category_{category.name.lower().replace(' ', '_')}",
-        category_page,
+@app.route("/category/<string:slug>")
+@app.route("/category/<string:slug>/")
+@conditional(lambda slug: Product.catalog_version(conn))
+@cached_page("CATALOG", "CATEGORIES", "IMAGES")
+def category_page(slug: str):
+    category = category_index.get(conn, slug)
+    if category is None:
+        abort(404)
+
+    sort = request.args.get("sort", "featured")
+    if sort not in CATEGORY_SORTS:
+        sort = "featured"
+
+    cursor = Cursor.decode(request.args.get("cursor"))
+    limit = request.args.get("limit", 20, type=int)
+    products = Product.get_by_category(conn, category, sort=sort, cursor=cursor, limit=limit)
+
+    return render_template(
+        "front_search.html",
+        products=products,
+        category=category,
+        sort=sort,
+        sorts=CATEGORY_SORTS,
+        current_user=current_user,
+        search_form=SearchForm(),
+        newsletter_form=SubscribeNewsLetterForm(),
+        categories=category_index.all(conn),
+        login_form=LoginForm(),
     )
@@ -3,10 +3,8 @@ from __future__ import annotations
 import contextlib
 from typing import TYPE_CHECKING
 
-import arrow
 from flask import redirect, render_template, request, url_for
 from flask_login import current_user, login_required
-from razorpay.errors import SignatureVerificationError
 
 from src.product import GiftCard
 from src.server import RAZORPAY_KEY, app, conn, razorpay_client
@@ -43,6 +41,8 @@ def buy_gift_card():
 @app.route("/razorpay-webhook/giftcard/", methods=["POST"])
 @app.route("/razorpay-webhook/giftcard", methods=["POST"])
 def razorpay_webhook_giftcard():
+    from razorpay.errors import SignatureVerificationError
+
     data = request.get_json()
 
     try:
@@ -69,5 +69,5 @@ def show_gift_card():
 
     with contextlib.suppress(ValueError):
         if gift_card := GiftCard.exists(conn, code=code):
-            return render_template("show_gift_card.html", gift_card=gift_card, arrow=arrow)
+            return render_template("show_gift_card.html", gift_card=gift_card)
     return redirect(url_for("home"))
@@ -1,13 +1,74 @@
 from __future__ import annotations
 
-from flask import make_response, render_template, request
-
-from src.server import app, sitemapper
+import gzip
+from typing import Callable, Iterable
+
+from flask import Response, abort, make_response, render_template, request, stream_with_context, url_for
+from werkzeug.http import is_resource_modified
+
+from src.product import category_index
+from src.server import app, conn, sitemapper
+from src.sitemap import http_datetime, index_xml, product_urls, url_element, urlset_xml
+
+
+def _sitemap_response(name: str, build: Callable[[], Iterable[str]]) -> Response:
+    version = sitemapper.version(conn)
+    etag = f"{name}-{version}"
+    last_modified = http_datetime(sitemapper.last_modified(conn))
+
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response = Response(status=304)
+    elif (cached := sitemapper.cached(name, version)) is None:
+        response = Response(stream_with_context(sitemapper.stream(name, version, build())), content_type="application/xml")
+    elif request.accept_encodings["gzip"]:
+        response = Response(cached, content_type="application/xml", headers={"Content-Encoding": "gzip"})
+    else:
+        response = Response(gzip.decompress(cached), content_type="application/xml")
+
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.vary.add("Accept-Encoding")
+    return response
 
 
 @app.route(r"/sitemap.xml")
 def sitemap():
-    return sitemapper.generate(), 200, {r"Content-Type": r"application/xml"}
+    def sitemaps():
+        yield url_for("sitemap_pages", _external=True, _scheme="https"), sitemapper.last_modified(conn)
+        for number, shard in enumerate(sitemapper.shards(conn), 1):
+            yield url_for("sitemap_products", number=number, _external=True, _scheme="https"), shard.lastmod
+
+    return _sitemap_response("index", lambda: index_xml(sitemaps()))
+
+
+@app.route(r"/sitemap-pages.xml")
+def sitemap_pages():
+    def urls():
+        for page in sitemapper.pages:
+            yield url_element(url_for(page.endpoint, _external=True, _scheme="https"), page.lastmod, page.changefreq, page.priority)
+
+        lastmod = sitemapper.last_modified(conn)
+        for category in category_index.all(conn):
+            yield url_element(url_for("category_page", slug=category.slug, _external=True, _scheme="https"), lastmod, "daily", 0.8)
+
+    return _sitemap_response("pages", lambda: urlset_xml(urls()))
+
+
+@app.route(r"/sitemap-products-<int:number>.xml")
+def sitemap_products(number: int):
+    shards = sitemapper.shards(conn)
+    if not 1 <= number <= len(shards):
+        abort(404)
+    shard = shards[number - 1]
+
+    # building 50k URLs through url_for dominates the render, so build one and substitute the id
+    prefix, _, suffix = url_for("product", product_id=0, _external=True, _scheme="https").rpartition("0")
+
+    def urls():
+        for product_id, lastmod in product_urls(conn, shard.first_id, shard.last_id):
+            yield url_element(f"{prefix}{product_id}{suffix}", lastmod, "daily")
+
+    return _sitemap_response(f"products-{number}", lambda: urlset_xml(urls()))
 
 
 @app.route(r"/robots.txt")
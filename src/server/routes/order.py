@@ -4,7 +4,6 @@ from typing import TYPE_CHECKING
 
 from flask import redirect, render_template, request, url_for
 from flask_login import current_user, login_required
-from razorpay.errors import SignatureVerificationError
 
 from src.order import Order
 from src.server import RAZORPAY_KEY, app, conn, razorpay_client
@@ -58,6 +57,8 @@ def final_checkout():
 @app.route("/razorpay-webhook/product", methods=["POST"])
 @app.route("/razorpay-webhook/product/", methods=["POST"])
 def razorpay_webhook():
+    from razorpay.errors import SignatureVerificationError
+
     data = request.get_json()
 
     try:
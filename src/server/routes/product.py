@@ -2,32 +2,23 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-import arrow
 from flask import redirect, render_template, request, url_for
 from flask_login import current_user, login_required
 
 from src.favourite import Favourite
 from src.product import Product
-from src.server import app, conn, sitemapper
+from src.server import app, conditional, conn
 from src.server.forms import AddReviewForm, AddToCartForm, LoginForm, SearchForm, SubscribeNewsLetterForm
 from src.user import User
-from src.utils import FAQ_DATA, get_product_pictures, size_chart
+from src.utils import faq_data, get_product_pictures, size_chart
 
 if TYPE_CHECKING:
     assert isinstance(current_user, User)
 
 
-def product_ids():
-    return [product.id for product in Product.all(conn)]
-
-
-@sitemapper.include(
-    url_variables={"product_id": product_ids()},
-    lastmod=arrow.now().format("YYYY-MM-DD"),
-    changefreq="daily",
-)
 @app.route("/products/<int:product_id>", methods=["GET"])
 @app.route("/products/<int:product_id>/", methods=["GET"])
+@conditional(lambda product_id: Product.page_version(conn, product_id))
 def product(product_id: int):
     product = Product.from_id(conn, product_id)
     pictures = get_product_pictures(product.unique_id)
@@ -45,8 +36,7 @@ def product(product_id: int):
         form=cart_form,
         review_form=review_form,
         error=request.args.get("error"),
-        arrow=arrow,
-        FAQ=FAQ_DATA,
+        FAQ=faq_data(),
         reviews=reviews,
         search_form=SearchForm(),
         newsletter_form=SubscribeNewsLetterForm(),
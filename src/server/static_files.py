@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import mimetypes
+import os
+from typing import Callable, NamedTuple
+
+from werkzeug.http import parse_accept_header, parse_etags, parse_range_header
+from werkzeug.security import safe_join
+from werkzeug.utils import get_content_type
+
+from src.server import app
+from src.server.caching import cache_policy
+
+# how `/static/` files reach clients:
+#   "asgi"       - read and sent by the worker's event loop, never touching the WSGI thread
+#   "x-accel"    - an empty response with `X-Accel-Redirect` under STATIC_ACCEL_PREFIX, nginx sends the file
+#   "x-sendfile" - an empty response with `X-Sendfile` naming the file, for Apache and lighttpd
+#   "flask"      - Flask's own static view
+STATIC_DELIVERY = os.environ.get("STATIC_DELIVERY", "asgi").lower()
+STATIC_ACCEL_PREFIX = os.environ.get("STATIC_ACCEL_PREFIX", "/protected-static")
+CHUNK_SIZE = 256 * 1024
+
+# precompressed siblings, preferred in this order when the client accepts them
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+class StaticFile(NamedTuple):
+    path: str
+    size: int
+    mtime: float
+    etag: str
+    encoding: str | None
+
+
+def _stat(path: str, encoding: str | None) -> StaticFile | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    if not os.path.isfile(path):
+        return None
+
+    suffix = f"-{encoding}" if encoding else ""
+    return StaticFile(path, stat.st_size, stat.st_mtime, f'"{stat.st_mtime_ns:x}-{stat.st_size:x}{suffix}"', encoding)
+
+
+def resolve(filename: str, accept_encoding: str, *, ranged: bool) -> tuple[StaticFile, bool] | None:
+    """The file to send for `/static/<filename>`, and whether it has precompressed siblings at all."""
+    path = safe_join(str(app.static_folder), filename)
+    if path is None:
+        return None
+
+    original = _stat(path, None)
+    if original is None:
+        return None
+
+    accepted = parse_accept_header(accept_encoding)
+    varies = False
+    for encoding, suffix in ENCODINGS:
+        sibling = _stat(path + suffix, encoding)
+        if sibling is None:
+            continue
+        varies = True
+        # byte ranges always refer to the plain file
+        if not ranged and accepted[encoding] and sibling.mtime >= original.mtime:
+            return sibling, varies
+
+    return original, varies
+
+
+def http_date(timestamp: float) -> str:
+    return email.utils.formatdate(timestamp, usegmt=True)
+
+
+def not_modified(headers: dict[str, str], file: StaticFile) -> bool:
+    if "if-none-match" in headers:
+        return parse_etags(headers["if-none-match"]).contains_weak(file.etag.strip('"'))
+
+    if since := headers.get("if-modified-since"):
+        try:
+            return int(file.mtime) <= email.utils.parsedate_to_datetime(since).timestamp()
+        except (TypeError, ValueError):
+            return False
+
+    return False
+
+
+def byte_range(headers: dict[str, str], file: StaticFile) -> tuple[int, int] | None | bool:
+    """The single `(start, stop)` range asked for, None for the whole file, False if unsatisfiable."""
+    header = headers.get("range")
+    if not header or ("if-range" in headers and headers["if-range"] != file.etag):
+        return None
+
+    parsed = parse_range_header(header)
+    # several ranges at once are legal to answer with the whole file
+    if parsed is None or parsed.units != "bytes" or len(parsed.ranges) != 1:
+        return None
+
+    span = parsed.range_for_length(file.size)
+    return span if span is not None else False
+
+
+class StaticFiles:
+    """ASGI middleware answering `GET`/`HEAD` for files under `/static/` before the WSGI app sees them.
+
+    Misses and other paths go to `app`, so a missing file still gets the site's 404 page.
+    The WSGI app runs on one thread per worker; pages wait on it, files no longer do.
+    """
+
+    def __init__(self, app: Callable, /, *, delivery: str = STATIC_DELIVERY, prefix: str = "/static/") -> None:
+        self.app = app
+        self.delivery = delivery
+        self.prefix = prefix
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if (
+            self.delivery == "flask"
+            or scope["type"] != "http"
+            or scope["method"] not in ("GET", "HEAD")
+            or not scope["path"].startswith(self.prefix)
+        ):
+            return await self.app(scope, receive, send)
+
+        headers = {name.decode("latin-1"): value.decode("latin-1") for name, value in scope["headers"]}
+        filename = scope["path"][len(self.prefix) :]
+        # behind a proxy the proxy picks encodings and ranges for the file it sends
+        proxied = self.delivery in ("x-accel", "x-sendfile")
+        resolved = resolve(filename, "" if proxied else headers.get("accept-encoding", ""), ranged=proxied or "range" in headers)
+        if resolved is None:
+            return await self.app(scope, receive, send)
+
+        file, varies = resolved
+        response_headers = [
+            (b"content-type", get_content_type(mimetypes.guess_type(filename)[0] or "application/octet-stream", "utf-8").encode()),
+            (b"etag", file.etag.encode()),
+            (b"last-modified", http_date(file.mtime).encode()),
+            (b"accept-ranges", b"bytes"),
+        ]
+        if policy := cache_policy("static", filename):
+            response_headers.append((b"cache-control", policy.encode()))
+        if varies:
+            response_headers.append((b"vary", b"Accept-Encoding"))
+        if file.encoding:
+            response_headers.append((b"content-encoding", file.encoding.encode()))
+
+        if not_modified(headers, file):
+            return await self.empty(send, 304, response_headers)
+
+        if self.delivery == "x-accel":
+            location = os.path.relpath(file.path, str(app.static_folder)).replace(os.sep, "/")
+            response_headers.append((b"x-accel-redirect", f"{STATIC_ACCEL_PREFIX.rstrip('/')}/{location}".encode()))
+            return await self.empty(send, 200, response_headers)
+        if self.delivery == "x-sendfile":
+            response_headers.append((b"x-sendfile", file.path.encode()))
+            return await self.empty(send, 200, response_headers)
+
+        span = byte_range(headers, file)
+        if span is False:
+            response_headers.append((b"content-range", f"bytes */{file.size}".encode()))
+            return await self.empty(send, 416, response_headers)
+
+        start, stop = span or (0, file.size)
+        status = 206 if span else 200
+        if span:
+            response_headers.append((b"content-range", f"bytes {start}-{stop - 1}/{file.size}".encode()))
+
+        response_headers.append((b"content-length", str(stop - start).encode()))
+        await send({"type": "http.response.start", "status": status, "headers": response_headers})
+        if scope["method"] == "HEAD":
+            return await send({"type": "http.response.body", "body": b""})
+
+        await self.send_file(scope, send, file.path, start, stop)
+
+    @staticmethod
+    async def empty(send: Callable, status: int, headers: list[tuple[bytes, bytes]]) -> None:
+        # a 304 stands in for the full response, so a length of 0 would be taken as the file's
+        if status != 304:
+            headers = [*headers, (b"content-length", b"0")]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
+
+    @staticmethod
+    async def send_file(scope: dict, send: Callable, path: str, start: int, stop: int) -> None:
+        descriptor = os.open(path, os.O_RDONLY)
+        try:
+            # servers implementing the zero-copy extension `sendfile` straight from the descriptor
+            if "http.response.zerocopysend" in scope.get("extensions", {}):
+                return await send({"type": "http.response.zerocopysend", "file": descriptor, "offset": start, "count": stop - start})
+
+            loop = asyncio.get_running_loop()
+            offset = start
+            while offset < stop:
+                chunk = await loop.run_in_executor(None, os.pread, descriptor, min(CHUNK_SIZE, stop - offset), offset)
+                if not chunk:
+                    break
+                offset += len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": offset < stop})
+            # an empty file, or one that shrank while being sent
+            if offset < stop or start == stop:
+                await send({"type": "http.response.body", "body": b""})
+        finally:
+            os.close(descriptor)
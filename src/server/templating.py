@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import os
+import pathlib
+
+from jinja2 import FileSystemBytecodeCache, TemplateError
+
+from src.server import app
+
+# compiled templates, shared by every worker on the host and filled ahead of time by
+# `python precompile_templates.py`; set to an empty string to compile in memory only
+TEMPLATE_CACHE = os.environ.get("TEMPLATE_CACHE", str(pathlib.Path(__file__).parent.parent.parent / ".template-cache"))
+TEMPLATE_WARMUP = os.environ.get("TEMPLATE_WARMUP", "True").lower() == "true"
+
+# what the first storefront requests render, with the templates they extend and import
+HOT_TEMPLATES = (
+    "base.html",
+    "navbar.html",
+    "footer.html",
+    "hero.html",
+    "admin/admin_pagination.html",
+    "holes/navbar_user.html",
+    "holes/admin_banner.html",
+    "fragments/product_card.html",
+    "front.html",
+    "front_search.html",
+    "product.html",
+)
+
+app.config.setdefault("TEMPLATE_WARMUP", TEMPLATE_WARMUP)
+
+if TEMPLATE_CACHE:
+    os.makedirs(TEMPLATE_CACHE, exist_ok=True)
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(TEMPLATE_CACHE)
+
+
+def load_templates(names: list[str] | tuple[str, ...]) -> list[str]:
+    """Load `names` into the environment (from bytecode when cached), returning those that fail to compile."""
+    failed = []
+    for name in names:
+        try:
+            app.jinja_env.get_template(name)
+        except TemplateError:
+            failed.append(name)
+    return failed
+
+
+def warm_templates() -> None:
+    for name in load_templates(HOT_TEMPLATES):
+        app.logger.warning("template %s does not compile", name)
+
+
+def precompile_templates() -> tuple[int, list[str]]:
+    """Compile every template into the bytecode cache; (templates compiled, names that failed)."""
+    names = app.jinja_env.list_templates()
+    failed = load_templates(names)
+    return len(names) - len(failed), failed
+
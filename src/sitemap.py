@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import datetime
+import os
+import sqlite3
+import threading
+import zlib
+from typing import Callable, Iterable, Iterator, NamedTuple, TypeVar
+from xml.sax.saxutils import escape
+
+from .cache import TTLCache
+from .product import Product
+from .utils import table_last_modified, table_version
+
+F = TypeVar("F", bound=Callable)
+
+# the sitemap protocol's limit on URLs per file
+SHARD_SIZE = 50_000
+SITEMAP_CACHE = int(os.environ.get("SITEMAP_CACHE", 8))
+CHUNK = 1000
+
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>\n'
+XMLNS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+# one URL per product (its first size row), with the newest edit across its sizes as lastmod
+PRODUCT_URLS = r"""
+    SELECT P.ID, (SELECT MAX(Q.UPDATED_AT) FROM PRODUCTS AS Q WHERE Q.UNIQUE_ID = P.UNIQUE_ID) AS LASTMOD
+    FROM PRODUCTS AS P
+    WHERE P.ID > ? AND P.ID <= ? AND NOT EXISTS (SELECT 1 FROM PRODUCTS AS Q WHERE Q.UNIQUE_ID = P.UNIQUE_ID AND Q.ID < P.ID)
+    ORDER BY P.ID
+    LIMIT ?
+"""
+
+# the same products numbered in id order and cut into groups of `size`, in one pass inside SQLite
+PRODUCT_SHARDS = r"""
+    SELECT MIN(ID), MAX(ID), MAX(LASTMOD) FROM (
+        SELECT ID, LASTMOD, ROW_NUMBER() OVER (ORDER BY ID) - 1 AS POSITION
+        FROM (SELECT MIN(ID) AS ID, MAX(UPDATED_AT) AS LASTMOD FROM PRODUCTS GROUP BY UNIQUE_ID)
+    )
+    GROUP BY POSITION / ?
+    ORDER BY 1
+"""
+
+
+class SitemapPage(NamedTuple):
+    endpoint: str
+    lastmod: str | None = None
+    changefreq: str | None = None
+    priority: float | None = None
+
+
+class Shard(NamedTuple):
+    first_id: int
+    last_id: int
+    lastmod: str | None
+
+
+def w3c_datetime(value: str | None, /) -> str | None:
+    """
+    >>> w3c_datetime("2024-09-15 10:20:30"), w3c_datetime("2024-09-15")
+    ('2024-09-15T10:20:30+00:00', '2024-09-15')
+    """
+    if not value or len(value) <= 10:
+        return value
+    return f"{value.replace(' ', 'T')}+00:00"
+
+
+def http_datetime(value: str | None, /) -> datetime.datetime | None:
+    if not value:
+        return None
+    return datetime.datetime.fromisoformat(value).replace(tzinfo=datetime.timezone.utc)
+
+
+def url_element(loc: str, lastmod: str | None = None, changefreq: str | None = None, priority: float | None = None) -> str:
+    element = f"<url><loc>{escape(loc)}</loc>"
+    if lastmod:
+        element += f"<lastmod>{w3c_datetime(lastmod)}</lastmod>"
+    if changefreq:
+        element += f"<changefreq>{changefreq}</changefreq>"
+    if priority is not None:
+        element += f"<priority>{priority}</priority>"
+    return element + "</url>\n"
+
+
+def urlset_xml(elements: Iterable[str], /) -> Iterator[str]:
+    """Wrap `<url>` elements into a `<urlset>`, yielding `CHUNK` of them at a time."""
+    yield f'{XML_DECLARATION}<urlset xmlns="{XMLNS}">\n'
+
+    chunk: list[str] = []
+    for element in elements:
+        chunk.append(element)
+        if len(chunk) >= CHUNK:
+            yield "".join(chunk)
+            chunk.clear()
+
+    yield "".join(chunk) + "</urlset>\n"
+
+
+def index_xml(sitemaps: Iterable[tuple[str, str | None]], /) -> Iterator[str]:
+    yield f'{XML_DECLARATION}<sitemapindex xmlns="{XMLNS}">\n'
+    for loc, lastmod in sitemaps:
+        lastmod_element = f"<lastmod>{w3c_datetime(lastmod)}</lastmod>" if lastmod else ""
+        yield f"<sitemap><loc>{escape(loc)}</loc>{lastmod_element}</sitemap>\n"
+    yield "</sitemapindex>\n"
+
+
+def product_urls(conn: sqlite3.Connection, /, first_id: int, last_id: int) -> Iterator[tuple[int, str | None]]:
+    """(product id, lastmod) for every product with `first_id <= id <= last_id`, in id order."""
+    # plain tuples, a shard is too many rows to build a dict per row
+    cursor = conn.cursor()
+    cursor.row_factory = None
+
+    after = first_id - 1
+    while rows := cursor.execute(PRODUCT_URLS, (after, last_id, CHUNK * 5)).fetchall():
+        yield from rows
+        after = rows[-1][0]
+
+
+def plan_shards(conn: sqlite3.Connection, /, *, size: int = SHARD_SIZE) -> list[Shard]:
+    """Split the products into id ranges of at most `size` URLs each."""
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    return [Shard(*row) for row in cursor.execute(PRODUCT_SHARDS, (size,)).fetchall()]
+
+
+class Sitemap:
+    """Sitemap index over the pages registered with `include` and every product, `shard_size` URLs per file.
+
+    Shard boundaries are recomputed only when the catalog version changes. Rendered documents are
+    streamed to the first client, and a gzipped copy is cached under the same version for the next ones.
+    """
+
+    def __init__(self, *, shard_size: int = SHARD_SIZE, cache_size: int = SITEMAP_CACHE) -> None:
+        self.shard_size = shard_size
+        self.pages: list[SitemapPage] = []
+
+        self.__plan: tuple[int, list[Shard]] | None = None
+        self.__rendered: TTLCache[bytes] = TTLCache(maxsize=cache_size, ttl=24 * 3600)
+        self.__lock = threading.Lock()
+
+    def include(
+        self,
+        *,
+        lastmod: str | None = None,
+        changefreq: str | None = None,
+        priority: float | None = None,
+    ) -> Callable[[F], F]:
+        """List a view without URL arguments in the pages sitemap. Goes above `@app.route`."""
+
+        def decorator(func: F) -> F:
+            self.pages.append(SitemapPage(func.__name__, lastmod, changefreq, priority))
+            return func
+
+        return decorator
+
+    @staticmethod
+    def version(conn: sqlite3.Connection, /) -> str:
+        return Product.catalog_version(conn)
+
+    @staticmethod
+    def last_modified(conn: sqlite3.Connection, /) -> str | None:
+        return table_last_modified(conn, "CATALOG", "CATEGORIES")
+
+    def shards(self, conn: sqlite3.Connection, /) -> list[Shard]:
+        version = table_version(conn, "CATALOG")
+
+        # one worker thread plans while the others wait for its result
+        with self.__lock:
+            if self.__plan is None or self.__plan[0] != version:
+                self.__plan = (version, plan_shards(conn, size=self.shard_size))
+            return self.__plan[1]
+
+    def cached(self, name: str, version: str, /) -> bytes | None:
+        """The gzipped document, if it was already rendered for this version."""
+        return self.__rendered.get((name, version))
+
+    def stream(self, name: str, version: str, chunks: Iterable[str], /) -> Iterator[bytes]:
+        """Encode `chunks` for the response, caching a gzipped copy once the whole document was sent."""
+        compressor = zlib.compressobj(wbits=31)
+        compressed: list[bytes] = []
+
+        for chunk in chunks:
+            data = chunk.encode("utf-8")
+            compressed.append(compressor.compress(data))
+            yield data
+
+        compressed.append(compressor.flush())
+        self.__rendered.set((name, version), b"".join(compressed))
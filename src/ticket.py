@@ -3,13 +3,25 @@ from __future__ import annotations
 import sqlite3
 from typing import TYPE_CHECKING
 
-import arrow
+from .pagination import DEFAULT_LIMIT, Cursor, Page, paginate
+from .search import SearchHit, match_expression, search_page
+from .timestamps import Timestamp
 
 if TYPE_CHECKING:
     from .user import Admin, User
 
 
+VALID_STATUS = ["OPEN", "PROC", "CLOS"]
+# OPEN - Open
+# PROC - Processing
+# CLOS - Closed
+
+
 class Ticket:
+    __slots__ = ("conn", "id", "_replied_to", "user_id", "subject", "message", "status", "_created_at", "_user", "_reference")
+
+    created_at = Timestamp()
+
     def __init__(
         self,
         conn: sqlite3.Connection,
@@ -29,8 +41,9 @@ class Ticket:
         self.subject = subject
         self.message = message
         self.status = status
-        self.created_at = arrow.get(created_at)
+        self.created_at = created_at
         self._user: User | None = None
+        self._reference: Ticket | None = None
 
     @property
     def user(self) -> User:
@@ -50,12 +63,15 @@ class Ticket:
         subject: str,
         message: str,
     ) -> Ticket:
+        # replies join their thread with the thread's current status
         query = r"""
-            INSERT INTO TICKETS (REPLIED_TO, USER_ID, SUBJECT, MESSAGE) VALUES (?, ?, ?, ?) RETURNING *
+            INSERT INTO TICKETS (REPLIED_TO, USER_ID, SUBJECT, MESSAGE, STATUS)
+                VALUES (?, ?, ?, ?, COALESCE((SELECT STATUS FROM TICKETS WHERE ID = ?), 'OPEN'))
+            RETURNING *
         """
 
         cursor = conn.cursor()
-        cursor.execute(query, (replied_to, user.id, subject, message))
+        cursor.execute(query, (replied_to, user.id, subject, message, replied_to))
         data = cursor.fetchone()
         conn.commit()
 
@@ -71,19 +87,35 @@ class Ticket:
         cursor.execute(query, (id,))
         data = cursor.fetchone()
 
+        if data is None:
+            error = "Ticket not found."
+            raise ValueError(error) from None
+
         return cls(conn, **data)
 
     def update_status(self, status: str) -> None:
-        valid_status = ["OPEN", "PROC", "CLOS"]
+        """Set the status of every ticket in this ticket's thread."""
         query = r"""
-            UPDATE TICKETS SET STATUS = ? WHERE ID = ?
+            WITH RECURSIVE
+                ANCESTORS(ID, REPLIED_TO) AS (
+                    SELECT ID, REPLIED_TO FROM TICKETS WHERE ID = ?
+                    UNION ALL
+                    SELECT TICKETS.ID, TICKETS.REPLIED_TO FROM TICKETS JOIN ANCESTORS ON TICKETS.ID = ANCESTORS.REPLIED_TO
+                ),
+                THREAD(ID) AS (
+                    SELECT ID FROM ANCESTORS WHERE REPLIED_TO IS NULL
+                    UNION ALL
+                    SELECT TICKETS.ID FROM TICKETS JOIN THREAD ON TICKETS.REPLIED_TO = THREAD.ID
+                )
+            UPDATE TICKETS SET STATUS = ? WHERE ID IN THREAD
         """
-        if status not in valid_status:
+        if status not in VALID_STATUS:
             raise ValueError("Invalid status")
 
         cursor = self.conn.cursor()
-        cursor.execute(query, (status, self.id))
+        cursor.execute(query, (self.id, status))
         self.conn.commit()
+        self.status = status
 
     def reply(self, user: User | Admin, message: str) -> Ticket:
         return Ticket.create(
@@ -98,16 +130,100 @@ class Ticket:
     def reference(self) -> Ticket | None:
         if not self._replied_to:
             return None
-        return Ticket.from_id(self.conn, self._replied_to)
+        if self._reference is None:
+            self._reference = Ticket.from_id(self.conn, self._replied_to)
+        return self._reference
 
     def chain(self) -> list[Ticket]:
-        chain: list[Ticket] = [self]
-        current = self
-        while current.reference:
-            current = current.reference
-            chain.append(current)
+        """This ticket followed by every ticket it replies to, up to the thread root."""
+        query = r"""
+            WITH RECURSIVE CHAIN(ID, DEPTH) AS (
+                SELECT ID, 0 FROM TICKETS WHERE ID = ?
+                UNION ALL
+                SELECT TICKETS.REPLIED_TO, CHAIN.DEPTH + 1 FROM TICKETS JOIN CHAIN ON TICKETS.ID = CHAIN.ID
+                WHERE TICKETS.REPLIED_TO IS NOT NULL
+            )
+            SELECT TICKETS.* FROM CHAIN JOIN TICKETS ON TICKETS.ID = CHAIN.ID ORDER BY CHAIN.DEPTH
+        """
+
+        cursor = self.conn.cursor()
+        cursor.execute(query, (self.id,))
+        chain = [self] + [Ticket(self.conn, **row) for row in cursor.fetchall()[1:]]
+
+        for ticket, reference in zip(chain, chain[1:]):
+            ticket._reference = reference
+
         return chain
 
+    def thread(self) -> list[Ticket]:
+        """Every ticket in this ticket's thread, root first, oldest to newest."""
+        query = r"""
+            WITH RECURSIVE
+                ANCESTORS(ID, REPLIED_TO) AS (
+                    SELECT ID, REPLIED_TO FROM TICKETS WHERE ID = ?
+                    UNION ALL
+                    SELECT TICKETS.ID, TICKETS.REPLIED_TO FROM TICKETS JOIN ANCESTORS ON TICKETS.ID = ANCESTORS.REPLIED_TO
+                ),
+                THREAD(ID) AS (
+                    SELECT ID FROM ANCESTORS WHERE REPLIED_TO IS NULL
+                    UNION ALL
+                    SELECT TICKETS.ID FROM TICKETS JOIN THREAD ON TICKETS.REPLIED_TO = THREAD.ID
+                )
+            SELECT TICKETS.* FROM THREAD JOIN TICKETS ON TICKETS.ID = THREAD.ID ORDER BY TICKETS.CREATED_AT, TICKETS.ID
+        """
+
+        cursor = self.conn.cursor()
+        cursor.execute(query, (self.id,))
+        thread = [Ticket(self.conn, **row) for row in cursor.fetchall()]
+
+        by_id = {ticket.id: ticket for ticket in thread}
+        for ticket in thread:
+            ticket._reference = by_id.get(ticket._replied_to)  # type: ignore
+
+        return Ticket.with_users(self.conn, thread)
+
+    @property
+    def root(self) -> Ticket:
+        return self.chain()[-1]
+
+    @staticmethod
+    def with_users(conn: sqlite3.Connection, tickets: list[Ticket]) -> list[Ticket]:
+        """Load the authors of `tickets` with one query instead of one per ticket."""
+        from .user import Admin, User
+
+        user_ids = list({ticket.user_id for ticket in tickets if ticket._user is None})
+        if not user_ids:
+            return tickets
+
+        query = f"SELECT * FROM USERS WHERE ID IN ({', '.join('?' for _ in user_ids)})"
+        cursor = conn.cursor()
+        cursor.execute(query, user_ids)
+
+        users: dict[int, User] = {}
+        for row in cursor.fetchall():
+            user_cls = Admin if row["ROLE"] == "ADMIN" else User
+            users[row["ID"]] = user_cls(conn, **row)
+
+        for ticket in tickets:
+            ticket._user = users.get(ticket.user_id)
+
+        return tickets
+
+    @staticmethod
+    def inbox(conn: sqlite3.Connection) -> dict[str, int]:
+        """Number of thread roots per status, e.g. `{"OPEN": 12, "PROC": 3, "CLOS": 40}`."""
+        query = r"""
+            SELECT STATUS, COUNT(*) FROM TICKETS WHERE REPLIED_TO IS NULL GROUP BY STATUS
+        """
+
+        cursor = conn.cursor()
+        cursor.execute(query)
+        counts = {status: 0 for status in VALID_STATUS}
+        for row in cursor.fetchall():
+            counts[row[0]] = row[1]
+
+        return counts
+
     @classmethod
     def all(cls, conn: sqlite3.Connection) -> list[Ticket]:
         query = r"""
@@ -116,9 +232,81 @@ class Ticket:
 
         cursor = conn.cursor()
         cursor.execute(query)
-        data = cursor.fetchall()
+        return [cls(conn, **row) for row in cursor]
 
-        return [cls(conn, **row) for row in data]
+    @classmethod
+    def page(
+        cls,
+        conn: sqlite3.Connection,
+        *,
+        status: str | None = None,
+        cursor: Cursor | None = None,
+        limit: int = DEFAULT_LIMIT,
+    ) -> Page[Ticket]:
+        """Thread roots, newest first, optionally narrowed to one status."""
+        if status is None:
+            query = r"""
+                SELECT * FROM TICKETS WHERE REPLIED_TO IS NULL
+            """
+            params = ()
+        else:
+            query = r"""
+                SELECT * FROM TICKETS WHERE REPLIED_TO IS NULL AND STATUS = ?
+            """
+            params = (status,)
+
+        page = paginate(
+            conn,
+            query,
+            params,
+            factory=lambda row: cls(conn, **row),
+            keys=("CREATED_AT", "ID"),
+            cursor=cursor,
+            limit=limit,
+            descending=True,
+            count=False,
+        )
+        cls.with_users(conn, page.items)
+        return page
+
+    @classmethod
+    def search(
+        cls,
+        conn: sqlite3.Connection,
+        text: str,
+        *,
+        status: str | None = None,
+        user_id: int | None = None,
+        cursor: Cursor | None = None,
+        limit: int = DEFAULT_LIMIT,
+    ) -> Page[SearchHit[Ticket]]:
+        """Best matches first for `text` over subjects and messages, then older ones, with a highlighted snippet each."""
+        match = match_expression(text)
+        if not match:
+            return Page([], limit=limit, start=0, next_cursor=None, prev_cursor=None, total=0)
+
+        source = r"TICKETS_FTS JOIN TICKETS ON TICKETS.ID = TICKETS_FTS.ROWID WHERE TICKETS_FTS MATCH ?"
+        params: tuple = (match,)
+
+        if status:
+            source += " AND TICKETS.STATUS = ?"
+            params += (status,)
+        if user_id:
+            source += " AND TICKETS.USER_ID = ?"
+            params += (user_id,)
+
+        page = search_page(
+            conn,
+            "TICKETS_FTS",
+            "TICKETS.*",
+            source,
+            params,
+            build=lambda row: cls(conn, **row),
+            cursor=cursor,
+            limit=limit,
+        )
+        cls.with_users(conn, [hit.item for hit in page])
+        return page
 
     @classmethod
     def open(cls, conn: sqlite3.Connection) -> list[Ticket]:
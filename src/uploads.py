@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import os
+import pathlib
+import shutil
+import tempfile
+from typing import BinaryIO, NamedTuple
+
+# every uploaded file once, named by the SHA-256 of its content; pages serve hard links to these
+OBJECTS = pathlib.Path(__file__).parent / "server" / "uploads"
+CHUNK_SIZE = 64 * 1024
+UPLOAD_MAX_BYTES = int(os.environ.get("UPLOAD_MAX_BYTES", 20 * 1024 * 1024))
+
+# enough leading bytes to tell every accepted type apart
+SNIFF_BYTES = 16
+
+
+class StoredUpload(NamedTuple):
+    digest: str
+    extension: str
+    size: int
+
+    @property
+    def name(self) -> str:
+        return f"{self.digest}{self.extension}"
+
+    @property
+    def path(self) -> pathlib.Path:
+        return OBJECTS / self.digest[:2] / self.name
+
+
+def sniff_image(head: bytes, /) -> str | None:
+    """The extension for an image starting with `head`, None for anything that isn't an accepted image.
+
+    >>> sniff_image(b"\\x89PNG\\r\\n\\x1a\\n...."), sniff_image(b"RIFF....WEBPVP8 "), sniff_image(b"<svg")
+    ('.png', '.webp', None)
+    """
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return ".png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return ".jpg"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return ".gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    if head[4:12] in (b"ftypavif", b"ftypavis"):
+        return ".avif"
+    return None
+
+
+def store_upload(stream: BinaryIO, /, *, max_bytes: int = UPLOAD_MAX_BYTES) -> StoredUpload:
+    """Copy an uploaded image into the object store `CHUNK_SIZE` bytes at a time, hashing as it goes.
+
+    The type is checked on the first bytes and the size on every chunk, so a rejected upload stops
+    being read right there. Content already in the store is kept once.
+    """
+    head = stream.read(SNIFF_BYTES)
+    extension = sniff_image(head)
+    if extension is None:
+        error = "Only PNG, JPEG, GIF, WebP and AVIF images can be uploaded"
+        raise ValueError(error) from None
+
+    OBJECTS.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+
+    descriptor, partial = tempfile.mkstemp(dir=OBJECTS, suffix=".partial")
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            chunk = head
+            while chunk:
+                size += len(chunk)
+                if size > max_bytes:
+                    error = f"Images can be at most {max_bytes / 2**20:.3g} MiB"
+                    raise ValueError(error) from None
+
+                digest.update(chunk)
+                file.write(chunk)
+                chunk = stream.read(CHUNK_SIZE)
+
+        stored = StoredUpload(digest.hexdigest(), extension, size)
+        stored.path.parent.mkdir(exist_ok=True)
+        if stored.path.exists():
+            os.unlink(partial)
+        else:
+            os.replace(partial, stored.path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(partial)
+        raise
+
+    return stored
+
+
+def link_upload(stored: StoredUpload, target: pathlib.Path, /) -> pathlib.Path:
+    """Make `stored` available at `target` without another copy of its bytes where the filesystem allows."""
+    if target.exists():
+        return target
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(stored.path, target)
+    except OSError:
+        shutil.copyfile(stored.path, target)
+    return target
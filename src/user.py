@@ -12,10 +12,22 @@ if TYPE_CHECKING:
     from .type_hints import Client as RazorpayClient
     from .type_hints import RazorPayOrderDict
 
+from .cache import SharedCache
+from .pagination import DEFAULT_LIMIT, Cursor, Page, paginate
+from .timestamps import Timestamp
 from .utils import Password
 
 
 class User:
+    __slots__ = ("__conn", "id", "email", "password", "name", "_created_at", "address", "phone", "__role")
+
+    created_at = Timestamp()
+
+    # what Flask-Login asks of a signed-in user, the same for every instance
+    is_active = True
+    is_anonymous = False
+    is_authenticated = True
+
     def __init__(
         self,
         connection: sqlite3.Connection,
@@ -23,7 +35,7 @@ class User:
         id: int,
         email: str,
         name: str,
-        password: str,
+        password: str = "",
         created_at: str | None = None,
         role: str = "USER",
         address: str,
@@ -34,13 +46,9 @@ class User:
         self.email = email
         self.password = password
         self.name = name
-        self.created_at = arrow.get(created_at) if created_at else arrow.now()
+        self.created_at = created_at or arrow.now()
         self.address = address
         self.phone = phone
-
-        self.is_active = True
-        self.is_anonymous = False
-        self.is_authenticated = True
         self.__role = role
 
     def get_id(self):
@@ -107,6 +115,21 @@ class User:
             raise ValueError(error) from None
         return cls(connection, **row)
 
+    @classmethod
+    def cached(cls, connection: sqlite3.Connection, user_id: int) -> User | None:
+        """`from_id` through `user_cache`; None when the user does not exist.
+
+        The cached row leaves out the password hash, which nothing reads from a signed-in user.
+        """
+
+        def load() -> dict | None:
+            cursor = connection.cursor()
+            cursor.execute(r"SELECT ID, EMAIL, NAME, ROLE, ADDRESS, PHONE, CREATED_AT FROM USERS WHERE ID = ?", (user_id,))
+            row = cursor.fetchone()
+            return dict(row.items()) if row is not None else None
+
+        return user_cache.get(user_id, load=load, build=lambda row: cls(connection, **row))
+
     @classmethod
     def create(
         cls,
@@ -280,7 +303,14 @@ class User:
                 SELECT * FROM USERS WHERE ROLE = 'USER' LIMIT ? OFFSET ?
             """
             cursor.execute(query, (limit, offset))
-        return [cls(connection, **row) for row in cursor.fetchall()]
+        return [cls(connection, **row) for row in cursor]
+
+    @classmethod
+    def page(cls, connection: sqlite3.Connection, *, cursor: Cursor | None = None, limit: int = DEFAULT_LIMIT) -> Page[User]:
+        query = r"""
+            SELECT * FROM USERS WHERE ROLE = 'USER'
+        """
+        return paginate(connection, query, factory=lambda row: cls(connection, **row), cursor=cursor, limit=limit)
 
     @staticmethod
     def total_count(connection: sqlite3.Connection) -> int:
@@ -319,6 +349,8 @@ class User:
 
 
 class Admin(User):
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -348,6 +380,7 @@ class Admin(User):
         """
         cursor.execute(query, (user_id,))
         connection.commit()
+        user_cache.invalidate(user_id)
 
     @classmethod
     def delete_product(cls, connection: sqlite3.Connection, product_id: int) -> None:
@@ -358,3 +391,7 @@ class Admin(User):
 
         cursor.execute(query, (product_id,))
         connection.commit()
+
+
+# users loaded for every authenticated request; anything that changes or deletes a USERS row must invalidate it
+user_cache: SharedCache[User] = SharedCache("user", ttl=300)
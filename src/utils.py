@@ -1,22 +1,27 @@
 from __future__ import annotations
 
 import base64
-import hashlib
+import functools
+import io
+import itertools
+import json
 import locale
+import multiprocessing
 import os
 import pathlib
 import random
+import re
 import secrets
 import string
 from sqlite3 import Connection, Cursor, Row, sqlite_version_info
-from typing import TYPE_CHECKING, Any, Generic, TypeVar
+from typing import TYPE_CHECKING, Any, Generic, Iterable, TypeVar
 
-import qrcode
 from dotenv import load_dotenv
-from qrcode.constants import ERROR_CORRECT_H
+
+from .hashing import hashing_pool
 
 if TYPE_CHECKING:
-    from PIL import Image
+    from qrcode.image.base import BaseImage
 
 load_dotenv()
 
@@ -29,6 +34,9 @@ SQLITE_OLD = sqlite_version_info < (3, 35, 0)
 
 
 class IndexedDict(Generic[KT, VT]):
+    # the row factory makes one per fetched row
+    __slots__ = ("__keys", "__values", "__actual_dict", "__index_cache", "__size", "__case_sensitive")
+
     def __init__(self, *, case_sensitive: bool = False):
         self.__keys: list[KT] = []
         self.__values: list[VT] = []
@@ -181,24 +189,20 @@ class Password:
         self.__salt = int(secrets.token_hex(max_length), 16)
 
     def hash_password(self, /) -> None:
-        self.__hashed_password = hashlib.pbkdf2_hmac(
-            Password.ALGORITHM,
-            self.__password.encode("utf-8"),
-            self.__salt.to_bytes(16, "big"),
-            Password.ITERATIONS,
-        ).hex()
+        self.__hashed_password = hashing_pool.hash(
+            self.__password, self.__salt, Password.ALGORITHM, Password.ITERATIONS
+        )
+
+    @staticmethod
+    async def hash_async(password: str, /, *, salt: int | None = None) -> str:
+        salt = int(os.getenv("SALT", 0)) if salt is None else salt
+        return await hashing_pool.hash_async(password, salt, Password.ALGORITHM, Password.ITERATIONS)
 
     def __eq__(self, other: Password | str):
         if isinstance(other, Password):
             return self.__hashed_password == other.hex
-        return (
-            self.__hashed_password
-            == hashlib.pbkdf2_hmac(
-                Password.ALGORITHM,
-                other.encode("utf-8"),
-                self.__salt.to_bytes(16, "big"),
-                Password.ITERATIONS,
-            ).hex()
+        return self.__hashed_password == hashing_pool.hash(
+            other, self.__salt, Password.ALGORITHM, Password.ITERATIONS
         )
 
     def __repr__(self) -> str:
@@ -297,7 +301,7 @@ def get_product_pictures(product_id: int | str) -> list[str]:
         return []
 
     files = []
-    for file in path.iterdir():
+    for file in sorted(path.iterdir()):
         path_from_static = file.relative_to(this_path / "server")
         files.append(f"/{str(path_from_static)}")
 
@@ -362,16 +366,16 @@ class FAQ:
         return len(self.__faqs)
 
 
-with open("src/server/static/faq.json") as f:
-    import json
+FAQ_FILE = pathlib.Path(__file__).parent / "server" / "static" / "faq.json"
 
-    faq_data = json.load(f)
 
-faq = FAQ()
-for faq_entity in faq_data["faq"]:
-    faq.add(faq_entity["question"], faq_entity["answer"])
+@functools.lru_cache(maxsize=1)
+def faq_data() -> FAQ:
+    faq = FAQ()
+    for faq_entity in json.loads(FAQ_FILE.read_text())["faq"]:
+        faq.add(faq_entity["question"], faq_entity["answer"])
 
-FAQ_DATA = faq
+    return faq
 
 
 def newsletter_email_add_to_db(conn: Connection, /, *, email: str) -> None:
@@ -382,6 +386,55 @@ def newsletter_email_add_to_db(conn: Connection, /, *, email: str) -> None:
     conn.commit()
 
 
+def table_version(conn: Connection, table: str, /) -> int:
+    """A counter that the `VERSIONS` triggers bump on every write to `table`."""
+    row = conn.execute(r"SELECT VERSION FROM VERSIONS WHERE NAME = ?", (table,)).fetchone()
+    return int(row[0]) if row else 0
+
+
+def bump_version(conn: Connection, table: str, /) -> None:
+    """Move `table`'s version on for changes the `VERSIONS` triggers can't see, and commit."""
+    conn.execute(r"UPDATE VERSIONS SET VERSION = VERSION + 1, UPDATED_AT = CURRENT_TIMESTAMP WHERE NAME = ?", (table,))
+    conn.commit()
+
+
+def table_last_modified(conn: Connection, /, *tables: str) -> str | None:
+    """When any of `tables` was last written, as the `YYYY-MM-DD HH:MM:SS` UTC text SQLite stores."""
+    placeholders = ", ".join("?" for _ in tables)
+    row = conn.execute(rf"SELECT MAX(UPDATED_AT) FROM VERSIONS WHERE NAME IN ({placeholders})", tables).fetchone()
+    return row[0] if row else None
+
+
+# columns added after release; `CREATE TABLE IF NOT EXISTS` leaves existing databases without them
+SCHEMA_MIGRATIONS = {
+    ("PRODUCTS", "UPDATED_AT"): r"""
+        ALTER TABLE PRODUCTS ADD COLUMN UPDATED_AT TIMESTAMP;
+        UPDATE PRODUCTS SET UPDATED_AT = CREATED_AT;
+    """,
+    # the CATEGORIES triggers predate the column; schema.sql recreates them with the timestamp
+    ("LOGS", "REQUEST_ID"): r"""
+        ALTER TABLE LOGS ADD COLUMN REQUEST_ID TEXT;
+        ALTER TABLE LOGS ADD COLUMN LATENCY REAL;
+    """,
+}
+
+
+def migrate_schema(conn: Connection, /) -> None:
+    """Add the `SCHEMA_MIGRATIONS` columns an existing database is missing. Runs before `schema.sql`."""
+    for (table, column), script in SCHEMA_MIGRATIONS.items():
+        columns = {row[1].upper() for row in conn.execute(rf"PRAGMA TABLE_INFO({table})").fetchall()}
+        if columns and column not in columns:
+            conn.executescript(script)
+
+
+def slugify(text: str, /) -> str:
+    """
+    >>> slugify("Oversized T-Shirts & Tees")
+    'oversized-t-shirts-tees'
+    """
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
 def backup_sqlite_database(conn: Connection, /, *, path: str = "database-bak.sqlite") -> None:
     backup_path_connection = Connection(path)
     with backup_path_connection:
@@ -389,43 +442,110 @@ def backup_sqlite_database(conn: Connection, /, *, path: str = "database-bak.sql
     backup_path_connection.close()
 
 
+BASE62_CHARS = string.digits + string.ascii_lowercase + string.ascii_uppercase
+_BASE62_VALUES = {char: value for value, char in enumerate(BASE62_CHARS)}
+
+QR_CACHE_SIZE = int(os.environ.get("QR_CACHE_SIZE", 1024))
+QR_WORKERS = int(os.environ.get("QR_WORKERS", os.cpu_count() or 1))
+# below this many orders a batch renders in the calling process; starting a pool costs more
+QR_POOL_MIN = 256
+
+
+def base62_encode(num: int, /) -> str:
+    """
+    >>> base62_encode(0), base62_encode(61), base62_encode(62), base62_encode(123456789)
+    ('0', 'Z', '10', '8m0Kx')
+    """
+    if num == 0:
+        return BASE62_CHARS[0]
+
+    result = []
+    while num:
+        num, remainder = divmod(num, 62)
+        result.append(BASE62_CHARS[remainder])
+    return "".join(reversed(result))
+
+
+def base62_decode(text: str, /) -> int:
+    """
+    >>> base62_decode("8m0Kx"), base62_decode("0")
+    (123456789, 0)
+    """
+    num = 0
+    try:
+        for char in text:
+            num = num * 62 + _BASE62_VALUES[char]
+    except KeyError:
+        error = f"{text!r} is not a base62 number"
+        raise ValueError(error) from None
+    return num
+
+
 class OrderQR:
-    BASE62_CHARS = string.digits + string.ascii_lowercase + string.ascii_uppercase
+    BASE62_CHARS = BASE62_CHARS
     BASE = len(BASE62_CHARS)
 
     def __init__(self, /, *, order_id: int) -> None:
         self.__order_id = order_id
 
-    def generate_qr_code(self, /) -> Image.Image:
-        text = "QR_" + self.num_to_text(self.__order_id)
-        text = base64.b64encode(text.encode("utf-8")).decode("utf-8")
-        qr = qrcode.QRCode(
-            version=40,
-            error_correction=ERROR_CORRECT_H,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(text)
+    @property
+    def payload(self) -> str:
+        """What the code holds: `QR_<order id in base62>`, base64 encoded."""
+        text = "QR_" + base62_encode(self.__order_id)
+        return base64.b64encode(text.encode("utf-8")).decode("utf-8")
+
+    def generate_qr_code(self, /, *, box_size: int = 10, image_factory: type[BaseImage] | None = None) -> BaseImage:
+        """The code as an image, at the smallest QR version the payload fits (version 1 or 2 for any real order id)."""
+        import qrcode
+        from qrcode.constants import ERROR_CORRECT_H
+
+        # a fixed version would make `fit` start there; order labels are printed, so keep the highest correction
+        qr = qrcode.QRCode(version=None, error_correction=ERROR_CORRECT_H, box_size=box_size, border=4)
+        qr.add_data(self.payload)
         qr.make(fit=True)
 
-        img = qr.make_image(fill_color="black", back_color="white")
-        return img
+        return qr.make_image(image_factory=image_factory, fill_color="black", back_color="white")
 
-    def num_to_text(self, num: int):
-        if num == 0:
-            return OrderQR.BASE62_CHARS[0]
+    def png(self, /, *, box_size: int = 10) -> bytes:
+        return render_order_qr(self.__order_id, "png", box_size)
 
-        result = []
-        while num > 0:
-            remainder = num % OrderQR.BASE
-            result.append(OrderQR.BASE62_CHARS[remainder])
-            num //= OrderQR.BASE
+    def svg(self, /, *, box_size: int = 10) -> bytes:
+        return render_order_qr(self.__order_id, "svg", box_size)
 
-        return "".join(reversed(result))
+    num_to_text = staticmethod(base62_encode)
+    text_to_num = staticmethod(base62_decode)
 
-    def text_to_num(self, text: str):
-        num = 0
-        for char in text:
-            num = num * OrderQR.BASE + OrderQR.BASE62_CHARS.index(char)
 
-        return num
+@functools.lru_cache(maxsize=QR_CACHE_SIZE)
+def render_order_qr(order_id: int, format: str = "png", box_size: int = 10, /) -> bytes:
+    """The order's QR code as PNG or SVG bytes; an order's code never changes, so renders are kept."""
+    if format == "svg":
+        from qrcode.image.svg import SvgPathImage
+
+        return OrderQR(order_id=order_id).generate_qr_code(box_size=box_size, image_factory=SvgPathImage).to_string()
+
+    buffer = io.BytesIO()
+    OrderQR(order_id=order_id).generate_qr_code(box_size=box_size).save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def _render_order_qrs(order_ids: list[int], format: str, box_size: int, /) -> list[bytes]:
+    return [render_order_qr(order_id, format, box_size) for order_id in order_ids]
+
+
+def render_order_qrs(
+    order_ids: Iterable[int], /, format: str = "png", *, box_size: int = 10, workers: int = QR_WORKERS
+) -> dict[int, bytes]:
+    """Labels for many orders at once, order id -> PNG or SVG bytes, rendered across `workers` processes."""
+    order_ids = list(dict.fromkeys(order_ids))
+    if workers <= 1 or len(order_ids) < QR_POOL_MIN:
+        return dict(zip(order_ids, _render_order_qrs(order_ids, format, box_size)))
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # a few large batches per worker, so pickling and scheduling stay small next to rendering
+    size = -(-len(order_ids) // (workers * 4))
+    batches = [order_ids[i : i + size] for i in range(0, len(order_ids), size)]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        rendered = pool.map(_render_order_qrs, batches, [format] * len(batches), [box_size] * len(batches))
+        return dict(zip(order_ids, itertools.chain.from_iterable(rendered)))